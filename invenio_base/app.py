@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 #
 # This file is part of Invenio.
-# Copyright (C) 2015-2024 CERN.
+# Copyright (C) 2015-2026 CERN.
 # Copyright (C) 2022 RERO.
 # Copyright (C) 2023-2025 Graz University of Technology.
 # Copyright (C) 2025 Northwestern University.
@@ -22,10 +22,21 @@ from flask import Flask
 from flask.cli import FlaskGroup
 from flask.helpers import get_debug_flag
 
+from .assets import init_static_manifest, static_url
+from .hooks import init_hook_timing
+from .sampling import start_sampling_profiler
 from .signals import app_created, app_loaded
+from .templating import (
+    LazyContext,
+    add_lazy_context,
+    create_bytecode_cache,
+    init_template_index,
+)
+from .timing import init_server_timing
 from .urls.builders import NoOpInvenioUrlsBuilder
 from .urls.helpers import invenio_url_for
 from .utils import entry_points as iter_entry_points
+from .warmup import warm_up
 
 
 def create_app_factory(
@@ -40,6 +51,9 @@ def create_app_factory(
     finalize_app_entry_points=None,
     wsgi_factory=None,
     urls_builder_factory=None,
+    warmup_entry_points=None,
+    lazy_context_entry_points=None,
+    lazy_context=None,
     **app_kwargs,
 ):
     """Create a Flask application factory.
@@ -69,9 +83,20 @@ def create_app_factory(
         the functions to finalize the app.
     :param wsgi_factory: A callable that will be passed the Flask application
         object in order to overwrite the default WSGI application (e.g. to
-        install ``DispatcherMiddleware``).
+        install ``DispatcherMiddleware``). If the callable has a ``prepare``
+        attribute, it is called with the factory keyword arguments before the
+        application is loaded and must return a callable which will be passed
+        the loaded Flask application instead (see
+        :func:`invenio_base.wsgi.create_wsgi_factory`).
     :param urls_builder_factory: A callable (Flask.App, dict) -> InvenioUrlsBuilder
         that builds instance of object that builds the URLs.
+    :param warmup_entry_points: List of entry points, which specifies the
+        functions warming up the app once it is loaded (see
+        :mod:`invenio_base.warmup`).
+    :param lazy_context_entry_points: List of entry points, which specifies
+        the lazy template context values by name (see
+        :func:`invenio_base.templating.add_lazy_context`).
+    :param lazy_context: Map of lazy template context values.
     :param app_kwargs: Keyword arguments passed to :py:meth:`base_app`.
         `instance_path` and `static_folder` can be passed as callables.
     :returns: Flask application factory.
@@ -106,6 +131,11 @@ def create_app_factory(
             if k in app_kwargs and callable(app_kwargs[k]):
                 app_kwargs[k] = app_kwargs[k]()
 
+        # Let the WSGI factory start its work (e.g. building the mounted
+        # applications in the background) while the application is loaded.
+        prepare_wsgi = getattr(wsgi_factory, "prepare", None)
+        finish_wsgi = prepare_wsgi(**kwargs) if prepare_wsgi else None
+
         app = base_app(app_name, **app_kwargs)
         app_created.send(_create_app, app=app)
 
@@ -145,18 +175,64 @@ def create_app_factory(
             **kwargs,
         )
 
+        # Load lazy template context values.
+        lazy_context_loader(
+            app,
+            entry_points=lazy_context_entry_points,
+            modules=lazy_context,
+        )
+
         finalize_app_loader(
             app,
             entry_points=finalize_app_entry_points,
         )
 
+        # Fingerprint the static files so that they can be cached forever.
+        app.add_template_global(static_url)
+        if app.config.get("APP_STATIC_MANIFEST", False) and app.has_static_folder:
+            init_static_manifest(app)
+
         app_loaded.send(_create_app, app=app)
 
+        # Look up templates in an index instead of probing all blueprints.
+        if (
+            app.config.get("APP_TEMPLATE_INDEX", False)
+            and not app.jinja_env.auto_reload
+            and not app.config.get("EXPLAIN_TEMPLATE_LOADING", False)
+        ):
+            init_template_index(app)
+
+        # Measure the cost of the request hooks of the extensions.
+        if app.config.get("APP_HOOK_TIMING", False):
+            init_hook_timing(app)
+
+        # Break down the request latency in a Server-Timing header.
+        if app.config.get("APP_SERVER_TIMING", False):
+            init_server_timing(app)
+
+        # Sample the stacks of the process to find production hot spots.
+        if app.config.get("APP_SAMPLING_PROFILER", False):
+            start_sampling_profiler(app)
+
+        # Warm up the application (e.g. compile templates) before serving.
+        if warmup_entry_points:
+            warm_up(
+                app,
+                warmup_entry_points,
+                background=app.config.get("APP_WARMUP_BACKGROUND", False),
+            )
+
         # Replace WSGI application using factory if provided (e.g. to install
         # WSGI middleware).
-        if wsgi_factory:
+        if finish_wsgi:
+            app.wsgi_app = finish_wsgi(app)
+        elif wsgi_factory:
             app.wsgi_app = wsgi_factory(app, **kwargs)
 
+        # Compile the routing of all applications once, before forking.
+        if app.config.get("APP_COMPILE_URL_MAPS", False):
+            compile_url_maps(app)
+
         # See https://bugs.python.org/issue31558 for how this helps with memory use
         if app.config.get("APP_GC_FREEZE", False):
             gc.freeze()
@@ -271,6 +347,81 @@ def urls_builder_loader(app, factory, **kwargs):
         app._urls_builder = NoOpInvenioUrlsBuilder()
 
 
+def lazy_context_loader(app, entry_points=None, modules=None):
+    """Load the lazy template context values.
+
+    The template context resolving them is only installed if lazy context
+    values are registered, here or by the extensions and blueprints loaded
+    before.
+
+    :param entry_points: List of entry points providing the lazy context
+        values by name.
+    :param modules: Map of lazy context values.
+
+    .. versionadded:: 2.5.0
+    """
+    if entry_points:
+        for entry_point in entry_points:
+            for ep in iter_entry_points(group=entry_point):
+                try:
+                    add_lazy_context(app, ep.name, ep.load())
+                except Exception:
+                    app.logger.error(f"Failed to initialize entry point: {ep}")
+                    raise
+
+    if modules:
+        for name, func in modules.items():
+            add_lazy_context(app, name, func)
+
+    if getattr(app, "_lazy_context", None):
+        app.jinja_env.context_class = LazyContext
+
+
+def _iter_url_maps(wsgi_app, seen):
+    """Iterate over the URL maps of the applications of a WSGI stack."""
+    while wsgi_app is not None and id(wsgi_app) not in seen:
+        seen.add(id(wsgi_app))
+        if isinstance(wsgi_app, Flask):
+            yield wsgi_app.url_map
+            urls_builder_map = getattr(
+                getattr(wsgi_app, "_urls_builder", None), "url_map", None
+            )
+            if urls_builder_map is not None:
+                yield urls_builder_map
+            wsgi_app = wsgi_app.wsgi_app
+            continue
+        # Mounted applications (e.g. ``DispatcherMiddleware``).
+        mounts = getattr(wsgi_app, "mounts", None)
+        if isinstance(mounts, dict):
+            for mounted in mounts.values():
+                yield from _iter_url_maps(mounted, seen)
+        # Wrapped application of middlewares (not built lazy mounts are
+        # ``None``), or the Flask application of its ``wsgi_app`` method.
+        wsgi_app = getattr(wsgi_app, "app", getattr(wsgi_app, "__self__", None))
+
+
+def compile_url_maps(app):
+    """Compile the URL maps of an application and of its mounted applications.
+
+    Werkzeug finalizes the matcher of a URL map on the first match or build.
+    Doing it once, before the workers are forked, shares the result with all
+    of them instead of repeating it on the first request of each worker.
+
+    The URL map of the application, the URL map of its URLs builder, and the
+    ones of the applications mounted in its WSGI stack (e.g. by
+    :func:`invenio_base.wsgi.create_wsgi_factory`) are compiled.
+
+    :param app: The Flask application.
+    :returns: The number of compiled URL maps.
+
+    .. versionadded:: 2.5.0
+    """
+    url_maps = list(_iter_url_maps(app, set()))
+    for url_map in url_maps:
+        url_map.update()
+    return len(url_maps)
+
+
 def converter_loader(app, entry_points=None, modules=None):
     """Run default converter loader.
 
@@ -327,6 +478,7 @@ def base_app(
     instance_relative_config=True,
     root_path=None,
     app_class=Flask,
+    template_cache=False,
 ):
     """Invenio base application factory.
 
@@ -337,9 +489,15 @@ def base_app(
     :param instance_path: Instance path for Flask application.
     :param static_folder: Static folder path.
     :param app_class: Flask application class.
+    :param template_cache: Cache the compiled templates in the
+        ``templates-cache`` folder of the instance folder (see
+        :func:`invenio_base.templating.create_bytecode_cache`).
     :returns: Flask application instance.
 
     .. versionadded: 1.0.0
+
+    .. versionchanged:: 2.5.0
+       Added the ``template_cache`` argument.
     """
     configure_warnings()
 
@@ -361,6 +519,14 @@ def base_app(
     except Exception:  # pragma: no cover
         app.logger.exception(f'Failed to create instance folder: "{instance_path}"')
 
+    if template_cache:
+        app.jinja_options = {
+            **app.jinja_options,
+            "bytecode_cache": create_bytecode_cache(
+                os.path.join(app.instance_path, "templates-cache")
+            ),
+        }
+
     return app
 
 
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Fingerprinted URLs of static files.
+
+A manifest of the content hashes of the files of the static folder is built
+when the application is created, so that their URLs change whenever their
+content does. Browsers and CDNs can then cache them forever.
+
+It is enabled with the ``APP_STATIC_MANIFEST`` configuration variable, and
+configured with:
+
+- ``APP_STATIC_MANIFEST_CACHE`` - file caching the hashes between builds, so
+  that only new and modified files (according to their modification time and
+  size) are hashed (by default ``<instance_path>/static-manifest.json``).
+- ``APP_STATIC_MANIFEST_MAX_AGE`` - maximum age in seconds of fingerprinted
+  files (by default one year).
+
+Templates build fingerprinted URLs with :func:`static_url`:
+
+.. code-block:: html+jinja
+
+   <script src="{{ static_url('js/app.js') }}"></script>
+
+which renders ``/static/js/app.js?v=<hash>``. Responses to fingerprinted
+URLs with the current hash of the file are sent with far-future cache
+headers.
+"""
+
+import hashlib
+import json
+import os
+
+from flask import current_app, request, url_for
+
+FINGERPRINT_ARG = "v"
+"""Query argument of the fingerprint in static URLs."""
+
+
+def immutable_cache_control(max_age=31536000):
+    """Get the ``Cache-Control`` header value of fingerprinted files."""
+    return f"public, max-age={int(max_age)}, immutable"
+
+
+def _hash_file(path):
+    """Compute the content hash of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+class StaticManifest:
+    """Manifest of the content hashes of the files of a static folder.
+
+    :param directory: The static folder.
+    :param cache_file: File caching the hashes between builds (optional).
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(self, directory, cache_file=None):
+        """Initialize the manifest."""
+        self.directory = directory
+        self.cache_file = cache_file
+        self.hashes = {}
+
+    def _load_cache(self):
+        """Load the cached entries."""
+        if not self.cache_file:
+            return {}
+        try:
+            with open(self.cache_file) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    def _save_cache(self, entries):
+        """Save the entries to the cache file atomically."""
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        tmp_path = f"{self.cache_file}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.cache_file)
+
+    def build(self):
+        """Hash the new and modified files of the static folder.
+
+        :returns: The number of hashed files.
+        """
+        cache = self._load_cache()
+        entries = {}
+        hashed = 0
+        for root, dirs, names in os.walk(self.directory, followlinks=True):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                filename = os.path.relpath(path, self.directory).replace(os.sep, "/")
+                entry = cache.get(filename)
+                if (
+                    not entry
+                    or entry[0] != stat.st_mtime_ns
+                    or entry[1] != stat.st_size
+                ):
+                    entry = [stat.st_mtime_ns, stat.st_size, _hash_file(path)]
+                    hashed += 1
+                entries[filename] = entry
+        self.hashes = {filename: entry[2] for filename, entry in entries.items()}
+        if self.cache_file and (hashed or entries.keys() != cache.keys()):
+            self._save_cache(entries)
+        return hashed
+
+    def get(self, filename):
+        """Get the hash of a file, or ``None`` if it is unknown."""
+        return self.hashes.get(filename)
+
+
+def static_url(filename, **values):
+    """Build the fingerprinted URL of a static file.
+
+    Falls back to the plain URL if the file is not in the manifest, or if the
+    manifest is not enabled.
+
+    :param filename: Path of the file in the static folder.
+    :param values: Other arguments passed to :func:`flask.url_for`.
+    """
+    manifest = getattr(current_app, "_static_manifest", None)
+    fingerprint = manifest.get(filename) if manifest is not None else None
+    if fingerprint:
+        values[FINGERPRINT_ARG] = fingerprint
+    return url_for("static", filename=filename, **values)
+
+
+def _cache_fingerprinted(response):
+    """Send fingerprinted static files with far-future cache headers."""
+    fingerprint = request.args.get(FINGERPRINT_ARG)
+    if (
+        fingerprint
+        and request.endpoint == "static"
+        and response.status_code in (200, 206, 304)
+        and fingerprint
+        == current_app._static_manifest.get(request.view_args.get("filename"))
+    ):
+        response.headers["Cache-Control"] = immutable_cache_control(
+            current_app.config.get("APP_STATIC_MANIFEST_MAX_AGE", 31536000)
+        )
+        response.headers.pop("Expires", None)
+    return response
+
+
+def init_static_manifest(app):
+    """Build the static manifest of an application.
+
+    :param app: The Flask application.
+    :returns: The :class:`StaticManifest`.
+
+    .. versionadded:: 2.5.0
+    """
+    manifest = StaticManifest(
+        app.static_folder,
+        cache_file=app.config.get("APP_STATIC_MANIFEST_CACHE")
+        or os.path.join(app.instance_path, "static-manifest.json"),
+    )
+    hashed = manifest.build()
+    app.logger.debug(f"Hashed {hashed} of {len(manifest.hashes)} static files.")
+    app._static_manifest = manifest
+    app.after_request(_cache_fingerprinted)
+    return manifest
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 #
 # This file is part of Invenio.
-# Copyright (C) 2015-2018 CERN.
+# Copyright (C) 2015-2026 CERN.
 # Copyright (C) 2022 RERO.
 # Copyright (C) 2025 Graz University of Technology.
 #
@@ -91,6 +91,91 @@ def migrate_secret_key(old_key):
         )
 
 
+@instance.command("flamegraph")
+@click.option(
+    "-o",
+    "--output",
+    type=click.File("w"),
+    default="-",
+    help="Output file (by default the standard output).",
+)
+@with_appcontext
+def flamegraph(output):
+    """Print the sampling profiler stacks in the collapsed stack format."""
+    from .sampling import get_samples_directory, merge_samples
+
+    counts = merge_samples(get_samples_directory(current_app))
+    if not counts:
+        raise click.ClickException("No samples found.")
+    for stack, count in counts.most_common():
+        output.write(f"{stack} {count}\n")
+
+
+@instance.command("allocations")
+@click.option(
+    "-n",
+    "--top",
+    type=int,
+    default=10,
+    show_default=True,
+    help="Number of tracebacks per endpoint.",
+)
+@with_appcontext
+def allocations(top):
+    """Print the allocations of the sampled requests per endpoint."""
+    from .wsgi.allocations import (
+        format_report,
+        get_allocations_directory,
+        merge_reports,
+    )
+
+    report = merge_reports(get_allocations_directory(current_app))
+    if not report:
+        raise click.ClickException("No allocations found.")
+    click.echo(format_report(report, top=top))
+
+
+@instance.command("hooks")
+@click.option(
+    "-n",
+    "--top",
+    type=int,
+    default=20,
+    show_default=True,
+    help="Number of packages and of hooks.",
+)
+@with_appcontext
+def hooks(top):
+    """Print the durations of the request hooks per package and per hook."""
+    from .hooks import format_report, get_hook_timing_directory, merge_reports
+
+    report = merge_reports(get_hook_timing_directory(current_app))
+    if not report:
+        raise click.ClickException("No hook timings found.")
+    click.echo(format_report(report, top=top))
+
+
+@instance.command("compile-templates")
+@click.option(
+    "-e",
+    "--extension",
+    "extensions",
+    multiple=True,
+    help="File extension of the templates (by default all files).",
+)
+@with_appcontext
+def compile_templates_command(extensions):
+    """Compile the templates of all blueprints into the bytecode cache."""
+    from .templating import compile_templates
+
+    if current_app.jinja_env.bytecode_cache is None:
+        raise click.ClickException("The template cache is not enabled.")
+    compiled, failed = compile_templates(current_app, extensions=extensions or None)
+    for name in failed:
+        click.secho(f"Failed to compile: {name}", fg="yellow")
+    click.secho(f"Compiled {len(compiled)} templates.", fg="green")
+
+
 def generate_secret_key():
     """Generate secret key."""
     import random
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Cost of the request hooks of extensions.
+
+Extensions register hooks which run on every request: ``before_request``,
+``after_request`` and ``teardown_request`` functions, ``teardown_appcontext``
+functions, URL value preprocessors and template context processors.
+
+With the ``APP_HOOK_TIMING`` configuration variable, each hook registered when
+the application is loaded is wrapped to measure its duration. The durations
+are aggregated per hook, and per package owning the hook. It is configured
+with:
+
+- ``APP_HOOK_TIMING_DIR`` - directory where each process writes its report
+  (by default ``<instance_path>/hook-timing``).
+- ``APP_HOOK_TIMING_FLUSH_INTERVAL`` - minimum interval in seconds between
+  writes of the report (by default ``60``).
+
+The reports of all processes are merged and displayed with:
+
+.. code-block:: console
+
+   $ invenio instance hooks
+"""
+
+import json
+import os
+import threading
+from functools import wraps
+from time import monotonic, perf_counter
+
+HOOK_TYPES = {
+    "before_request": "before_request_funcs",
+    "after_request": "after_request_funcs",
+    "teardown_request": "teardown_request_funcs",
+    "url_value_preprocessor": "url_value_preprocessors",
+    "context_processor": "template_context_processors",
+}
+"""Request hooks per type, by attribute of the Flask application."""
+
+
+def get_hook_timing_directory(app):
+    """Get the directory of the hook timing reports of an application."""
+    return app.config.get("APP_HOOK_TIMING_DIR") or os.path.join(
+        app.instance_path, "hook-timing"
+    )
+
+
+def hook_name(func):
+    """Get the qualified name of a hook."""
+    module = getattr(func, "__module__", None) or type(func).__module__
+    name = getattr(func, "__qualname__", None) or type(func).__qualname__
+    return f"{module}:{name}"
+
+
+def _merge(report, other):
+    """Merge a report into another one."""
+    for key, (calls, total, maximum) in other.items():
+        entry = report.setdefault(key, [0, 0.0, 0.0])
+        entry[0] += calls
+        entry[1] += total
+        entry[2] = max(entry[2], maximum)
+    return report
+
+
+def merge_reports(directory):
+    """Merge the hook timing reports written by all processes.
+
+    :param directory: Directory of the reports.
+    :returns: Dictionary per ``"<type> <hook>"`` of the number of calls, the
+        total and the maximum duration in seconds.
+    """
+    report = {}
+    if not os.path.isdir(directory):
+        return report
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name)) as f:
+                _merge(report, json.load(f))
+    return report
+
+
+def format_report(report, top=20):
+    """Format a hook timing report.
+
+    The packages and then the hooks are sorted by decreasing total duration.
+
+    :param report: Report as returned by :func:`merge_reports`.
+    :param top: Number of hooks.
+    :returns: The formatted report.
+    """
+    packages = {}
+    for key, entry in report.items():
+        package = key.split(" ", 1)[1].split(":", 1)[0].split(".", 1)[0]
+        _merge(packages, {package: entry})
+
+    def lines(entries):
+        entries = sorted(entries.items(), key=lambda i: i[1][1], reverse=True)
+        for key, (calls, total, maximum) in entries[:top]:
+            yield (
+                f"  {total * 1000:.1f} ms total, {total / calls * 1000:.3f} ms "
+                f"average, {maximum * 1000:.3f} ms max, {calls} calls: {key}"
+            )
+
+    return "\n".join(["Packages:", *lines(packages), "Hooks:", *lines(report)])
+
+
+class HookTiming:
+    """Durations of the request hooks of a process.
+
+    :param directory: Directory where the report is written (optional).
+    :param flush_interval: Minimum interval in seconds between writes of the
+        report.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(self, directory=None, flush_interval=60):
+        """Initialize the timing."""
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.report = {}
+        self._flushed = monotonic()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        """Forget the report of the parent process."""
+        self.report = {}
+        self._flushed = monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, key, duration):
+        """Add the duration of a hook call."""
+        with self._lock:
+            entry = self.report.get(key)
+            if entry is None:
+                self.report[key] = [1, duration, duration]
+            else:
+                entry[0] += 1
+                entry[1] += duration
+                if duration > entry[2]:
+                    entry[2] = duration
+
+    def wrap(self, hook_type, func):
+        """Wrap a hook to measure its duration."""
+        key = f"{hook_type} {hook_name(func)}"
+
+        @wraps(func)
+        def hook(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(key, perf_counter() - start)
+
+        return hook
+
+    def flush(self, force=False):
+        """Write the report of the process if the flush interval elapsed."""
+        if not self.directory:
+            return
+        if not force and monotonic() - self._flushed < self.flush_interval:
+            return
+        with self._lock:
+            self._flushed = monotonic()
+            path = os.path.join(self.directory, f"{os.getpid()}.json")
+            with open(f"{path}.tmp", "w") as f:
+                json.dump(self.report, f)
+            os.replace(f"{path}.tmp", path)
+
+
+def init_hook_timing(app):
+    """Measure the duration of the request hooks of an application.
+
+    Must be called once all extensions are loaded, since only the hooks
+    registered at that time are measured.
+
+    :param app: The Flask application.
+    :returns: The :class:`HookTiming`, also stored in ``app._hook_timing``.
+
+    .. versionadded:: 2.5.0
+    """
+    timing = app._hook_timing = HookTiming(
+        directory=get_hook_timing_directory(app),
+        flush_interval=app.config.get("APP_HOOK_TIMING_FLUSH_INTERVAL", 60),
+    )
+    for hook_type, attr in HOOK_TYPES.items():
+        for funcs in getattr(app, attr).values():
+            funcs[:] = [timing.wrap(hook_type, func) for func in funcs]
+    app.teardown_appcontext_funcs[:] = [
+        timing.wrap("teardown_appcontext", func)
+        for func in app.teardown_appcontext_funcs
+    ]
+
+    def flush_hook_timing(exc):
+        timing.flush()
+
+    app.teardown_appcontext(flush_hook_timing)
+    return timing
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Statistical sampling profiler.
+
+A background thread samples the stacks of all threads of the process at a
+fixed interval and counts them in memory. Unlike deterministic profiling,
+the overhead does not depend on the executed code, so it can be kept
+enabled in production.
+
+It is enabled with the ``APP_SAMPLING_PROFILER`` configuration variable and
+started by :func:`invenio_base.app.create_app_factory` (once per process).
+It is configured with:
+
+- ``APP_SAMPLING_PROFILER_INTERVAL`` - sampling interval in seconds (by
+  default ``0.01``).
+- ``APP_SAMPLING_PROFILER_DIR`` - directory where each process writes its
+  samples (by default ``<instance_path>/sampling``).
+- ``APP_SAMPLING_PROFILER_FLUSH_INTERVAL`` - interval in seconds between
+  writes of the samples (by default ``60``).
+
+The samples are written in the collapsed stack format of
+`FlameGraph <https://github.com/brendangregg/FlameGraph>`_. The samples of
+all processes can be merged with:
+
+.. code-block:: console
+
+   $ invenio instance flamegraph > stacks.folded
+   $ flamegraph.pl stacks.folded > flamegraph.svg
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+FILE_SUFFIX = ".folded"
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+class SamplingProfiler:
+    """Sample the stacks of all threads of the process.
+
+    :param interval: Sampling interval in seconds.
+    :param directory: Directory where the samples are written (optional).
+    :param flush_interval: Interval in seconds between writes of the samples.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(self, interval=0.01, directory=None, flush_interval=60):
+        """Initialize the profiler."""
+        self.interval = interval
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.counts = Counter()
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    @property
+    def running(self):
+        """Whether the sampling thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the sampling thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="invenio-sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the sampling thread and write the samples."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _after_fork(self):
+        """Restart in the child process, with the samples of the child only."""
+        was_running = self._thread is not None
+        self._thread = None
+        self._stop = threading.Event()
+        self.counts = Counter()
+        if was_running:
+            self.start()
+
+    def _label(self, code):
+        """Get the label of a code object."""
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)
+            label = self._labels[code] = f"{code.co_filename}:{name}".replace(";", ":")
+        return label
+
+    def sample(self):
+        """Sample the stacks of all other threads."""
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()
+            self.counts[";".join(stack)] += 1
+
+    def _run(self):
+        """Sample until stopped."""
+        next_flush = time.monotonic() + self.flush_interval
+        while not self._stop.wait(self.interval):
+            self.sample()
+            if self.directory and time.monotonic() >= next_flush:
+                self.flush()
+                next_flush = time.monotonic() + self.flush_interval
+
+    def collapsed(self):
+        """Format the samples in the collapsed stack format."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.counts.most_common()
+        )
+
+    def flush(self):
+        """Write the samples of the process to the directory."""
+        if not self.directory:
+            return
+        path = os.path.join(self.directory, f"{os.getpid()}{FILE_SUFFIX}")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.collapsed())
+        os.replace(tmp_path, path)
+
+
+def merge_samples(directory):
+    """Merge the samples written by all processes.
+
+    :param directory: Directory of the samples.
+    :returns: Counter of samples per collapsed stack.
+    """
+    counts = Counter()
+    if not os.path.isdir(directory):
+        return counts
+    for name in os.listdir(directory):
+        if not name.endswith(FILE_SUFFIX):
+            continue
+        with open(os.path.join(directory, name)) as f:
+            for line in f:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                if stack:
+                    counts[stack] += int(count)
+    return counts
+
+
+def get_samples_directory(app):
+    """Get the directory of the samples of an application."""
+    return app.config.get("APP_SAMPLING_PROFILER_DIR") or os.path.join(
+        app.instance_path, "sampling"
+    )
+
+
+def start_sampling_profiler(app):
+    """Start the sampling profiler of the process, if not yet started.
+
+    :param app: The Flask application providing the configuration.
+    :returns: The :class:`SamplingProfiler`.
+    """
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = SamplingProfiler(
+                interval=app.config.get("APP_SAMPLING_PROFILER_INTERVAL", 0.01),
+                directory=get_samples_directory(app),
+                flush_interval=app.config.get(
+                    "APP_SAMPLING_PROFILER_FLUSH_INTERVAL", 60
+                ),
+            )
+        _profiler.start()
+        return _profiler
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Indexed template loader.
+
+Flask looks up a template by trying the loader of the application, and then
+the loader of each blueprint in registration order, until one of them finds
+it. With many blueprints, each template miss and each first load of a
+template probe the template folders of all of them.
+
+With the ``APP_TEMPLATE_INDEX`` configuration variable, the template folders
+are instead listed once when the application is loaded, into an index of the
+loader of each template following the same precedence. A lookup is then a
+single dictionary hit.
+
+Templates missing from the index (e.g. in symbolically linked folders, which
+are not listed) are still looked up in each loader in turn. Templates added
+after the application is loaded do however not override indexed ones until
+the index is rebuilt with :meth:`IndexedTemplateLoader.build`. The index is
+thus not used when templates are auto-reloaded (e.g. in debug mode), nor when
+template loading is explained (``EXPLAIN_TEMPLATE_LOADING``).
+
+Templates are also compiled from source by each worker on first use. With the
+``template_cache`` argument of :func:`invenio_base.app.base_app`, the compiled
+templates are cached in the instance folder (see
+:func:`create_bytecode_cache`), and can be compiled ahead of time (e.g. when
+building an image) with:
+
+.. code-block:: console
+
+   $ invenio instance compile-templates
+
+Finally, Flask calls all context processors on each rendering, whether the
+template uses their values or not. Expensive values (e.g. menus) can instead
+be registered as lazy context values, which are only computed when the
+rendered template or block references them, once per rendering. Jinja
+resolves the names referenced by a template or block when its rendering
+starts, so that a value referenced in a branch which is not rendered (e.g.
+``{% if false %}``) is still computed:
+
+.. code-block:: python
+
+   from invenio_base.templating import add_lazy_context
+
+   def init_app(app):
+       add_lazy_context(app, "user_menu", build_user_menu)
+
+Lazy context values can also be registered with the ``lazy_context`` and
+``lazy_context_entry_points`` arguments of
+:func:`invenio_base.app.create_app_factory`. Values of the context (e.g.
+passed to ``render_template``, or returned by context processors) take
+precedence over them.
+"""
+
+import os
+
+import jinja2
+from flask.templating import DispatchingJinjaLoader
+from jinja2 import (
+    BaseLoader,
+    ChoiceLoader,
+    FileSystemBytecodeCache,
+    TemplateNotFound,
+)
+from jinja2.loaders import split_template_path
+from jinja2.runtime import Context
+from jinja2.utils import missing
+
+_LAZY_CACHE_KEY = "__invenio_lazy_context__"
+
+
+class IndexedTemplateLoader(BaseLoader):
+    """Template loader looking up templates in an index of loaders.
+
+    The loaders are indexed in order: a template is loaded by the first loader
+    listing it. Loaders which cannot list their templates (e.g.
+    :class:`jinja2.FunctionLoader`) are not indexed, and are tried in order
+    before the indexed loader with a lower precedence. Templates missing from
+    the index are looked up in all loaders in order.
+
+    :param loaders: List of loaders, by decreasing precedence.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(self, loaders):
+        """Initialize the loader."""
+        self.loaders = list(loaders)
+        self.index = {}
+        self.unindexed = []
+
+    def build(self):
+        """Build the index of the templates.
+
+        :returns: The number of indexed templates.
+        """
+        index = {}
+        unindexed = []
+        for position, loader in enumerate(self.loaders):
+            try:
+                templates = loader.list_templates()
+            except TypeError:
+                unindexed.append((position, loader))
+                continue
+            for template in templates:
+                index.setdefault(template, (position, loader))
+        self.index = index
+        self.unindexed = unindexed
+        return len(index)
+
+    def get_source(self, environment, template):
+        """Get the source of a template."""
+        name = "/".join(split_template_path(template))
+        position, loader = self.index.get(name, (None, None))
+        if loader is None:
+            for loader in self.loaders:
+                try:
+                    return loader.get_source(environment, template)
+                except TemplateNotFound:
+                    pass
+            raise TemplateNotFound(template)
+        for other_position, other in self.unindexed:
+            if other_position > position:
+                break
+            try:
+                return other.get_source(environment, template)
+            except TemplateNotFound:
+                pass
+        return loader.get_source(environment, template)
+
+    def list_templates(self):
+        """List the indexed templates."""
+        return sorted(self.index)
+
+
+def _replace_dispatching_loader(loader, indexed):
+    """Replace Flask's dispatching loader in a (wrapping) loader.
+
+    :returns: The loader to use instead, or ``None`` if Flask's loader was not
+        found.
+    """
+    if isinstance(loader, DispatchingJinjaLoader):
+        return indexed
+    if isinstance(loader, ChoiceLoader):
+        replaced = [
+            _replace_dispatching_loader(child, indexed) for child in loader.loaders
+        ]
+        if any(child is not None for child in replaced):
+            loader.loaders = [
+                new if new is not None else old
+                for new, old in zip(replaced, loader.loaders)
+            ]
+            return loader
+    return None
+
+
+def init_template_index(app):
+    """Look up the templates of an application in an index.
+
+    The index follows the precedence of Flask: the templates of the
+    application, and then the ones of the blueprints in registration order.
+    It replaces Flask's loader, also when extensions wrapped it in a
+    :class:`jinja2.ChoiceLoader` (e.g. to override templates). Other loaders
+    are left in place.
+
+    :param app: The Flask application.
+    :returns: The :class:`IndexedTemplateLoader`, or ``None`` if Flask's
+        loader was not found.
+
+    .. versionadded:: 2.5.0
+    """
+    loaders = [app.jinja_loader] + [bp.jinja_loader for bp in app.iter_blueprints()]
+    loader = IndexedTemplateLoader([loader for loader in loaders if loader])
+    replaced = _replace_dispatching_loader(app.jinja_env.loader, loader)
+    if replaced is None:
+        app.logger.debug("Template loader replaced, templates not indexed.")
+        return None
+    indexed = loader.build()
+    app.logger.debug(f"Indexed {indexed} templates.")
+    app.jinja_env.loader = replaced
+    return loader
+
+
+def create_bytecode_cache(directory):
+    """Create a bytecode cache of compiled templates in a folder.
+
+    A cached template is used as long as the checksum of its source is the
+    same, and the files of each Jinja version are kept apart, so that an
+    upgrade does not load bytecode compiled by another version. Each file is
+    written to a temporary file which is then renamed, so that concurrent
+    workers never read a partially written file.
+
+    :param directory: The folder, created if it does not exist.
+    :returns: The :class:`jinja2.FileSystemBytecodeCache`.
+
+    .. versionadded:: 2.5.0
+    """
+    os.makedirs(directory, exist_ok=True)
+    return FileSystemBytecodeCache(
+        directory, pattern=f"__jinja2_{jinja2.__version__}_%s.cache"
+    )
+
+
+def compile_templates(app, extensions=None):
+    """Compile all the templates of an application.
+
+    With a bytecode cache, the compiled templates are stored in it.
+
+    :param app: The Flask application.
+    :param extensions: List of file extensions of the templates (by default
+        all files of the template folders).
+    :returns: Tuple of the list of compiled templates and of the list of
+        templates which failed to compile.
+
+    .. versionadded:: 2.5.0
+    """
+    compiled, failed = [], []
+    for name in app.jinja_env.list_templates(extensions=extensions):
+        try:
+            app.jinja_env.get_template(name)
+        except jinja2.TemplateError:
+            failed.append(name)
+        else:
+            compiled.append(name)
+    return compiled, failed
+
+
+def add_lazy_context(app, name, func):
+    """Register a lazy template context value.
+
+    :param app: The Flask application.
+    :param name: Name of the value in the templates.
+    :param func: Callable without arguments computing the value. It is called
+        at most once per rendering, only if the rendered template or block
+        references the value.
+
+    .. versionadded:: 2.5.0
+    """
+    if not hasattr(app, "_lazy_context"):
+        app._lazy_context = {}
+    app._lazy_context[name] = func
+
+
+class LazyContext(Context):
+    """Template context computing the lazy context values when referenced.
+
+    The computed values are shared with the templates included or imported
+    with context during the same rendering.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(self, environment, parent, name, blocks, globals=None):
+        """Initialize the context."""
+        super().__init__(environment, parent, name, blocks, globals=globals)
+        # Included templates get the cache of the including template.
+        cache = parent.get(_LAZY_CACHE_KEY)
+        self.vars[_LAZY_CACHE_KEY] = {} if cache is None else cache
+
+    def resolve_or_missing(self, key):
+        """Look up a variable, computing it if it is a lazy context value."""
+        value = super().resolve_or_missing(key)
+        if value is not missing:
+            return value
+        funcs = getattr(getattr(self.environment, "app", None), "_lazy_context", None)
+        if not funcs or key not in funcs:
+            return missing
+        cache = self.vars[_LAZY_CACHE_KEY]
+        if key not in cache:
+            cache[key] = funcs[key]()
+        return cache[key]
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Server timing of requests.
+
+Breaks down the latency of requests per phase in a ``Server-Timing``
+response header, which is displayed by the browser developer tools.
+
+It is enabled per application with the ``APP_SERVER_TIMING`` configuration
+variable, and records the following phases:
+
+- ``routing`` - from the WSGI call to the start of the request (request
+  context, session and URL matching).
+- ``before`` - the ``before_request`` hooks.
+- ``view`` - the view function and the creation of the response.
+- ``after`` - the ``after_request`` hooks.
+- ``render`` - the rendering of templates (part of the view).
+- ``url`` - the URL building with ``invenio_url_for`` (part of the view).
+
+Extensions can record their own spans, which is a no-op when server timing
+is not enabled:
+
+.. code-block:: python
+
+   from invenio_base.timing import span
+
+   with span("serialize", "Search results serialization"):
+       ...
+"""
+
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+from flask import (
+    before_render_template,
+    request_finished,
+    request_started,
+    template_rendered,
+)
+
+_current = ContextVar("invenio_base_server_timing", default=None)
+
+
+class ServerTiming:
+    """Timing spans of a request."""
+
+    __slots__ = ("last", "spans", "render_start")
+
+    def __init__(self):
+        """Start timing."""
+        self.last = perf_counter()
+        self.spans = {}
+        self.render_start = None
+
+    def add(self, name, duration, desc=None):
+        """Add a duration to a span.
+
+        :param name: Name of the span.
+        :param duration: Duration in seconds.
+        :param desc: Description of the span.
+        """
+        span = self.spans.get(name)
+        if span is None:
+            self.spans[name] = [duration, desc]
+        else:
+            span[0] += duration
+
+    def mark(self, name):
+        """End a phase started at the end of the previous one."""
+        now = perf_counter()
+        self.add(name, now - self.last)
+        self.last = now
+
+    def header(self):
+        """Format the ``Server-Timing`` header value."""
+        metrics = []
+        for name, (duration, desc) in self.spans.items():
+            metric = f"{name};dur={duration * 1000:.3f}"
+            if desc:
+                desc = desc.replace("\\", "\\\\").replace('"', '\\"')
+                metric += f';desc="{desc}"'
+            metrics.append(metric)
+        return ", ".join(metrics)
+
+
+def current_timing():
+    """Get the server timing of the current request.
+
+    :returns: The :class:`ServerTiming`, or ``None`` if not enabled.
+    """
+    return _current.get()
+
+
+def add_timing(name, duration, desc=None):
+    """Add a duration to a span of the current request.
+
+    :param name: Name of the span.
+    :param duration: Duration in seconds.
+    :param desc: Description of the span.
+    """
+    timing = _current.get()
+    if timing is not None:
+        timing.add(name, duration, desc)
+
+
+class span:
+    """Context manager timing a span of the current request.
+
+    Entering the same span several times adds up the durations.
+
+    :param name: Name of the span.
+    :param desc: Description of the span.
+    """
+
+    __slots__ = ("name", "desc", "timing", "start")
+
+    def __init__(self, name, desc=None):
+        """Initialize the span."""
+        self.name = name
+        self.desc = desc
+
+    def __enter__(self):
+        """Start the span."""
+        self.timing = _current.get()
+        if self.timing is not None:
+            self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        """End the span."""
+        if self.timing is not None:
+            self.timing.add(self.name, perf_counter() - self.start, self.desc)
+
+
+class ServerTimingMiddleware:
+    """Add the ``Server-Timing`` header to the responses.
+
+    :param app: The WSGI application.
+    """
+
+    def __init__(self, app):
+        """Initialize the middleware."""
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        """Time the request."""
+        timing = ServerTiming()
+        token = _current.set(timing)
+
+        def _start_response(status, headers, exc_info=None):
+            headers.append(("Server-Timing", timing.header()))
+            return start_response(status, headers, exc_info)
+
+        try:
+            return self.app(environ, _start_response)
+        finally:
+            _current.reset(token)
+
+
+def _mark(name):
+    """Create a hook ending a phase of the current request.
+
+    The hook can be used as request hook or as signal receiver.
+    """
+
+    def hook(*args, **kwargs):
+        timing = _current.get()
+        if timing is not None:
+            timing.mark(name)
+        return args[0] if args else None
+
+    return hook
+
+
+_mark_routing = _mark("routing")
+_mark_after = _mark("after")
+
+
+def _mark_after_call(method, name):
+    """Wrap a method to end a phase once it returns."""
+    mark = _mark(name)
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        try:
+            return method(*args, **kwargs)
+        finally:
+            mark()
+
+    return wrapper
+
+
+def _mark_before_call(method, name):
+    """Wrap a method to end a phase when it is called."""
+    mark = _mark(name)
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        mark()
+        return method(*args, **kwargs)
+
+    return wrapper
+
+
+def _render_started(sender, **kwargs):
+    timing = _current.get()
+    if timing is not None:
+        timing.render_start = perf_counter()
+
+
+def _render_finished(sender, **kwargs):
+    timing = _current.get()
+    if timing is not None and timing.render_start is not None:
+        timing.add("render", perf_counter() - timing.render_start)
+        timing.render_start = None
+
+
+def init_server_timing(app):
+    """Enable the server timing on an application.
+
+    Must be called once all extensions are loaded, so that the phases
+    include their request hooks.
+
+    :param app: The Flask application.
+
+    .. versionadded:: 2.5.0
+    """
+    # Connecting the same receiver twice is a no-op.
+    request_started.connect(_mark_routing, weak=False)
+    request_finished.connect(_mark_after, weak=False)
+    before_render_template.connect(_render_started, weak=False)
+    template_rendered.connect(_render_finished, weak=False)
+
+    # Flask calls the hooks of the application and of the blueprints in
+    # turn, so the phases end around the methods calling all of them.
+    app.preprocess_request = _mark_after_call(app.preprocess_request, "before")
+    app.process_response = _mark_before_call(app.process_response, "view")
+
+    app.wsgi_app = ServerTimingMiddleware(app.wsgi_app)
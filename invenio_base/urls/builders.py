@@ -22,6 +22,7 @@ from abc import ABC, abstractmethod
 from flask import Flask, current_app
 from werkzeug.routing import BuildError, Map, Rule
 
+from ..utils import collect_url_rules
 from ..utils import entry_points as iter_entry_points
 from .proxies import current_app_map_adapter, other_app_map_adapter
 
@@ -138,11 +139,22 @@ class InvenioAppsUrlsBuilder(InvenioUrlsBuilder):
 
         self._load_converters(app_tmp, defaults=app.url_map.converters)
 
-        self._load_blueprints(app_tmp)
+        # The rules are only collected, they are compiled once in the new map.
+        with collect_url_rules(app_tmp.url_map) as collected:
+            self._load_blueprints(app_tmp)
+
+        # Same order as ``Map.iter_rules``: grouped by endpoint.
+        rules_by_endpoint = {}
+        for r in [*app_tmp.url_map.iter_rules(), *collected]:
+            rules_by_endpoint.setdefault(r.endpoint, []).append(r)
 
         # End goal: copy the Rules minus the view_functions (don't need them)
         self.url_map = Map(
-            [Rule(r.rule, endpoint=r.endpoint) for r in app_tmp.url_map.iter_rules()],
+            [
+                Rule(r.rule, endpoint=r.endpoint)
+                for rules in rules_by_endpoint.values()
+                for r in rules
+            ],
             converters=app_tmp.url_map.converters,
         )
 
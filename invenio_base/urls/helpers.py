@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 #
 # This file is part of Invenio.
-# Copyright (C) 2025 CERN.
+# Copyright (C) 2025-2026 CERN.
 # Copyright (C) 2025 Northwestern University.
 #
 # Invenio is free software; you can redistribute it and/or modify it
@@ -15,6 +15,8 @@ circular import.
 
 from flask import current_app
 
+from ..timing import span
+
 
 def invenio_url_for(
     endpoint,
@@ -38,9 +40,10 @@ def invenio_url_for(
     interface in all other ways (e.g., _anchor, _method ...).
     """
 
-    return current_app._urls_builder.build(
-        endpoint,
-        values,
-        method=_method,
-        anchor=_anchor,
-    )
+    with span("url"):
+        return current_app._urls_builder.build(
+            endpoint,
+            values,
+            method=_method,
+            anchor=_anchor,
+        )
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 #
 # This file is part of Invenio.
-# Copyright (C) 2017-2020 CERN.
+# Copyright (C) 2017-2026 CERN.
 # Copyright (C) 2025 Graz University of Technology.
 #
 # Invenio is free software; you can redistribute it and/or modify it
@@ -10,6 +10,8 @@
 """Base utilities."""
 
 import importlib.metadata as m
+import os
+from contextlib import contextmanager
 from sys import version_info
 
 from flask import current_app
@@ -63,3 +65,40 @@ def load_or_import_from_config(key, app=None, default=None):
     app = app or current_app
     value = app.config.get(key)
     return obj_or_import_string(value, default=default)
+
+
+def get_rss():
+    """Get the resident set size of the current process.
+
+    The value is read from ``/proc/self/statm``, hence only available on
+    Linux.
+
+    :returns: The resident set size in bytes, or ``0`` if it is unknown.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, IndexError, OSError, ValueError):  # pragma: no cover
+        return 0
+
+
+@contextmanager
+def collect_url_rules(url_map):
+    """Collect the rules added to a URL map instead of adding them.
+
+    Adding a rule to a URL map binds and compiles it. Collecting the rules
+    registered by blueprints allows to build another map from them without
+    compiling them twice.
+
+    :param url_map: The :class:`~werkzeug.routing.Map`.
+    :returns: Context manager yielding the list of collected rules, in the
+        order they were added.
+
+    .. versionadded:: 2.5.0
+    """
+    rules = []
+    url_map.add = lambda rulefactory: rules.extend(rulefactory.get_rules(url_map))
+    try:
+        yield rules
+    finally:
+        del url_map.add
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Warm-up of the application before serving requests.
+
+The first requests served by a new worker are slow: templates are compiled,
+the routing matcher is built, caches are filled and connections opened.
+Packages can do this work ahead of time by registering warm-up functions in
+an entry point group passed to
+:func:`invenio_base.app.create_app_factory` (``warmup_entry_points``):
+
+.. code-block:: python
+
+   def warm_up_templates(app):
+       app.jinja_env.get_template("invenio_theme/page.html")
+
+A warm-up function receives the Flask application and is called in an
+application context once the application is loaded. Errors are logged and do
+not prevent the application from starting.
+
+The warm-up runs in a background thread if ``APP_WARMUP_BACKGROUND`` is
+enabled. The readiness probe of
+:func:`invenio_base.wsgi.wsgi_health` then fails until it is finished, so
+that load balancers only send traffic to warm workers.
+"""
+
+import os
+import threading
+import weakref
+from time import perf_counter
+
+from .utils import entry_points as iter_entry_points
+
+_background = weakref.WeakSet()
+"""Unfinished background warm-ups, restarted in forked processes."""
+
+
+class Warmup:
+    """Warm-up functions of an application.
+
+    :param app: The Flask application.
+    :param functions: List of ``(name, function)`` tuples.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(self, app, functions):
+        """Initialize the warm-up."""
+        self.app = app
+        self.functions = functions
+        self.durations = {}
+        self.done = threading.Event()
+        self._thread = None
+
+    @property
+    def ready(self):
+        """Whether the warm-up is finished."""
+        return self.done.is_set()
+
+    def run(self):
+        """Call the warm-up functions."""
+        for name, function in self.functions:
+            start = perf_counter()
+            try:
+                with self.app.app_context():
+                    function(self.app)
+            except Exception:
+                self.app.logger.exception(f"Failed to warm up: {name}")
+            self.durations[name] = perf_counter() - start
+        self.done.set()
+        _background.discard(self)
+
+    def start(self):
+        """Call the warm-up functions in a background thread."""
+        _background.add(self)
+        self._thread = threading.Thread(
+            target=self.run, name="invenio-warmup", daemon=True
+        )
+        self._thread.start()
+
+    def _after_fork(self):
+        """Restart an unfinished background warm-up in the child process."""
+        if self._thread is not None and not self.done.is_set():
+            self.start()
+
+
+def _after_fork():
+    """Restart the unfinished background warm-ups in the child process."""
+    for warmup in list(_background):
+        warmup._after_fork()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def load_warmup(app, entry_points):
+    """Load the warm-up functions of entry point groups.
+
+    :param app: The Flask application.
+    :param entry_points: List of entry point groups.
+    :returns: The :class:`Warmup`.
+    """
+    functions = []
+    for group in entry_points:
+        for ep in iter_entry_points(group=group):
+            try:
+                functions.append((ep.name, ep.load()))
+            except Exception:
+                app.logger.error(f"Failed to initialize entry point: {ep}")
+                raise
+    return Warmup(app, functions)
+
+
+def warm_up(app, entry_points, background=False):
+    """Warm up an application.
+
+    :param app: The Flask application.
+    :param entry_points: List of entry point groups of warm-up functions.
+    :param background: Whether to warm up in a background thread.
+    :returns: The :class:`Warmup`, also stored in ``app._warmup``.
+
+    .. versionadded:: 2.5.0
+    """
+    warmup = app._warmup = load_warmup(app, entry_points)
+    if background:
+        warmup.start()
+    else:
+        warmup.run()
+    return warmup
@@ -0,0 +1,609 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015-2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""WSGI application factory for Invenio."""
+
+import os
+import signal
+import warnings
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import timedelta
+
+# They were moved in the same version so they can be in one try/except
+try:
+    from werkzeug.middleware.dispatcher import DispatcherMiddleware
+    from werkzeug.middleware.proxy_fix import ProxyFix
+
+    WERKZEUG_GTE_014 = False
+except ImportError:
+    from werkzeug.contrib.fixers import ProxyFix
+    from werkzeug.wsgi import DispatcherMiddleware
+
+    WERKZEUG_GTE_014 = True
+
+from ..utils import entry_points
+from .allocations import AllocationTrackerMiddleware, get_allocations_directory
+from .asgi import ASGIAdapter
+from .compression import GzipMiddleware
+from .dispatcher import LazyMount, PrefixDispatcherMiddleware
+from .health import HealthCheckMiddleware
+from .memory import MemoryWatchdogMiddleware, send_signal
+from .metrics import DEFAULT_BUCKETS, MetricsMiddleware, MetricsRegistry
+from .profiling import ProfilerMiddleware
+from .proxyfix import ProxyFixDispatcherMiddleware
+from .static import StaticFilesMiddleware
+from .tenants import HostDispatcherMiddleware
+from .watchdog import WatchdogMiddleware
+
+
+def _submit_mounts(mounts_factories, max_workers=None, **kwargs):
+    """Start building the mounted applications in a thread pool.
+
+    :returns: Dictionary of futures per mount point.
+    """
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers or max(len(mounts_factories), 1),
+        thread_name_prefix="invenio-wsgi-mount",
+    )
+    futures = {
+        mount: executor.submit(factory, **kwargs)
+        for mount, factory in mounts_factories.items()
+    }
+    # Running builds are not cancelled, the threads exit once they are done.
+    executor.shutdown(wait=False)
+    return futures
+
+
+def _collect_mounts(futures):
+    """Wait for the mounted applications to be built.
+
+    All builds are awaited before raising, and errors are raised in the order
+    of the mount points so that the reported failure does not depend on the
+    thread scheduling.
+    """
+    wait(futures.values())
+    return {mount: future.result() for mount, future in futures.items()}
+
+
+def create_wsgi_factory(
+    mounts_factories,
+    concurrent=False,
+    max_workers=None,
+    lazy_mounts=None,
+    lazy_background_build=False,
+):
+    """Create a WSGI application factory.
+
+    Usage example:
+
+    .. code-block:: python
+
+       wsgi_factory = create_wsgi_factory({'/api': create_api})
+
+    When ``concurrent`` is enabled, the mounted applications are built in a
+    thread pool. Used as ``wsgi_factory`` of
+    :func:`invenio_base.app.create_app_factory`, the builds are started before
+    the main application is loaded, so that all applications are created at
+    the same time. If several builds fail, the exception of the first mount
+    point (in the order of ``mounts_factories``) is raised.
+
+    The applications of the mount points listed in ``lazy_mounts`` are not
+    built with the main application but on the first request under their
+    prefix (see :class:`~invenio_base.wsgi.dispatcher.LazyMount`). This saves
+    boot time and memory for rarely used applications. Use the ``built``
+    property of the returned dispatcher to check which ones have been built.
+
+    :param mounts_factories: Dictionary of mount points per application
+        factory.
+    :param concurrent: Build the mounted applications in a thread pool.
+    :param max_workers: Maximum number of threads used to build the mounted
+        applications (by default one per mount point).
+    :param lazy_mounts: List of mount points whose application is built on
+        the first request.
+    :param lazy_background_build: Build the lazy mounts in a background thread
+        once the first request has been received.
+
+    .. versionadded:: 1.0.0
+
+    .. versionchanged:: 2.5.0
+       Mounted applications are dispatched with
+       :class:`~invenio_base.wsgi.dispatcher.PrefixDispatcherMiddleware`.
+       Added the ``concurrent``, ``max_workers``, ``lazy_mounts`` and
+       ``lazy_background_build`` parameters.
+    """
+    lazy_mounts = set(lazy_mounts or ())
+    eager_factories = {
+        mount: factory
+        for mount, factory in mounts_factories.items()
+        if mount not in lazy_mounts
+    }
+
+    def dispatch(app, eager_mounts, **kwargs):
+        mounts = {
+            mount: (
+                eager_mounts[mount]
+                if mount in eager_mounts
+                else LazyMount(factory, **kwargs)
+            )
+            for mount, factory in mounts_factories.items()
+        }
+        return PrefixDispatcherMiddleware(
+            app.wsgi_app, mounts, background_build=lazy_background_build
+        )
+
+    def create_wsgi(app, **kwargs):
+        if concurrent:
+            mounts = _collect_mounts(
+                _submit_mounts(eager_factories, max_workers, **kwargs)
+            )
+        else:
+            mounts = {
+                mount: factory(**kwargs) for mount, factory in eager_factories.items()
+            }
+        return dispatch(app, mounts, **kwargs)
+
+    def prepare(**kwargs):
+        futures = _submit_mounts(eager_factories, max_workers, **kwargs)
+
+        def finish(app):
+            return dispatch(app, _collect_mounts(futures), **kwargs)
+
+        return finish
+
+    if concurrent:
+        create_wsgi.prepare = prepare
+
+    return create_wsgi
+
+
+def wsgi_proxyfix(factory=None):
+    """Fix Flask environment according to ``X-Forwarded-_`` headers.
+
+    .. note::
+
+       You must set ``WSGI_PROXIES`` to the correct number of proxies,
+       otherwise you application is susceptible to malicious attacks.
+
+    .. versionadded:: 1.0.0
+
+    .. note::
+
+       ``PROXY_CONFIG`` lets you specify the number of proxies which a HTTP
+       request is traversing before reaching the Invenio application. Invenio
+       will then be able to trust and therefore pick the correct headers set
+       by your proxy, for example host, protocol or scheme. This is important
+       to avoid any possible malicious attacks which could manipulate/inject
+       headers:
+
+       .. code-block:: python
+
+          PROXYFIX_CONFIG = {
+              x_for: 1,  # Invenio will trust only the first value of
+                         # X-Forwarded-For header and ignore the rest
+              x_proto: 0,  # No X-Forwarded-Proto header will be trusted
+              x_host: 0,  # No X-Forwarded-Host header will be trusted
+              x_port: 0,  # No X-Forwarded-Port header will be trusted
+              x_prefix: 0,  # No X-Forwarded-Prefix header will be trusted
+          }
+
+       This configuration defines which HTTP headers will be taken into
+       account by your application.
+
+       For example, if you have one proxy in front of your application and you
+       want your application to use the original HTTP scheme, you would set
+       the following configuration:
+
+       .. code-block:: python
+
+          PROXYFIX_CONFIG = {
+              x_proto: 1,
+          }
+
+       Which means, that the first ``X-Forwarded-Proto`` header will be taken
+       into account.
+
+    .. versionadded:: 1.2.0
+
+    .. deprecated:: 1.2
+
+       The ``WSGI_PROXIES`` configuration is deprecated and it will be removed,
+       use ``PROXYFIX_CONFIG`` instead.
+
+    .. versionchanged:: 2.5.0
+       When wrapping the dispatcher created by :func:`create_wsgi_factory`,
+       ``PROXYFIX_CONFIG`` is applied by
+       :class:`~invenio_base.wsgi.proxyfix.ProxyFixDispatcherMiddleware`
+       instead of an additional ``ProxyFix`` layer.
+    """
+
+    def wrap(app, wsgi_app):
+        num_proxies = app.config.get("WSGI_PROXIES")
+        proxy_config = app.config.get("PROXYFIX_CONFIG")
+        if proxy_config and not WERKZEUG_GTE_014:
+            # Apply the proxy fix and the dispatching in a single middleware.
+            if type(wsgi_app) is PrefixDispatcherMiddleware:
+                return ProxyFixDispatcherMiddleware(
+                    wsgi_app.app,
+                    wsgi_app.mounts,
+                    background_build=wsgi_app.background_build,
+                    **proxy_config,
+                )
+            return ProxyFix(wsgi_app, **proxy_config)
+        elif num_proxies:
+            warnings.warn(
+                "The WSGI_PROXIES configuration is deprecated and "
+                "it will be removed, use PROXYFIX_CONFIG instead",
+                PendingDeprecationWarning,
+            )
+            if WERKZEUG_GTE_014:
+                return ProxyFix(wsgi_app, num_proxies=num_proxies)
+            else:
+                return ProxyFix(wsgi_app, x_for=num_proxies)
+        return wsgi_app
+
+    return _wrap_factory(factory, wrap)
+
+
+def wsgi_metrics(factory=None):
+    """Record request latency metrics and expose them to Prometheus.
+
+    Installs :class:`~invenio_base.wsgi.metrics.MetricsMiddleware` around the
+    WSGI application created by ``factory``. It should be the outermost
+    factory so that the dispatching to mounted applications is recorded too:
+
+    .. code-block:: python
+
+       wsgi_factory = wsgi_metrics(
+           wsgi_proxyfix(create_wsgi_factory({'/api': create_api}))
+       )
+
+    The middleware is configured with:
+
+    - ``WSGI_METRICS_PATH`` - path of the exposition endpoint (by default
+      ``/metrics``, ``None`` disables it).
+    - ``WSGI_METRICS_BUCKETS`` - upper bounds of the histogram buckets in
+      seconds.
+    - ``WSGI_METRICS_MULTIPROCESS`` - share the metrics between the worker
+      processes of the node (see
+      :class:`~invenio_base.wsgi.multiprocess.MmapMetricsRegistry`).
+    - ``WSGI_METRICS_DIR`` - directory of the shared metrics files (by
+      default ``<instance_path>/metrics``).
+
+    .. versionadded:: 2.5.0
+    """
+
+    def wrap(app, wsgi_app):
+        buckets = app.config.get("WSGI_METRICS_BUCKETS", DEFAULT_BUCKETS)
+        if app.config.get("WSGI_METRICS_MULTIPROCESS", False):
+            # Imported on use since it relies on Unix file locks.
+            from .multiprocess import MmapMetricsRegistry
+
+            registry = MmapMetricsRegistry(
+                app.config.get("WSGI_METRICS_DIR")
+                or os.path.join(app.instance_path, "metrics"),
+                buckets=buckets,
+            )
+        else:
+            registry = MetricsRegistry(buckets=buckets)
+        return MetricsMiddleware(
+            wsgi_app,
+            registry=registry,
+            path=app.config.get("WSGI_METRICS_PATH", "/metrics"),
+        )
+
+    return _wrap_factory(factory, wrap)
+
+
+def wsgi_profiler(factory=None):
+    """Profile sampled requests and save the profiles in the instance folder.
+
+    Installs :class:`~invenio_base.wsgi.profiling.ProfilerMiddleware` around
+    the WSGI application created by ``factory`` if ``WSGI_PROFILER`` is
+    enabled. The middleware is configured with:
+
+    - ``WSGI_PROFILER_SAMPLE_RATE`` - profile one of every N requests (by
+      default ``1000``, ``0`` disables sampling).
+    - ``WSGI_PROFILER_PATHS`` - path prefixes which are always profiled.
+    - ``WSGI_PROFILER_HEADER`` - HTTP header triggering the profiling of a
+      request (e.g. ``X-Invenio-Profile``).
+    - ``WSGI_PROFILER_TOKEN`` - value the trigger header must have. Make
+      sure to set it if the header can be sent by anyone.
+    - ``WSGI_PROFILER_DIR`` - directory of the profiles (by default
+      ``<instance_path>/profiles``).
+    - ``WSGI_PROFILER_MAX_FILES`` - number of profiles kept (by default
+      ``100``).
+
+    .. versionadded:: 2.5.0
+    """
+
+    def wrap(app, wsgi_app):
+        if not app.config.get("WSGI_PROFILER", False):
+            return wsgi_app
+        return ProfilerMiddleware(
+            wsgi_app,
+            app.config.get("WSGI_PROFILER_DIR")
+            or os.path.join(app.instance_path, "profiles"),
+            sample_rate=app.config.get("WSGI_PROFILER_SAMPLE_RATE", 1000),
+            paths=app.config.get("WSGI_PROFILER_PATHS"),
+            trigger_header=app.config.get("WSGI_PROFILER_HEADER"),
+            trigger_token=app.config.get("WSGI_PROFILER_TOKEN"),
+            max_files=app.config.get("WSGI_PROFILER_MAX_FILES", 100),
+        )
+
+    return _wrap_factory(factory, wrap)
+
+
+def wsgi_watchdog(factory=None):
+    """Log the stack traces of slow requests.
+
+    Installs :class:`~invenio_base.wsgi.watchdog.WatchdogMiddleware` around
+    the WSGI application created by ``factory`` if ``WSGI_WATCHDOG`` is
+    enabled. The middleware is configured with:
+
+    - ``WSGI_WATCHDOG_THRESHOLD`` - duration in seconds after which a request
+      is reported (by default ``10``).
+    - ``WSGI_WATCHDOG_INTERVAL`` - interval in seconds between two checks (by
+      default ``1``).
+    - ``WSGI_WATCHDOG_REPEAT`` - interval in seconds between two reports of
+      the same request (by default ``10``).
+
+    .. versionadded:: 2.5.0
+    """
+
+    def wrap(app, wsgi_app):
+        if not app.config.get("WSGI_WATCHDOG", False):
+            return wsgi_app
+        return WatchdogMiddleware(
+            wsgi_app,
+            threshold=app.config.get("WSGI_WATCHDOG_THRESHOLD", 10),
+            interval=app.config.get("WSGI_WATCHDOG_INTERVAL", 1),
+            repeat=app.config.get("WSGI_WATCHDOG_REPEAT", 10),
+        )
+
+    return _wrap_factory(factory, wrap)
+
+
+def wsgi_memory_watchdog(factory=None):
+    """Recycle the worker when its memory grows over a limit.
+
+    Installs :class:`~invenio_base.wsgi.memory.MemoryWatchdogMiddleware`
+    around the WSGI application created by ``factory`` if
+    ``WSGI_MEMORY_LIMIT`` is set. The middleware is configured with:
+
+    - ``WSGI_MEMORY_LIMIT`` - maximum resident set size of the worker in
+      bytes.
+    - ``WSGI_MEMORY_SAMPLE_EVERY`` - sample the memory every N requests (by
+      default ``100``).
+    - ``WSGI_MEMORY_RECYCLE_SIGNAL`` - name of the signal sent to the worker
+      to recycle it (by default ``SIGTERM``).
+
+    .. versionadded:: 2.5.0
+    """
+
+    def wrap(app, wsgi_app):
+        limit = app.config.get("WSGI_MEMORY_LIMIT")
+        if not limit:
+            return wsgi_app
+        signum = getattr(
+            signal, app.config.get("WSGI_MEMORY_RECYCLE_SIGNAL", "SIGTERM")
+        )
+        return MemoryWatchdogMiddleware(
+            wsgi_app,
+            limit,
+            every=app.config.get("WSGI_MEMORY_SAMPLE_EVERY", 100),
+            recycle=send_signal(signum),
+        )
+
+    return _wrap_factory(factory, wrap)
+
+
+def wsgi_allocations(factory=None):
+    """Track the memory allocations of sampled requests per endpoint.
+
+    Installs :class:`~invenio_base.wsgi.allocations.AllocationTrackerMiddleware`
+    around the WSGI application created by ``factory`` if
+    ``WSGI_ALLOCATIONS`` is enabled. The middleware is configured with:
+
+    - ``WSGI_ALLOCATIONS_SAMPLE_RATE`` - trace one of every N requests (by
+      default ``1000``).
+    - ``WSGI_ALLOCATIONS_FRAMES`` - number of frames per traceback (by
+      default ``10``).
+    - ``WSGI_ALLOCATIONS_DIR`` - directory of the reports (by default
+      ``<instance_path>/allocations``).
+
+    The reports are displayed with ``invenio instance allocations``.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def wrap(app, wsgi_app):
+        if not app.config.get("WSGI_ALLOCATIONS", False):
+            return wsgi_app
+        return AllocationTrackerMiddleware(
+            wsgi_app,
+            get_allocations_directory(app),
+            sample_rate=app.config.get("WSGI_ALLOCATIONS_SAMPLE_RATE", 1000),
+            frames=app.config.get("WSGI_ALLOCATIONS_FRAMES", 10),
+        )
+
+    return _wrap_factory(factory, wrap)
+
+
+def wsgi_gzip(factory=None):
+    """Compress the responses with gzip.
+
+    Installs :class:`~invenio_base.wsgi.compression.GzipMiddleware` around
+    the WSGI application created by ``factory`` if ``WSGI_GZIP`` is enabled.
+    The middleware is configured with:
+
+    - ``WSGI_GZIP_LEVEL`` - compression level from ``1`` to ``9`` (by default
+      ``6``).
+    - ``WSGI_GZIP_MIN_SIZE`` - minimum size of the compressed responses in
+      bytes (by default ``500``).
+    - ``WSGI_GZIP_MIMETYPES`` - compressed content types (by default
+      :data:`~invenio_base.wsgi.compression.DEFAULT_MIMETYPES`).
+
+    Leave it disabled if the front proxy already compresses the responses.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def wrap(app, wsgi_app):
+        if not app.config.get("WSGI_GZIP", False):
+            return wsgi_app
+        return GzipMiddleware(
+            wsgi_app,
+            level=app.config.get("WSGI_GZIP_LEVEL", 6),
+            min_size=app.config.get("WSGI_GZIP_MIN_SIZE", 500),
+            mimetypes=app.config.get("WSGI_GZIP_MIMETYPES"),
+        )
+
+    return _wrap_factory(factory, wrap)
+
+
+def wsgi_static(factory=None):
+    """Serve the static folder of the application without entering Flask.
+
+    Installs :class:`~invenio_base.wsgi.static.StaticFilesMiddleware` around
+    the WSGI application created by ``factory`` if ``WSGI_STATIC`` is enabled
+    and the application has a static folder. The files are served on the
+    ``static_url_path`` of the application, with the maximum age of
+    ``SEND_FILE_MAX_AGE_DEFAULT``, or with far-future cache headers for
+    fingerprinted URLs (see :mod:`invenio_base.assets`).
+
+    .. versionadded:: 2.5.0
+    """
+
+    def wrap(app, wsgi_app):
+        if not app.config.get("WSGI_STATIC", False) or not app.has_static_folder:
+            return wsgi_app
+        max_age = app.config.get("SEND_FILE_MAX_AGE_DEFAULT")
+        if isinstance(max_age, timedelta):
+            max_age = int(max_age.total_seconds())
+        return StaticFilesMiddleware(
+            wsgi_app,
+            app.static_folder,
+            url_path=app.static_url_path,
+            max_age=max_age,
+            manifest=getattr(app, "_static_manifest", None),
+            manifest_max_age=app.config.get("APP_STATIC_MANIFEST_MAX_AGE", 31536000),
+        )
+
+    return _wrap_factory(factory, wrap)
+
+
+def wsgi_health(factory=None):
+    """Answer liveness and readiness probes without entering Flask.
+
+    Installs :class:`~invenio_base.wsgi.health.HealthCheckMiddleware` around
+    the WSGI application created by ``factory`` if ``WSGI_HEALTH`` is
+    enabled. The middleware is configured with:
+
+    - ``WSGI_HEALTH_LIVENESS_PATH`` - path of the liveness probe (by default
+      ``/ping``).
+    - ``WSGI_HEALTH_READINESS_PATH`` - path of the readiness probe (by
+      default ``/ready``).
+    - ``WSGI_HEALTH_TTL`` - duration in seconds during which the results of
+      the readiness checks are cached (by default ``5``).
+    - ``WSGI_HEALTH_CHECKS`` - dictionary of readiness checks per name.
+
+    Extensions register readiness checks with the
+    ``invenio_base.readiness_checks`` entry point group. A check is a
+    callable receiving the Flask application, called in an application
+    context, which fails by raising an exception or returning ``False``.
+    Checks must be lightweight (e.g. ``SELECT 1`` on the database).
+
+    The readiness probe fails until the warm-up of the application is
+    finished (see :mod:`invenio_base.warmup`).
+
+    .. versionadded:: 2.5.0
+    """
+
+    def wrap(app, wsgi_app):
+        if not app.config.get("WSGI_HEALTH", False):
+            return wsgi_app
+        checks = {
+            ep.name: ep.load() for ep in entry_points("invenio_base.readiness_checks")
+        }
+        checks.update(app.config.get("WSGI_HEALTH_CHECKS") or {})
+        warmup = getattr(app, "_warmup", None)
+        return HealthCheckMiddleware(
+            wsgi_app,
+            checks={
+                name: _with_app_context(app, check) for name, check in checks.items()
+            },
+            liveness_path=app.config.get("WSGI_HEALTH_LIVENESS_PATH", "/ping"),
+            readiness_path=app.config.get("WSGI_HEALTH_READINESS_PATH", "/ready"),
+            ttl=app.config.get("WSGI_HEALTH_TTL", 5),
+            gate=warmup.done.is_set if warmup is not None else None,
+        )
+
+    return _wrap_factory(factory, wrap)
+
+
+def _with_app_context(app, check):
+    """Create a function calling a check in an application context."""
+
+    def run():
+        with app.app_context():
+            return check(app)
+
+    return run
+
+
+def _wrap_factory(factory, wrap):
+    """Create a WSGI factory wrapping the application of another factory.
+
+    :param factory: The wrapped WSGI factory (by default ``app.wsgi_app`` is
+        wrapped).
+    :param wrap: Callable ``(app, wsgi_app) -> wsgi_app``.
+    :returns: The WSGI factory.
+    """
+
+    def create_wsgi(app, **kwargs):
+        wsgi_app = factory(app, **kwargs) if factory else app.wsgi_app
+        return wrap(app, wsgi_app)
+
+    def prepare(**kwargs):
+        finish = factory.prepare(**kwargs)
+        return lambda app: wrap(app, finish(app))
+
+    # Forward early preparation of the wrapped factory (see
+    # ``create_wsgi_factory``).
+    if hasattr(factory, "prepare"):
+        create_wsgi.prepare = prepare
+
+    return create_wsgi
+
+
+__all__ = (
+    "ASGIAdapter",
+    "AllocationTrackerMiddleware",
+    "GzipMiddleware",
+    "HealthCheckMiddleware",
+    "HostDispatcherMiddleware",
+    "LazyMount",
+    "MemoryWatchdogMiddleware",
+    "MetricsMiddleware",
+    "MetricsRegistry",
+    "PrefixDispatcherMiddleware",
+    "ProfilerMiddleware",
+    "ProxyFixDispatcherMiddleware",
+    "StaticFilesMiddleware",
+    "WatchdogMiddleware",
+    "create_wsgi_factory",
+    "wsgi_allocations",
+    "wsgi_gzip",
+    "wsgi_health",
+    "wsgi_memory_watchdog",
+    "wsgi_metrics",
+    "wsgi_profiler",
+    "wsgi_watchdog",
+    "wsgi_proxyfix",
+    "wsgi_static",
+)
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Sampled memory allocation tracking per endpoint."""
+
+import itertools
+import json
+import logging
+import os
+import threading
+import tracemalloc
+
+from flask import request_started
+
+from .metrics import ENDPOINT_ENVIRON_KEY, _call_on_close, store_endpoint
+
+logger = logging.getLogger(__name__)
+
+
+def get_allocations_directory(app):
+    """Get the directory of the allocation reports of an application."""
+    return app.config.get("WSGI_ALLOCATIONS_DIR") or os.path.join(
+        app.instance_path, "allocations"
+    )
+
+
+def _merge(report, other, keep):
+    """Merge a report into another one, keeping the largest tracebacks."""
+    for endpoint, data in other.items():
+        entry = report.setdefault(
+            endpoint, {"requests": 0, "peak": 0, "tracebacks": {}}
+        )
+        entry["requests"] += data["requests"]
+        entry["peak"] += data["peak"]
+        tracebacks = entry["tracebacks"]
+        for traceback, (size, count) in data["tracebacks"].items():
+            total = tracebacks.setdefault(traceback, [0, 0])
+            total[0] += size
+            total[1] += count
+        if keep and len(tracebacks) > keep:
+            entry["tracebacks"] = dict(
+                sorted(tracebacks.items(), key=lambda i: i[1][0], reverse=True)[:keep]
+            )
+    return report
+
+
+def merge_reports(directory, keep=None):
+    """Merge the allocation reports written by all processes.
+
+    :param directory: Directory of the reports.
+    :param keep: Number of tracebacks kept per endpoint.
+    :returns: Dictionary per endpoint with the number of sampled
+        ``requests``, the sum of their ``peak`` traced memory, and the size
+        and number of allocations per traceback in ``tracebacks``.
+    """
+    report = {}
+    if not os.path.isdir(directory):
+        return report
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name)) as f:
+                _merge(report, json.load(f), keep)
+    return report
+
+
+def format_report(report, top=10):
+    """Format an allocation report.
+
+    :param report: Report as returned by :func:`merge_reports`.
+    :param top: Number of tracebacks per endpoint.
+    :returns: The formatted report.
+    """
+    lines = []
+    endpoints = sorted(
+        report.items(),
+        key=lambda i: sum(size for size, count in i[1]["tracebacks"].values()),
+        reverse=True,
+    )
+    for endpoint, data in endpoints:
+        requests = data["requests"]
+        lines.append(
+            f"{endpoint or '<none>'}: {requests} requests, average peak "
+            f"{data['peak'] / requests / 1024:.1f} KiB"
+        )
+        tracebacks = sorted(
+            data["tracebacks"].items(), key=lambda i: i[1][0], reverse=True
+        )
+        for traceback, (size, count) in tracebacks[:top]:
+            lines.append(
+                f"  {size / requests / 1024:.1f} KiB, {count / requests:.1f} "
+                "blocks per request"
+            )
+            lines.extend(f"    {frame}" for frame in traceback.split("\n"))
+    return "\n".join(lines)
+
+
+class AllocationTrackerMiddleware:
+    """Track the memory allocations of sampled requests with ``tracemalloc``.
+
+    For one of every ``sample_rate`` requests, ``tracemalloc`` traces the
+    allocations during the request, and the allocations still alive at the
+    end of the request are grouped by traceback and accounted to the
+    endpoint, along with the peak of traced memory. The other requests do not
+    pay any tracing cost.
+
+    Since tracing is process wide, the allocations of concurrent requests in
+    other threads are accounted too. Requests are not sampled while
+    ``tracemalloc`` is already tracing.
+
+    Each process writes its report to ``directory``. Use
+    ``invenio instance allocations`` to display the merged reports.
+
+    :param app: The WSGI application.
+    :param directory: Directory of the reports, created if needed.
+    :param sample_rate: Trace one of every ``sample_rate`` requests.
+    :param frames: Number of frames stored per traceback.
+    :param keep: Number of tracebacks kept per endpoint.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(self, app, directory, sample_rate=1000, frames=10, keep=50):
+        """Initialize the middleware."""
+        self.app = app
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.frames = frames
+        self.keep = keep
+        self.report = {}
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        os.register_at_fork(after_in_child=self._after_fork)
+        # Connecting the same receiver twice is a no-op.
+        request_started.connect(store_endpoint, weak=False)
+
+    def _after_fork(self):
+        """Forget the report of the parent process."""
+        self.report = {}
+        self._lock = threading.Lock()
+
+    def _finish(self, environ):
+        """Stop tracing and account the allocations of the request."""
+        try:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        tracebacks = {}
+        for stat in snapshot.statistics("traceback")[: self.keep]:
+            tracebacks["\n".join(str(frame) for frame in stat.traceback)] = [
+                stat.size,
+                stat.count,
+            ]
+        endpoint = environ.get(ENDPOINT_ENVIRON_KEY) or ""
+        data = {endpoint: {"requests": 1, "peak": peak, "tracebacks": tracebacks}}
+
+        with self._lock:
+            _merge(self.report, data, self.keep)
+            path = os.path.join(self.directory, f"{os.getpid()}.json")
+            with open(f"{path}.tmp", "w") as f:
+                json.dump(self.report, f)
+            os.replace(f"{path}.tmp", path)
+
+    def __call__(self, environ, start_response):
+        """Trace the allocations of the request if sampled."""
+        if next(self._counter) % self.sample_rate or tracemalloc.is_tracing():
+            return self.app(environ, start_response)
+
+        tracemalloc.start(self.frames)
+
+        def finish():
+            try:
+                self._finish(environ)
+            except Exception:
+                logger.exception("Failed to record the request allocations.")
+
+        try:
+            app_iter = self.app(environ, start_response)
+        except BaseException:
+            tracemalloc.stop()
+            raise
+        return _call_on_close(app_iter, environ, finish)
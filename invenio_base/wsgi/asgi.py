@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""ASGI adapter running the WSGI application in a thread pool."""
+
+import asyncio
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from werkzeug.exceptions import ClientDisconnected
+
+logger = logging.getLogger(__name__)
+
+
+class _InputStream:
+    """WSGI input stream reading the request body from the ASGI channel.
+
+    The body is received chunk by chunk, as the application reads it.
+    """
+
+    def __init__(self, receive, loop):
+        """Initialize the stream."""
+        self._receive = receive
+        self._loop = loop
+        self._buffer = bytearray()
+        self._more = True
+
+    def _fill(self):
+        """Receive the next chunk of the body."""
+        message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+        if message["type"] == "http.disconnect":
+            self._more = False
+            raise ClientDisconnected()
+        self._buffer += message.get("body", b"")
+        self._more = message.get("more_body", False)
+
+    def _take(self, size):
+        """Take data from the buffer."""
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def read(self, size=-1):
+        """Read at most ``size`` bytes (all of them by default)."""
+        if size is None or size < 0:
+            while self._more:
+                self._fill()
+            return self._take(len(self._buffer))
+        while self._more and len(self._buffer) < size:
+            self._fill()
+        return self._take(size)
+
+    def readline(self, size=-1):
+        """Read a line of at most ``size`` bytes."""
+        while (
+            self._more
+            and b"\n" not in self._buffer
+            and (size is None or size < 0 or len(self._buffer) < size)
+        ):
+            self._fill()
+        end = self._buffer.find(b"\n") + 1 or len(self._buffer)
+        if size is not None and size >= 0:
+            end = min(end, size)
+        return self._take(end)
+
+    def readlines(self, hint=-1):
+        """Read the remaining lines."""
+        return list(self)
+
+    def __iter__(self):
+        """Iterate over the remaining lines."""
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            yield line
+
+
+class ASGIAdapter:
+    """Serve a WSGI application with an ASGI server.
+
+    Each request is handled by a thread of a bounded pool, so that idle
+    connections (e.g. HTTP keep-alive or HTTP/2 connections served by the
+    ASGI server) do not hold a thread. Request bodies are received and
+    response bodies sent chunk by chunk, while the thread waits for the
+    client to receive each chunk.
+
+    Requests wait in the event loop for a free thread. Once ``max_queue``
+    requests are waiting, the next ones are answered with ``503 Service
+    Unavailable``.
+
+    Wrap the Flask application to serve the whole WSGI stack created by the
+    WSGI factory (mounted applications, proxy fix, middlewares):
+
+    .. code-block:: python
+
+       from invenio_app.factory import create_app
+       from invenio_base.wsgi import ASGIAdapter
+
+       application = ASGIAdapter(create_app(), max_workers=32)
+
+    :param app: The WSGI application.
+    :param max_workers: Number of threads handling requests.
+    :param max_queue: Number of requests waiting for a thread (``None`` for
+        no limit).
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(self, app, max_workers=32, max_queue=None):
+        """Initialize the adapter."""
+        self.app = app
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.waiting = 0
+        self._executor = None
+        self._loop = None
+        self._semaphore = None
+
+    @property
+    def executor(self):
+        """The thread pool handling the requests."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="invenio-asgi"
+            )
+        return self._executor
+
+    async def __call__(self, scope, receive, send):
+        """Handle an ASGI connection."""
+        if scope["type"] == "http":
+            await self._http(scope, receive, send)
+        elif scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        else:
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+    async def _lifespan(self, receive, send):
+        """Handle the lifespan protocol."""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                executor, self._executor = self._executor, None
+                if executor is not None:
+                    # Requests in flight need the event loop to send their
+                    # responses, so wait for them outside of it.
+                    await asyncio.get_running_loop().run_in_executor(
+                        None, partial(executor.shutdown, wait=True)
+                    )
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope, receive, send):
+        """Handle a request in the thread pool."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        semaphore = self._semaphore
+
+        if (
+            semaphore.locked()
+            and self.max_queue is not None
+            and self.waiting >= self.max_queue
+        ):
+            await _send_error(send, "503 Service Unavailable", [(b"retry-after", b"1")])
+            return
+
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            environ = build_environ(scope, _InputStream(receive, loop))
+            await loop.run_in_executor(self.executor, self._run, environ, send, loop)
+        finally:
+            semaphore.release()
+
+    def _run(self, environ, send, loop):
+        """Run the WSGI application and send its response."""
+        state = {"status": None, "headers": None, "started": False}
+
+        def send_sync(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        def send_start():
+            state["started"] = True
+            send_sync(
+                {
+                    "type": "http.response.start",
+                    "status": int(state["status"][:3]),
+                    "headers": [
+                        (name.lower().encode("latin-1"), value.encode("latin-1"))
+                        for name, value in state["headers"]
+                    ],
+                }
+            )
+
+        def write(data):
+            if not state["started"]:
+                send_start()
+            if data:
+                send_sync(
+                    {"type": "http.response.body", "body": data, "more_body": True}
+                )
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and state["started"]:
+                raise exc_info[1].with_traceback(exc_info[2])
+            state["status"] = status
+            state["headers"] = headers
+            return write
+
+        try:
+            app_iter = self.app(environ, start_response)
+            try:
+                for chunk in app_iter:
+                    write(chunk)
+            finally:
+                if hasattr(app_iter, "close"):
+                    app_iter.close()
+        except Exception:
+            if state["started"]:
+                raise
+            logger.exception("Error while handling the request.")
+            asyncio.run_coroutine_threadsafe(
+                _send_error(send, "500 Internal Server Error"), loop
+            ).result()
+            return
+        if not state["started"]:
+            send_start()
+        send_sync({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def _send_error(send, status, headers=()):
+    """Send an error response."""
+    body = status.encode("latin-1")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": int(status[:3]),
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                *headers,
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def build_environ(scope, stream):
+    """Build the WSGI environ of an ASGI HTTP scope.
+
+    :param scope: The ASGI scope.
+    :param stream: The ``wsgi.input`` stream.
+    :returns: The WSGI environ.
+    """
+    root_path = scope.get("root_path", "")
+    path = scope["path"]
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path) :]
+    server = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": root_path.encode("utf-8").decode("latin-1"),
+        "PATH_INFO": path.encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]) if server[1] is not None else "80",
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": stream,
+        "wsgi.input_terminated": True,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    client = scope.get("client")
+    if client:
+        environ["REMOTE_ADDR"] = client[0]
+        environ["REMOTE_PORT"] = str(client[1])
+    for name, value in scope.get("headers", ()):
+        name = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if name in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            key = name
+        else:
+            key = f"HTTP_{name}"
+        if key in environ:
+            separator = "; " if key == "HTTP_COOKIE" else ","
+            value = f"{environ[key]}{separator}{value}"
+        environ[key] = value
+    return environ
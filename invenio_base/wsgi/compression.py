@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Streaming gzip compression of responses."""
+
+import zlib
+
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header
+
+DEFAULT_MIMETYPES = frozenset(
+    (
+        "application/javascript",
+        "application/json",
+        "application/xml",
+        "image/svg+xml",
+        "text/css",
+        "text/csv",
+        "text/html",
+        "text/javascript",
+        "text/plain",
+        "text/xml",
+    )
+)
+"""Default compressed content types.
+
+Types with the ``+json`` or ``+xml`` suffix (e.g. custom serializations of
+records) are compressed too.
+"""
+
+
+def accepts_gzip(value):
+    """Check if an ``Accept-Encoding`` header value accepts gzip."""
+    if not value or ("gzip" not in value and "*" not in value):
+        return False
+    return parse_accept_header(value)["gzip"] > 0
+
+
+class _GzipResponse:
+    """State of a response going through the middleware."""
+
+    __slots__ = (
+        "middleware",
+        "start_response",
+        "accepts",
+        "status",
+        "headers",
+        "exc_info",
+        "compressor",
+        "sent",
+        "_write",
+    )
+
+    def __init__(self, middleware, start_response, accepts):
+        """Initialize the response."""
+        self.middleware = middleware
+        self.start_response = start_response
+        self.accepts = accepts
+        self.status = None
+        self.headers = None
+        self.exc_info = None
+        self.compressor = None
+        self.sent = False
+
+    def start(self, status, headers, exc_info=None):
+        """Store the status and headers until the body size is known."""
+        if self.sent:
+            # Raises the error, the headers cannot be changed anymore.
+            return self.start_response(status, headers, exc_info)
+        self.status = status
+        self.headers = headers
+        self.exc_info = exc_info
+        return self.write
+
+    def write(self, data):
+        """Write body data with the legacy ``write`` callable."""
+        if not self.sent:
+            self.send()
+        if self.compressor is not None:
+            data = self.compressor.compress(data) + self.compressor.flush(
+                zlib.Z_SYNC_FLUSH
+            )
+        self._write(data)
+
+    def prepare(self, size=None):
+        """Decide if the body is compressed and prepare the headers.
+
+        :param size: Size of the body if known.
+        :returns: The :class:`~werkzeug.datastructures.Headers` to send.
+        """
+        headers = Headers(self.headers)
+        self.compressor = None
+        if self.middleware.should_compress(self.status, headers, size):
+            vary = headers.get("Vary")
+            if not vary:
+                headers["Vary"] = "Accept-Encoding"
+            elif "accept-encoding" not in vary.lower() and vary != "*":
+                headers["Vary"] = f"{vary}, Accept-Encoding"
+            if self.accepts:
+                headers.remove("Content-Length")
+                # Ranges of the compressed body cannot be served.
+                headers.remove("Accept-Ranges")
+                headers["Content-Encoding"] = "gzip"
+                etag = headers.get("ETag")
+                if etag and not etag.startswith("W/"):
+                    # The compressed body is not the same representation.
+                    headers["ETag"] = f"W/{etag}"
+                self.compressor = zlib.compressobj(
+                    self.middleware.level, zlib.DEFLATED, zlib.MAX_WBITS | 16
+                )
+        return headers
+
+    def send(self, headers=None):
+        """Send the headers."""
+        if headers is None:
+            headers = self.prepare()
+        self.sent = True
+        self._write = self.start_response(
+            self.status, headers.to_wsgi_list(), self.exc_info
+        )
+
+    def finish(self, app_iter):
+        """Get the response iterable returned to the server."""
+        if not self.sent and self.status is not None:
+            if isinstance(app_iter, (list, tuple)):
+                # The whole body is known, compress it at once.
+                headers = self.prepare(sum(len(chunk) for chunk in app_iter))
+                if self.compressor is not None:
+                    body = self.compressor.compress(b"".join(app_iter))
+                    body += self.compressor.flush()
+                    headers["Content-Length"] = str(len(body))
+                    app_iter = [body]
+                self.send(headers)
+                return app_iter
+            self.send()
+        if self.sent and self.compressor is None:
+            return app_iter
+        return _GzipIterable(self, app_iter)
+
+
+class _GzipIterable:
+    """Response iterable compressing the chunks of the wrapped iterable."""
+
+    __slots__ = ("response", "iterable")
+
+    def __init__(self, response, iterable):
+        """Initialize the iterable."""
+        self.response = response
+        self.iterable = iterable
+
+    def __iter__(self):
+        """Compress the chunks as they are produced."""
+        response = self.response
+        for chunk in self.iterable:
+            if not response.sent:
+                # ``start_response`` is called when iterating the body.
+                response.send()
+            compressor = response.compressor
+            if compressor is None:
+                yield chunk
+            else:
+                data = compressor.compress(chunk)
+                if data:
+                    yield data
+        if not response.sent:
+            response.send()
+        if response.compressor is not None:
+            yield response.compressor.flush()
+
+    def close(self):
+        """Close the wrapped iterable."""
+        if hasattr(self.iterable, "close"):
+            self.iterable.close()
+
+
+class GzipMiddleware:
+    """Compress responses with gzip.
+
+    Responses are compressed if the client accepts the gzip encoding, their
+    content type is one of ``mimetypes``, they are not already encoded, and
+    their size is at least ``min_size`` bytes. Responses of unknown size
+    (i.e. streamed without ``Content-Length``) are compressed incrementally,
+    chunk by chunk, without buffering the whole body.
+
+    Compressible responses get the ``Vary: Accept-Encoding`` header whether
+    they are compressed or not, and the ``ETag`` of compressed responses is
+    made weak.
+
+    :param app: The WSGI application.
+    :param level: Compression level, from ``1`` (fastest) to ``9`` (smallest).
+    :param min_size: Minimum size of the compressed responses in bytes.
+    :param mimetypes: Compressed content types (by default
+        :data:`DEFAULT_MIMETYPES`).
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(self, app, level=6, min_size=500, mimetypes=None):
+        """Initialize the middleware."""
+        self.app = app
+        self.level = level
+        self.min_size = min_size
+        self.mimetypes = frozenset(
+            DEFAULT_MIMETYPES if mimetypes is None else mimetypes
+        )
+
+    def should_compress(self, status, headers, size=None):
+        """Check if a response can be compressed.
+
+        :param status: The status line.
+        :param headers: The :class:`~werkzeug.datastructures.Headers`.
+        :param size: Size of the body if known (by default the
+            ``Content-Length`` header is used).
+        """
+        if status[:1] == "1" or status[:3] in ("204", "206", "304"):
+            return False
+        if "Content-Encoding" in headers:
+            return False
+        if "no-transform" in headers.get("Cache-Control", ""):
+            return False
+        mimetype = headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+        if mimetype not in self.mimetypes and not mimetype.endswith(("+json", "+xml")):
+            return False
+        if size is None:
+            length = headers.get("Content-Length")
+            size = int(length) if length and length.isdigit() else None
+        return size is None or size >= self.min_size
+
+    def __call__(self, environ, start_response):
+        """Compress the response if possible."""
+        if environ.get("REQUEST_METHOD") == "HEAD":
+            return self.app(environ, start_response)
+        response = _GzipResponse(
+            self, start_response, accepts_gzip(environ.get("HTTP_ACCEPT_ENCODING"))
+        )
+        return response.finish(self.app(environ, response.start))
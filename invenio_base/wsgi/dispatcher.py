@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Prefix dispatching of WSGI applications."""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+MOUNT_ENVIRON_KEY = "invenio_base.mount"
+"""Environ key where the dispatcher stores the matched mount point."""
+
+
+class LazyMount:
+    """WSGI application built on its first request.
+
+    The application factory is called at most once, even if several threads
+    receive the first requests at the same time. If the factory fails, the
+    error is propagated to the request and the build is retried on the next
+    one.
+
+    :param factory: Application factory.
+    :param kwargs: Keyword arguments passed to the factory.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(self, factory, **kwargs):
+        """Initialize the lazy mount."""
+        self.factory = factory
+        self.kwargs = kwargs
+        self.app = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self):
+        """Whether the application has been built."""
+        return self.app is not None
+
+    def build(self):
+        """Build the application unless it was already built.
+
+        :returns: The WSGI application.
+        """
+        app = self.app
+        if app is None:
+            with self._lock:
+                if self.app is None:
+                    self.app = self.factory(**self.kwargs)
+                app = self.app
+        return app
+
+    def __call__(self, environ, start_response):
+        """Build the application if needed and pass the request to it."""
+        return (self.app or self.build())(environ, start_response)
+
+
+class _Node:
+    """Node of the mount prefix trie.
+
+    Each node corresponds to one ``/``-separated segment of a mount point.
+    """
+
+    __slots__ = ("children", "app", "mount")
+
+    def __init__(self):
+        """Initialize an empty node."""
+        self.children = {}
+        self.app = None
+        self.mount = None
+
+
+class PrefixDispatcherMiddleware:
+    """Dispatch requests to applications mounted on path prefixes.
+
+    Drop-in replacement for Werkzeug's ``DispatcherMiddleware`` with the same
+    matching semantics: the longest mount point ``prefix`` for which
+    ``PATH_INFO`` is either equal to ``prefix`` or starts with ``prefix + '/'``
+    wins, its value is appended to ``SCRIPT_NAME`` and removed from
+    ``PATH_INFO``. Requests not matching any mount point are passed to the
+    default application.
+
+    Instead of repeatedly splitting ``PATH_INFO`` from the right, the mount
+    points are compiled into a trie of path segments, which is walked once
+    from the left. The lookup thus stops as soon as no mount point can match
+    anymore, independently of the depth of the requested path.
+
+    .. code-block:: python
+
+       app.wsgi_app = PrefixDispatcherMiddleware(
+           app.wsgi_app, {'/api': api_app}
+       )
+
+    Mounted applications can be wrapped in :class:`LazyMount` to build them
+    on the first request under their prefix. With ``background_build``, the
+    first request handled by the dispatcher (i.e. once the worker is ready to
+    serve) additionally starts a daemon thread building all lazy mounts.
+
+    The matched mount point (``''`` for the default application) is stored
+    in ``environ['invenio_base.mount']`` for the outer middlewares.
+
+    :param app: The default WSGI application.
+    :param mounts: Dictionary of WSGI applications per mount point.
+    :param background_build: Build the lazy mounts in a background thread
+        after the first request.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(self, app, mounts=None, background_build=False):
+        """Initialize the middleware."""
+        self.app = app
+        self.mounts = dict(mounts or {})
+        self._root = self._compile(self.mounts)
+        self.background_build = background_build
+        self._background_pending = background_build and any(
+            isinstance(m, LazyMount) for m in self.mounts.values()
+        )
+        self._background_lock = threading.Lock()
+        self._background_thread = None
+
+    @property
+    def built(self):
+        """Dictionary telling per mount point whether its app has been built."""
+        return {
+            mount: app.built if isinstance(app, LazyMount) else True
+            for mount, app in self.mounts.items()
+        }
+
+    def build_lazy_mounts(self):
+        """Build all lazy mounts which have not been built yet."""
+        for mount, app in self.mounts.items():
+            if isinstance(app, LazyMount) and not app.built:
+                try:
+                    app.build()
+                except Exception:
+                    # The build is retried on the next request to the mount.
+                    logger.exception(f"Failed to build mounted app: {mount}")
+
+    def start_background_build(self):
+        """Start building the lazy mounts in a daemon thread.
+
+        :returns: The started thread, or ``None`` if it was already started.
+        """
+        with self._background_lock:
+            if self._background_thread is not None:
+                return None
+            self._background_pending = False
+            self._background_thread = threading.Thread(
+                target=self.build_lazy_mounts,
+                name="invenio-wsgi-lazy-mounts",
+                daemon=True,
+            )
+            self._background_thread.start()
+            return self._background_thread
+
+    @staticmethod
+    def _compile(mounts):
+        """Build the segment trie for the given mount points."""
+        root = _Node()
+        for mount, app in mounts.items():
+            node = root
+            for segment in mount.split("/"):
+                node = node.children.setdefault(segment, _Node())
+            node.app = app
+            node.mount = mount
+        return root
+
+    def match(self, path):
+        """Find the application responsible for a path.
+
+        :param path: The value of ``PATH_INFO``.
+        :returns: Tuple ``(node, end)`` where ``node`` is the matching trie
+            node (or ``None`` for the default application) and ``end`` is the
+            length of the script name part of ``path``.
+        """
+        node = self._root
+        match = None
+        match_end = 0
+        length = len(path)
+        start = 0
+        while True:
+            end = path.find("/", start)
+            if end == -1:
+                end = length
+            node = node.children.get(path[start:end])
+            if node is None:
+                break
+            if node.mount is not None:
+                match, match_end = node, end
+            if end == length:
+                break
+            start = end + 1
+
+        if match is None:
+            # Same as Werkzeug: unmatched requests keep everything before the
+            # first slash (usually nothing) as script name.
+            match_end = path.find("/")
+            if match_end == -1:
+                match_end = length
+        return match, match_end
+
+    def __call__(self, environ, start_response):
+        """Dispatch the request to the matching application."""
+        if self._background_pending:
+            self.start_background_build()
+        path = environ.get("PATH_INFO", "")
+        node, end = self.match(path)
+        if node is None:
+            app = self.app
+            environ[MOUNT_ENVIRON_KEY] = ""
+        else:
+            app = node.app
+            environ[MOUNT_ENVIRON_KEY] = node.mount
+        environ["SCRIPT_NAME"] = environ.get("SCRIPT_NAME", "") + path[:end]
+        environ["PATH_INFO"] = path[end:]
+        return app(environ, start_response)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Liveness and readiness probes answered before entering Flask."""
+
+import json
+import logging
+import threading
+from time import monotonic
+
+logger = logging.getLogger(__name__)
+
+_HEADERS = [
+    ("Content-Type", "application/json"),
+    ("Cache-Control", "no-store"),
+]
+
+
+class HealthCheckMiddleware:
+    """Answer liveness and readiness probes at the WSGI layer.
+
+    Requests to ``liveness_path`` are answered with ``200 OK`` as long as
+    the process can serve requests. Requests to ``readiness_path`` run the
+    readiness ``checks`` and are answered with ``200 OK`` if all of them
+    pass, or ``503 Service Unavailable`` otherwise. None of them enter the
+    wrapped application.
+
+    A check is a callable without arguments, which fails by raising an
+    exception or returning ``False``. The results are cached for ``ttl``
+    seconds, so that frequent probes do not run the checks on each request.
+    While one thread refreshes expired results, concurrent probes are
+    answered with the previous results.
+
+    :param app: The WSGI application.
+    :param checks: Dictionary of readiness checks per name.
+    :param liveness_path: Path of the liveness probe (``None`` to disable it).
+    :param readiness_path: Path of the readiness probe (``None`` to disable
+        it).
+    :param ttl: Duration in seconds during which results are cached.
+    :param gate: Callable returning whether the application is ready to run
+        the checks (e.g. once warmed up). It is called on each readiness probe
+        and must be cheap.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(
+        self,
+        app,
+        checks=None,
+        liveness_path="/ping",
+        readiness_path="/ready",
+        ttl=5,
+        gate=None,
+    ):
+        """Initialize the middleware."""
+        self.app = app
+        self.checks = dict(checks or {})
+        self.liveness_path = liveness_path
+        self.readiness_path = readiness_path
+        self.ttl = ttl
+        self.gate = gate
+        self._results = None
+        self._expires = 0
+        self._lock = threading.Lock()
+
+    def run_checks(self):
+        """Run the readiness checks.
+
+        :returns: Dictionary of results (``"ok"`` or ``"failed"``) per check.
+        """
+        results = {}
+        for name, check in self.checks.items():
+            try:
+                ok = check() is not False
+            except Exception:
+                logger.exception(f"Readiness check {name} failed.")
+                ok = False
+            results[name] = "ok" if ok else "failed"
+        return results
+
+    def readiness(self):
+        """Get the (cached) results of the readiness checks."""
+        results = self._results
+        if results is not None and monotonic() < self._expires:
+            return results
+        # Only one thread refreshes the results, the others use the
+        # previous ones if any.
+        if not self._lock.acquire(blocking=results is None):
+            return results
+        try:
+            if self._results is None or monotonic() >= self._expires:
+                self._results = self.run_checks()
+                self._expires = monotonic() + self.ttl
+            return self._results
+        finally:
+            self._lock.release()
+
+    def __call__(self, environ, start_response):
+        """Answer the probes, and pass the other requests to the application."""
+        path = environ.get("PATH_INFO")
+        if path == self.liveness_path:
+            status, body = "200 OK", {"status": "ok"}
+        elif path == self.readiness_path:
+            if self.gate is not None and not self.gate():
+                status, body = "503 Service Unavailable", {"status": "starting"}
+            else:
+                status, body = self._ready()
+        else:
+            return self.app(environ, start_response)
+
+        data = json.dumps(body).encode("utf-8")
+        start_response(status, _HEADERS + [("Content-Length", str(len(data)))])
+        if environ.get("REQUEST_METHOD") == "HEAD":
+            return []
+        return [data]
+
+    def _ready(self):
+        """Get the status and body of the readiness probe."""
+        checks = self.readiness()
+        if all(result == "ok" for result in checks.values()):
+            return "200 OK", {"status": "ok", "checks": checks}
+        return "503 Service Unavailable", {"status": "failed", "checks": checks}
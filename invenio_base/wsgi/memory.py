@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Worker memory watchdog."""
+
+import itertools
+import logging
+import os
+import signal
+from collections import defaultdict
+
+from flask import request_started
+
+from ..utils import get_rss
+from .metrics import ENDPOINT_ENVIRON_KEY, _call_on_close, store_endpoint
+
+logger = logging.getLogger(__name__)
+
+
+def send_signal(signum=signal.SIGTERM):
+    """Create a recycle function sending a signal to the current process.
+
+    ``SIGTERM`` makes Gunicorn workers exit gracefully once their current
+    requests are done.
+    """
+
+    def recycle():
+        os.kill(os.getpid(), signum)
+
+    return recycle
+
+
+class MemoryWatchdogMiddleware:
+    """Track the memory of the worker and recycle it over a limit.
+
+    One of every ``every`` requests, the resident set size (RSS) of the
+    process is read from ``/proc/self/statm`` before and after the request,
+    and the growth is accounted to the endpoint of the request. Once the RSS
+    exceeds ``limit``, the endpoints which caused the largest growth are
+    logged and ``recycle`` is called once the response has been sent. By
+    default it sends ``SIGTERM`` to the process, which makes Gunicorn replace
+    the worker gracefully.
+
+    :param app: The WSGI application.
+    :param limit: Maximum RSS in bytes.
+    :param every: Sample the RSS every N requests.
+    :param recycle: Function called to recycle the worker.
+    :param top: Number of endpoints logged when recycling.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(self, app, limit, every=100, recycle=None, top=10):
+        """Initialize the middleware."""
+        self.app = app
+        self.limit = limit
+        self.every = every
+        self.recycle = recycle or send_signal()
+        self.top = top
+        self.growth = defaultdict(lambda: [0, 0])
+        self.recycling = False
+        self._counter = itertools.count(1)
+        # Connecting the same receiver twice is a no-op.
+        request_started.connect(store_endpoint, weak=False)
+
+    def report(self):
+        """Get the endpoints which caused the largest memory growth.
+
+        :returns: List of ``(endpoint, growth in bytes, sampled requests)``.
+        """
+        return sorted(
+            (
+                (endpoint, size, count)
+                for endpoint, (size, count) in self.growth.items()
+            ),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+    def _sampled(self, rss_before, environ):
+        """Account the growth of a sampled request and check the limit."""
+        rss = get_rss()
+        entry = self.growth[environ.get(ENDPOINT_ENVIRON_KEY) or ""]
+        entry[0] += rss - rss_before
+        entry[1] += 1
+        if rss > self.limit and not self.recycling:
+            self.recycling = True
+            top = "\n".join(
+                f"  {endpoint or '<none>'}: {size / 2**20:+.1f} MiB "
+                f"({count} requests)"
+                for endpoint, size, count in self.report()[: self.top]
+            )
+            logger.warning(
+                f"Worker {os.getpid()} uses {rss / 2**20:.1f} MiB, over the "
+                f"limit of {self.limit / 2**20:.1f} MiB, recycling it. "
+                f"Largest growth per endpoint:\n{top}"
+            )
+            self.recycle()
+
+    def __call__(self, environ, start_response):
+        """Sample the memory growth of the request if needed."""
+        if next(self._counter) % self.every:
+            return self.app(environ, start_response)
+
+        rss_before = get_rss()
+        if not rss_before:
+            # Not supported on this platform.
+            return self.app(environ, start_response)
+        return _call_on_close(
+            self.app(environ, start_response),
+            environ,
+            lambda: self._sampled(rss_before, environ),
+        )
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Request latency metrics with Prometheus text exposition."""
+
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+from flask import request, request_started
+
+from .dispatcher import MOUNT_ENVIRON_KEY
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+"""Default histogram buckets in seconds."""
+
+ENDPOINT_ENVIRON_KEY = "invenio_base.endpoint"
+"""Environ key where the endpoint of the request is stored."""
+
+LABELS = ("mount", "endpoint", "status")
+"""Labels of the request duration histogram."""
+
+METRIC_NAME = "invenio_http_request_duration_seconds"
+"""Name of the request duration histogram."""
+
+
+def store_endpoint(sender, **kwargs):
+    """Store the endpoint of the current request in the WSGI environ.
+
+    Connected to Flask's ``request_started`` signal, so that the middleware
+    can label the requests of all applications with their endpoint.
+    """
+    request.environ[ENDPOINT_ENVIRON_KEY] = request.endpoint
+
+
+class MetricsRegistry:
+    """Histograms of observed values.
+
+    Each thread accumulates its observations in its own storage, so that
+    recording a value does not need any lock. The storages are merged when
+    the metrics are collected, and the ones of finished threads are merged
+    into a total, so that short-lived threads do not accumulate storages.
+
+    :param buckets: Upper bounds of the histogram buckets.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Initialize the registry."""
+        self.buckets = tuple(sorted(buckets))
+        self._local = threading.local()
+        self._stores = []
+        self._total = {}
+        self._lock = threading.Lock()
+
+    def _new_store(self):
+        """Create the storage of the current thread."""
+        store = self._local.store = {}
+        with self._lock:
+            self._fold_finished()
+            self._stores.append((threading.current_thread(), store))
+        return store
+
+    def _fold_finished(self):
+        """Merge the storages of finished threads into the total.
+
+        Must be called with the lock held.
+        """
+        stores = []
+        for thread, store in self._stores:
+            if thread.is_alive():
+                stores.append((thread, store))
+            else:
+                _merge_histograms(self._total, store)
+        self._stores = stores
+
+    def observe(self, labels, value):
+        """Record a value.
+
+        :param labels: Tuple of label values.
+        :param value: Observed value.
+        """
+        try:
+            store = self._local.store
+        except AttributeError:
+            store = self._new_store()
+        hist = store.get(labels)
+        if hist is None:
+            # One counter per bucket, one for +Inf, and the sum.
+            hist = store[labels] = [0] * (len(self.buckets) + 2)
+        hist[bisect_left(self.buckets, value)] += 1
+        hist[-1] += value
+
+    def collect(self):
+        """Merge the histograms of all threads.
+
+        :returns: Dictionary of histograms per labels. A histogram is a list
+            of the (non cumulative) bucket counts, followed by the sum of the
+            observed values.
+        """
+        with self._lock:
+            self._fold_finished()
+            merged = {labels: list(hist) for labels, hist in self._total.items()}
+            stores = [store for thread, store in self._stores]
+        for store in stores:
+            _merge_histograms(merged, store)
+        return merged
+
+
+def _merge_histograms(merged, store):
+    """Add the histograms of a storage to merged histograms."""
+    for labels, hist in list(store.items()):
+        total = merged.get(labels)
+        if total is None:
+            merged[labels] = list(hist)
+        else:
+            for i, value in enumerate(hist):
+                total[i] += value
+
+
+def _escape(value):
+    """Escape a label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_float(value):
+    """Format a float as expected by Prometheus."""
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+def render_histograms(name, label_names, buckets, histograms, help_text=""):
+    """Render histograms in the Prometheus text exposition format.
+
+    :param name: Metric name.
+    :param label_names: Names of the labels.
+    :param buckets: Upper bounds of the buckets.
+    :param histograms: Dictionary of histograms per labels, as returned by
+        :meth:`MetricsRegistry.collect`.
+    :param help_text: Description of the metric.
+    :returns: The exposition text.
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    bounds = [_format_float(b) for b in buckets] + ["+Inf"]
+    for labels, hist in sorted(histograms.items()):
+        label_str = ",".join(
+            f'{key}="{_escape(value)}"' for key, value in zip(label_names, labels)
+        )
+        prefix = f"{label_str}," if label_str else ""
+        cumulative = 0
+        for bound, count in zip(bounds, hist):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{label_str}}} {_format_float(hist[-1])}")
+        lines.append(f"{name}_count{{{label_str}}} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+class _ClosingIterable:
+    """Response iterable calling a callback when closed."""
+
+    __slots__ = ("iterable", "callback")
+
+    def __init__(self, iterable, callback):
+        """Initialize the iterable."""
+        self.iterable = iterable
+        self.callback = callback
+
+    def __iter__(self):
+        """Iterate over the wrapped iterable."""
+        return iter(self.iterable)
+
+    def close(self):
+        """Close the wrapped iterable and call the callback."""
+        try:
+            if hasattr(self.iterable, "close"):
+                self.iterable.close()
+        finally:
+            self.callback()
+
+
+def _is_file_wrapper(app_iter, environ):
+    """Check if a response iterable is a ``wsgi.file_wrapper`` object."""
+    file_wrapper = environ.get("wsgi.file_wrapper")
+    return isinstance(file_wrapper, type) and isinstance(app_iter, file_wrapper)
+
+
+def _call_on_close(app_iter, environ, callback):
+    """Call a callback once a response iterable is closed.
+
+    Objects of the server's ``wsgi.file_wrapper`` are returned as is, so that
+    the server can still send them with e.g. ``sendfile``, and the callback is
+    called right away.
+    """
+    if isinstance(app_iter, (list, tuple)) or _is_file_wrapper(app_iter, environ):
+        callback()
+        return app_iter
+    return _ClosingIterable(app_iter, callback)
+
+
+class MetricsMiddleware:
+    """Record request latency histograms and expose them to Prometheus.
+
+    Requests are labelled with the mount point of the
+    :class:`~invenio_base.wsgi.dispatcher.PrefixDispatcherMiddleware`, the
+    Flask endpoint and the status class (e.g. ``2xx``). The duration covers
+    the full response, including streamed bodies.
+
+    Requests to ``path`` are answered directly by the middleware with the
+    metrics in the Prometheus text exposition format, without entering
+    Flask. The path should not be reachable from outside of your network.
+
+    :param app: The WSGI application.
+    :param registry: The :class:`MetricsRegistry` (by default a new one).
+    :param path: Path of the exposition endpoint (``None`` to disable it).
+
+    .. versionadded:: 2.5.0
+    """
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, app, registry=None, path="/metrics"):
+        """Initialize the middleware."""
+        self.app = app
+        self.registry = registry or MetricsRegistry()
+        self.path = path
+        # Connecting the same receiver twice is a no-op.
+        request_started.connect(store_endpoint, weak=False)
+
+    def render(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        return render_histograms(
+            METRIC_NAME,
+            LABELS,
+            self.registry.buckets,
+            self.registry.collect(),
+            help_text="HTTP request latency in seconds.",
+        )
+
+    def __call__(self, environ, start_response):
+        """Record the latency of the request."""
+        if self.path is not None and environ.get("PATH_INFO") == self.path:
+            body = self.render().encode("utf-8")
+            start_response(
+                "200 OK",
+                [
+                    ("Content-Type", self.content_type),
+                    ("Content-Length", str(len(body))),
+                ],
+            )
+            return [body]
+
+        start = perf_counter()
+        status = ["5"]
+
+        def _start_response(status_line, headers, exc_info=None):
+            status[0] = status_line[:1]
+            return start_response(status_line, headers, exc_info)
+
+        def record():
+            self.registry.observe(
+                (
+                    environ.get(MOUNT_ENVIRON_KEY, ""),
+                    environ.get(ENDPOINT_ENVIRON_KEY) or "",
+                    f"{status[0]}xx",
+                ),
+                perf_counter() - start,
+            )
+
+        try:
+            app_iter = self.app(environ, _start_response)
+        except BaseException:
+            record()
+            raise
+        return _call_on_close(app_iter, environ, record)
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Metrics shared between worker processes through memory-mapped files."""
+
+import fcntl
+import itertools
+import json
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from .metrics import DEFAULT_BUCKETS, MetricsRegistry
+
+_HEADER = struct.Struct("Q")
+_ENTRY = struct.Struct("II")
+_VALUE = struct.Struct("d")
+_INITIAL_SIZE = 1 << 16
+
+FILE_PREFIX = "metrics_"
+ARCHIVE_NAME = "archive.db"
+
+_registry_ids = itertools.count()
+
+
+def _padded(length):
+    """Round a length up to a multiple of 8 bytes."""
+    return (length + 7) & ~7
+
+
+def _iter_entries(mm):
+    """Iterate over the entries of a mapped metrics file.
+
+    :returns: Iterator of ``(key, offset, length)``, where ``offset`` is the
+        position of the first value and ``length`` the number of values.
+    """
+    used = _HEADER.unpack_from(mm, 0)[0]
+    pos = _HEADER.size
+    while pos < used:
+        key_length, length = _ENTRY.unpack_from(mm, pos)
+        start = pos + _ENTRY.size
+        offset = start + _padded(key_length)
+        yield mm[start : start + key_length].decode("utf-8"), offset, length
+        pos = offset + _VALUE.size * length
+
+
+def read_file(path):
+    """Read a metrics file.
+
+    :param path: Path of the file.
+    :returns: Dictionary of list of values per key.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            return {}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return {
+                key: list(struct.unpack_from(f"{length}d", mm, offset))
+                for key, offset, length in _iter_entries(mm)
+            }
+
+
+class MmapFile:
+    """Append-only file of named arrays of floats, mapped in memory.
+
+    The file starts with the number of used bytes, followed by the entries.
+    An entry is made of the length of its key, its number of values, the
+    UTF-8 encoded key padded to 8 bytes and the values as doubles.
+
+    :param path: Path of the file, created if it does not exist.
+    """
+
+    def __init__(self, path):
+        """Open and map the file."""
+        self.path = path
+        self._file = open(path, "a+b")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _INITIAL_SIZE:
+            self._file.truncate(_INITIAL_SIZE)
+            size = _INITIAL_SIZE
+        self._mm = mmap.mmap(self._file.fileno(), size)
+        self._used = _HEADER.unpack_from(self._mm, 0)[0] or _HEADER.size
+        self._lock = threading.Lock()
+
+    def offsets(self):
+        """Get the offset of the values per key."""
+        return {key: offset for key, offset, length in _iter_entries(self._mm)}
+
+    def allocate(self, key, length):
+        """Append a new entry with its values set to zero.
+
+        :param key: Key of the entry.
+        :param length: Number of values.
+        :returns: Offset of the first value.
+        """
+        data = key.encode("utf-8")
+        size = _ENTRY.size + _padded(len(data)) + _VALUE.size * length
+        with self._lock:
+            pos = self._used
+            if pos + size > len(self._mm):
+                new_size = len(self._mm)
+                while pos + size > new_size:
+                    new_size *= 2
+                self._file.truncate(new_size)
+                # The previous map is not closed, since other threads may
+                # still be writing to it. Both map the same file.
+                self._mm = mmap.mmap(self._file.fileno(), new_size)
+            mm = self._mm
+            _ENTRY.pack_into(mm, pos, len(data), length)
+            mm[pos + _ENTRY.size : pos + _ENTRY.size + len(data)] = data
+            self._used = pos + size
+            # Publish the entry once fully written.
+            _HEADER.pack_into(mm, 0, self._used)
+        return pos + _ENTRY.size + _padded(len(data))
+
+    def add(self, offset, value):
+        """Add to the value at an offset."""
+        mm = self._mm
+        _VALUE.pack_into(mm, offset, _VALUE.unpack_from(mm, offset)[0] + value)
+
+    def close(self):
+        """Unmap and close the file."""
+        self._mm.close()
+        self._file.close()
+
+
+def _pid_alive(pid):
+    """Check if a process exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # pragma: no cover
+        return True
+    return True
+
+
+class MmapMetricsRegistry(MetricsRegistry):
+    """Histograms shared by the worker processes of a node.
+
+    Each worker process records its observations in its own memory-mapped
+    file in ``directory``, and collecting the metrics merges the files of all
+    workers. Within a process, each thread updates its own entries, so that
+    recording a value does not need any lock.
+
+    When collecting, the files of dead processes are merged into an archive
+    file and removed, so that the counters of recycled workers are kept
+    without accumulating files. Remove the directory when (re)starting the
+    server to reset the counters.
+
+    The registry can be created before forking (e.g. in a preloading master
+    process), each worker opens its own file on its first observation.
+
+    :param directory: Directory of the metrics files, created if needed.
+    :param buckets: Upper bounds of the histogram buckets.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(self, directory, buckets=DEFAULT_BUCKETS):
+        """Initialize the registry."""
+        super().__init__(buckets=buckets)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        # Registries sharing the directory (e.g. of the UI and API
+        # applications) write to their own files.
+        self._id = next(_registry_ids)
+        self._file = None
+        self._slots = itertools.count()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        """Forget the file and the entries of the parent process."""
+        self._file = None
+        self._local = threading.local()
+        self._slots = itertools.count()
+        self._stores = []
+        self._lock = threading.Lock()
+
+    def _open(self):
+        """Open the file of the current process."""
+        with self._lock:
+            if self._file is None:
+                path = os.path.join(
+                    self.directory, f"{FILE_PREFIX}{os.getpid()}_{self._id}.db"
+                )
+                if os.path.exists(path):
+                    # Left by a previous process with the same identifier
+                    # (e.g. in a restarted container): archive its counters
+                    # instead of mixing them with the new ones.
+                    with self._archive_lock():
+                        if os.path.exists(path):
+                            self._archive_files([path])
+                self._file = MmapFile(path)
+            return self._file
+
+    def _new_store(self):
+        """Create the storage of the current thread.
+
+        The slot and the entries of a finished thread are reused, so that
+        short-lived threads do not add entries to the file.
+        """
+        thread = threading.current_thread()
+        with self._lock:
+            for i, (other, slot, store) in enumerate(self._stores):
+                if not other.is_alive():
+                    self._stores[i] = (thread, slot, store)
+                    break
+            else:
+                slot, store = next(self._slots), {}
+                self._stores.append((thread, slot, store))
+        self._local.slot = slot
+        self._local.store = store
+        return store
+
+    def observe(self, labels, value):
+        """Record a value.
+
+        :param labels: Tuple of label values.
+        :param value: Observed value.
+        """
+        try:
+            store = self._local.store
+        except AttributeError:
+            store = self._new_store()
+        mmap_file = self._file or self._open()
+        offset = store.get(labels)
+        if offset is None:
+            offset = store[labels] = mmap_file.allocate(
+                json.dumps([*labels, self._local.slot]), len(self.buckets) + 2
+            )
+        mmap_file.add(offset + _VALUE.size * bisect_left(self.buckets, value), 1)
+        mmap_file.add(offset + _VALUE.size * (len(self.buckets) + 1), value)
+
+    def _worker_files(self):
+        """Get the metrics files of the processes.
+
+        :returns: List of ``(pid, path)`` tuples.
+        """
+        files = []
+        for name in os.listdir(self.directory):
+            if name.startswith(FILE_PREFIX) and name.endswith(".db"):
+                try:
+                    pid = int(name[len(FILE_PREFIX) : -3].split("_", 1)[0])
+                except ValueError:
+                    continue
+                files.append((pid, os.path.join(self.directory, name)))
+        return files
+
+    @contextmanager
+    def _archive_lock(self):
+        """Lock the archive between processes."""
+        with open(os.path.join(self.directory, "archive.lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _archive_dead_workers(self):
+        """Merge the files of dead processes into the archive and remove them.
+
+        Must be called with the archive lock held.
+        """
+        dead = [
+            path
+            for pid, path in self._worker_files()
+            if pid != os.getpid() and not _pid_alive(pid)
+        ]
+        if dead:
+            self._archive_files(dead)
+
+    def _archive_files(self, paths):
+        """Merge metrics files into the archive and remove them.
+
+        Must be called with the archive lock held.
+        """
+        archive = MmapFile(os.path.join(self.directory, ARCHIVE_NAME))
+        try:
+            offsets = archive.offsets()
+            for path in paths:
+                for key, values in read_file(path).items():
+                    key = json.dumps([*json.loads(key)[:-1], 0])
+                    offset = offsets.get(key)
+                    if offset is None:
+                        offset = offsets[key] = archive.allocate(key, len(values))
+                    for i, value in enumerate(values):
+                        archive.add(offset + _VALUE.size * i, value)
+                os.remove(path)
+        finally:
+            archive.close()
+
+    def collect(self):
+        """Merge the histograms of all processes.
+
+        :returns: Dictionary of histograms per labels, see
+            :meth:`~invenio_base.wsgi.metrics.MetricsRegistry.collect`.
+        """
+        length = len(self.buckets) + 2
+        merged = {}
+        # Several workers may be collecting at the same time, the lock
+        # ensures that a file is not both read and archived.
+        with self._archive_lock():
+            self._archive_dead_workers()
+
+            paths = [path for pid, path in self._worker_files()]
+            archive = os.path.join(self.directory, ARCHIVE_NAME)
+            if os.path.exists(archive):
+                paths.append(archive)
+
+            for path in paths:
+                for key, values in read_file(path).items():
+                    # Skip values recorded with other buckets.
+                    if len(values) != length:
+                        continue
+                    labels = tuple(json.loads(key)[:-1])
+                    total = merged.get(labels)
+                    if total is None:
+                        merged[labels] = values
+                    else:
+                        for i, value in enumerate(values):
+                            total[i] += value
+
+        return {
+            labels: [int(count) for count in hist[:-1]] + [hist[-1]]
+            for labels, hist in merged.items()
+        }
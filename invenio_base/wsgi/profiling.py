@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Sampled profiling of requests."""
+
+import cProfile
+import hmac
+import itertools
+import json
+import logging
+import os
+import time
+from time import perf_counter
+
+from flask import request_started
+
+from .metrics import ENDPOINT_ENVIRON_KEY, store_endpoint
+
+logger = logging.getLogger(__name__)
+
+
+def _header_key(name):
+    """Get the WSGI environ key of a HTTP header."""
+    return "HTTP_" + name.upper().replace("-", "_")
+
+
+class ProfilerMiddleware:
+    """Profile sampled requests with ``cProfile``.
+
+    A request is profiled if it is one of every ``sample_rate`` requests of
+    the process, if its path starts with one of ``paths``, or if it has the
+    ``trigger_header`` header (with the value ``trigger_token`` if set).
+    The other requests do not pay any profiling cost.
+
+    Each profile is written to ``directory`` as a ``.pstats`` file, which can
+    be loaded with :mod:`pstats` or tools like ``snakeviz``, along with a
+    ``.json`` file containing the request method, path, endpoint, status,
+    duration and the process identifier. Only the last ``max_files``
+    profiles are kept.
+
+    Only the call of the application is profiled, the iteration over
+    streamed response bodies is not.
+
+    :param app: The WSGI application.
+    :param directory: Directory of the profiles, created if needed.
+    :param sample_rate: Profile one of every ``sample_rate`` requests
+        (``0`` disables sampling).
+    :param paths: Path prefixes of requests which are always profiled.
+    :param trigger_header: Name of a HTTP header triggering the profiling.
+    :param trigger_token: Value the trigger header must have.
+    :param max_files: Maximum number of profiles kept in the directory.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(
+        self,
+        app,
+        directory,
+        sample_rate=0,
+        paths=None,
+        trigger_header=None,
+        trigger_token=None,
+        max_files=100,
+    ):
+        """Initialize the middleware."""
+        self.app = app
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.paths = tuple(paths or ())
+        self.trigger_key = _header_key(trigger_header) if trigger_header else None
+        self.trigger_token = trigger_token
+        self.max_files = max_files
+        self._counter = itertools.count(1)
+        os.makedirs(directory, exist_ok=True)
+        # Connecting the same receiver twice is a no-op.
+        request_started.connect(store_endpoint, weak=False)
+
+    def should_profile(self, environ):
+        """Check if a request must be profiled."""
+        if self.sample_rate and next(self._counter) % self.sample_rate == 0:
+            return True
+        if self.paths and environ.get("PATH_INFO", "").startswith(self.paths):
+            return True
+        if self.trigger_key:
+            value = environ.get(self.trigger_key)
+            if value is not None:
+                return self.trigger_token is None or hmac.compare_digest(
+                    value.encode("latin-1"), self.trigger_token.encode("latin-1")
+                )
+        return False
+
+    def __call__(self, environ, start_response):
+        """Profile the request if sampled."""
+        if not self.should_profile(environ):
+            return self.app(environ, start_response)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is active (e.g. in a concurrent request).
+            return self.app(environ, start_response)
+
+        status = []
+
+        def _start_response(status_line, headers, exc_info=None):
+            status.append(status_line)
+            return start_response(status_line, headers, exc_info)
+
+        start = perf_counter()
+        try:
+            return self.app(environ, _start_response)
+        finally:
+            profiler.disable()
+            duration = perf_counter() - start
+            try:
+                self.save(profiler, environ, status[-1] if status else None, duration)
+            except Exception:
+                logger.exception("Failed to save request profile.")
+
+    def save(self, profiler, environ, status, duration):
+        """Write a profile and its metadata, and rotate the directory.
+
+        :returns: Path of the ``.pstats`` file.
+        """
+        pid = os.getpid()
+        now = time.time()
+        name = f"{now:.6f}-{pid}"
+        path = os.path.join(self.directory, f"{name}.pstats")
+        profiler.dump_stats(path)
+        metadata = {
+            "method": environ.get("REQUEST_METHOD"),
+            "path": environ.get("SCRIPT_NAME", "") + environ.get("PATH_INFO", ""),
+            "endpoint": environ.get(ENDPOINT_ENVIRON_KEY),
+            "status": status,
+            "duration": duration,
+            "pid": pid,
+            "timestamp": now,
+        }
+        with open(os.path.join(self.directory, f"{name}.json"), "w") as f:
+            json.dump(metadata, f)
+        self.rotate()
+        return path
+
+    def rotate(self):
+        """Remove the oldest profiles over ``max_files``."""
+        names = sorted(
+            name[: -len(".pstats")]
+            for name in os.listdir(self.directory)
+            if name.endswith(".pstats")
+        )
+        for name in names[: max(len(names) - self.max_files, 0)]:
+            for ext in (".pstats", ".json"):
+                try:
+                    os.remove(os.path.join(self.directory, name + ext))
+                except FileNotFoundError:
+                    # Removed by another worker.
+                    pass
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Combined proxy fix and prefix dispatching."""
+
+from werkzeug.http import parse_list_header
+
+from .dispatcher import PrefixDispatcherMiddleware
+
+
+def get_real_value(trusted, value):
+    """Get the value set by the last trusted proxy in a list header.
+
+    Same as Werkzeug's ``ProxyFix._get_real_value``, but the full header
+    parser is only used for values containing quotes.
+
+    :param trusted: Number of values to trust in the header.
+    :param value: Comma separated list header value.
+    :returns: The real value, or ``None`` if there are fewer values than the
+        number of trusted proxies.
+    """
+    if not value:
+        return None
+    if '"' in value:
+        values = parse_list_header(value)
+    else:
+        values = [v for v in (v.strip(" \t") for v in value.split(",")) if v]
+    if len(values) >= trusted:
+        return values[-trusted]
+    return None
+
+
+def _fix_for(environ, value):
+    environ["REMOTE_ADDR"] = value
+
+
+def _fix_proto(environ, value):
+    environ["wsgi.url_scheme"] = value
+
+
+def _fix_host(environ, value):
+    environ["HTTP_HOST"] = environ["SERVER_NAME"] = value
+    # "]" to check for IPv6 address without port
+    if ":" in value and not value.endswith("]"):
+        environ["SERVER_NAME"], environ["SERVER_PORT"] = value.rsplit(":", 1)
+
+
+def _fix_port(environ, value):
+    host = environ.get("HTTP_HOST")
+    if host:
+        # "]" to check for IPv6 address without port
+        if ":" in host and not host.endswith("]"):
+            host = host.rsplit(":", 1)[0]
+        environ["HTTP_HOST"] = f"{host}:{value}"
+    environ["SERVER_PORT"] = value
+
+
+def _fix_prefix(environ, value):
+    environ["SCRIPT_NAME"] = value
+
+
+# Order matters, the port fix depends on the host fix.
+_FIXES = (
+    ("x_for", "HTTP_X_FORWARDED_FOR", _fix_for),
+    ("x_proto", "HTTP_X_FORWARDED_PROTO", _fix_proto),
+    ("x_host", "HTTP_X_FORWARDED_HOST", _fix_host),
+    ("x_port", "HTTP_X_FORWARDED_PORT", _fix_port),
+    ("x_prefix", "HTTP_X_FORWARDED_PREFIX", _fix_prefix),
+)
+
+
+class ProxyFixDispatcherMiddleware(PrefixDispatcherMiddleware):
+    """Fix the environment with ``X-Forwarded-*`` headers and dispatch.
+
+    Equivalent to wrapping a
+    :class:`~invenio_base.wsgi.dispatcher.PrefixDispatcherMiddleware` in
+    Werkzeug's ``ProxyFix``, but handled by a single middleware. The trusted
+    headers are selected once when the middleware is created, so headers
+    which are not trusted are not even looked up, and header values without
+    quotes are parsed with a simple split.
+
+    The trust parameters have the same meaning and defaults as the ones of
+    ``ProxyFix`` (i.e. the ``PROXYFIX_CONFIG`` values). The original values
+    are stored in ``environ['werkzeug.proxy_fix.orig']``.
+
+    :param app: The default WSGI application.
+    :param mounts: Dictionary of WSGI applications per mount point.
+    :param background_build: Build the lazy mounts in a background thread
+        after the first request.
+    :param x_for: Number of values to trust for ``X-Forwarded-For``.
+    :param x_proto: Number of values to trust for ``X-Forwarded-Proto``.
+    :param x_host: Number of values to trust for ``X-Forwarded-Host``.
+    :param x_port: Number of values to trust for ``X-Forwarded-Port``.
+    :param x_prefix: Number of values to trust for ``X-Forwarded-Prefix``.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(
+        self,
+        app,
+        mounts=None,
+        background_build=False,
+        x_for=1,
+        x_proto=1,
+        x_host=0,
+        x_port=0,
+        x_prefix=0,
+    ):
+        """Initialize the middleware."""
+        super().__init__(app, mounts=mounts, background_build=background_build)
+        trust = {
+            "x_for": x_for,
+            "x_proto": x_proto,
+            "x_host": x_host,
+            "x_port": x_port,
+            "x_prefix": x_prefix,
+        }
+        self._fixes = tuple(
+            (key, trust[name], fix) for name, key, fix in _FIXES if trust[name]
+        )
+
+    def __call__(self, environ, start_response):
+        """Fix the environment and dispatch the request."""
+        environ_get = environ.get
+        environ["werkzeug.proxy_fix.orig"] = {
+            "REMOTE_ADDR": environ_get("REMOTE_ADDR"),
+            "wsgi.url_scheme": environ_get("wsgi.url_scheme"),
+            "HTTP_HOST": environ_get("HTTP_HOST"),
+            "SERVER_NAME": environ_get("SERVER_NAME"),
+            "SERVER_PORT": environ_get("SERVER_PORT"),
+            "SCRIPT_NAME": environ_get("SCRIPT_NAME"),
+        }
+        for key, trusted, fix in self._fixes:
+            value = environ_get(key)
+            if value:
+                value = get_real_value(trusted, value)
+                if value:
+                    fix(environ, value)
+
+        return super().__call__(environ, start_response)
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Static files served before entering Flask."""
+
+import logging
+import mimetypes
+import os
+from datetime import datetime, timezone
+from zlib import adler32
+
+from werkzeug.http import http_date, is_resource_modified
+from werkzeug.utils import get_content_type
+from werkzeug.wsgi import wrap_file
+
+from ..assets import FINGERPRINT_ARG, immutable_cache_control
+from .compression import accepts_gzip
+
+logger = logging.getLogger(__name__)
+
+
+class _StaticFile:
+    """Indexed static file."""
+
+    __slots__ = ("path", "size", "mtime", "last_modified", "etag", "headers", "gzip")
+
+    def __init__(self, path, stat, headers):
+        """Initialize the file."""
+        self.path = path
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.last_modified = datetime.fromtimestamp(self.mtime, timezone.utc)
+        check = adler32(path.encode()) & 0xFFFFFFFF
+        self.etag = f"{self.mtime}-{self.size}-{check}"
+        self.headers = headers + [
+            ("Content-Length", str(self.size)),
+            ("ETag", f'"{self.etag}"'),
+            ("Last-Modified", http_date(self.last_modified)),
+        ]
+        self.gzip = None
+
+
+class StaticFilesMiddleware:
+    """Serve the files of a static folder without entering Flask.
+
+    The folder is indexed when the middleware is created, and requests for
+    the indexed files are answered directly with precomputed headers:
+
+    - files are sent with ``wsgi.file_wrapper`` when the server provides it
+      (e.g. Gunicorn uses ``sendfile``);
+    - ``If-None-Match`` and ``If-Modified-Since`` are answered from the
+      precomputed ``ETag`` and modification time;
+    - if ``<file>.gz`` exists next to the file, it is sent to clients which
+      accept gzip with ``Content-Encoding: gzip``.
+
+    Other requests, including files added after the index was built, range
+    requests and files changed since, are passed to the application (i.e.
+    Flask's static route), which keeps the same behavior. Call
+    :meth:`index` to refresh the index.
+
+    :param app: The WSGI application.
+    :param directory: The static folder.
+    :param url_path: URL path of the static folder.
+    :param max_age: Maximum age in seconds of the cached files (by default
+        clients must revalidate them).
+    :param manifest: The :class:`~invenio_base.assets.StaticManifest` of the
+        folder. Requests for fingerprinted URLs with the current hash of the
+        file are answered with far-future cache headers.
+    :param manifest_max_age: Maximum age in seconds of fingerprinted files.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(
+        self,
+        app,
+        directory,
+        url_path="/static",
+        max_age=None,
+        manifest=None,
+        manifest_max_age=31536000,
+    ):
+        """Initialize the middleware."""
+        self.app = app
+        self.directory = directory
+        self.manifest = manifest
+        self.immutable = ("Cache-Control", immutable_cache_control(manifest_max_age))
+        self.prefix = url_path.rstrip("/") + "/"
+        if max_age:
+            self.cache_control = f"public, max-age={int(max_age)}"
+        else:
+            self.cache_control = "no-cache"
+        self.files = {}
+        self.index()
+
+    def _file(self, path, stat):
+        """Create an indexed file."""
+        mimetype, encoding = mimetypes.guess_type(path)
+        headers = [("Cache-Control", self.cache_control)]
+        if encoding == "gzip":
+            mimetype = "application/gzip"
+        headers.append(
+            (
+                "Content-Type",
+                get_content_type(mimetype or "application/octet-stream", "utf-8"),
+            )
+        )
+        return _StaticFile(path, stat, headers)
+
+    def index(self):
+        """Index the files of the static folder."""
+        files = {}
+        for root, dirs, names in os.walk(self.directory, followlinks=True):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                url = os.path.relpath(path, self.directory).replace(os.sep, "/")
+                files[url] = self._file(path, stat)
+        for url, static_file in files.items():
+            gz = files.get(f"{url}.gz")
+            if gz is not None:
+                static_file.headers.append(("Vary", "Accept-Encoding"))
+                gz.headers = [
+                    *static_file.headers[:2],
+                    ("Content-Length", str(gz.size)),
+                    ("ETag", f'"{gz.etag}"'),
+                    ("Last-Modified", http_date(gz.last_modified)),
+                    ("Content-Encoding", "gzip"),
+                    ("Vary", "Accept-Encoding"),
+                ]
+                static_file.gzip = gz
+        self.files = files
+        logger.debug(f"Indexed {len(files)} static files in {self.directory}.")
+
+    def __call__(self, environ, start_response):
+        """Serve the request if it is for an indexed static file."""
+        path = environ.get("PATH_INFO", "")
+        method = environ.get("REQUEST_METHOD")
+        if (
+            not path.startswith(self.prefix)
+            or method not in ("GET", "HEAD")
+            or "HTTP_RANGE" in environ
+        ):
+            return self.app(environ, start_response)
+        filename = path[len(self.prefix) :]
+        static_file = self.files.get(filename)
+        if static_file is None:
+            return self.app(environ, start_response)
+        immutable = False
+        query = environ.get("QUERY_STRING")
+        if query and self.manifest is not None:
+            fingerprint = self.manifest.get(filename)
+            immutable = (
+                bool(fingerprint) and query == f"{FINGERPRINT_ARG}={fingerprint}"
+            )
+        if static_file.gzip is not None and accepts_gzip(
+            environ.get("HTTP_ACCEPT_ENCODING")
+        ):
+            static_file = static_file.gzip
+
+        if not is_resource_modified(
+            environ, etag=static_file.etag, last_modified=static_file.last_modified
+        ):
+            headers = [h for h in static_file.headers if h[0] != "Content-Length"]
+            if immutable:
+                headers[0] = self.immutable
+            start_response("304 Not Modified", headers)
+            return []
+
+        try:
+            f = open(static_file.path, "rb")
+        except OSError:
+            return self.app(environ, start_response)
+        stat = os.fstat(f.fileno())
+        if stat.st_size != static_file.size or stat.st_mtime != static_file.mtime:
+            # Changed since indexed.
+            f.close()
+            return self.app(environ, start_response)
+
+        headers = list(static_file.headers)
+        if immutable:
+            # ``Cache-Control`` is the first header.
+            headers[0] = self.immutable
+        start_response("200 OK", headers)
+        if method == "HEAD":
+            f.close()
+            return []
+        return wrap_file(environ, f)
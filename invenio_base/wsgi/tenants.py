@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Host based dispatching of multi-tenant deployments."""
+
+import logging
+import threading
+from collections import OrderedDict
+
+from werkzeug.exceptions import NotFound
+
+from ..utils import get_rss
+
+logger = logging.getLogger(__name__)
+
+
+class _Tenant:
+    """Application built for a tenant."""
+
+    __slots__ = ("app", "memory", "hits")
+
+    def __init__(self, app, memory):
+        """Initialize the tenant entry."""
+        self.app = app
+        self.memory = memory
+        self.hits = 0
+
+
+def normalize_host(host):
+    """Normalize a ``Host`` header value by lower-casing it and removing the port.
+
+    :param host: Value of the ``Host`` header.
+    :returns: The host name.
+    """
+    host = host.lower()
+    if ":" in host and not host.endswith("]"):
+        host = host.rsplit(":", 1)[0]
+    return host
+
+
+class HostDispatcherMiddleware:
+    """Dispatch requests to per tenant applications based on the host name.
+
+    Each tenant is served by its own application, created on its first
+    request by calling ``app_factory`` with the tenant configuration as
+    keyword arguments. With a factory made by
+    :func:`invenio_base.app.create_app_factory`, the keyword arguments are
+    passed to the configuration loader:
+
+    .. code-block:: python
+
+       create_app = create_app_factory('site', config_loader=config_loader)
+
+       application = HostDispatcherMiddleware(
+           create_app,
+           {
+               'one.example.org': {'THEME_SITENAME': 'One'},
+               'two.example.org': {'THEME_SITENAME': 'Two'},
+           },
+           max_apps=10,
+       )
+
+    The created applications are kept in a LRU cache. Once more than
+    ``max_apps`` applications exist, or the memory accounted to them exceeds
+    ``max_memory``, the least recently used ones are evicted and will be
+    created again on their next request. The memory of an application is
+    accounted as the growth of the resident set size of the process during
+    its creation, so it is an approximation (e.g. shared imports are only
+    accounted to the first tenant).
+
+    :param app_factory: Application factory called with the configuration of
+        a tenant.
+    :param tenants: Dictionary of configuration per host name.
+    :param default_app: WSGI application for unknown hosts (by default a
+        ``404 Not Found`` response).
+    :param max_apps: Maximum number of applications kept at the same time.
+    :param max_memory: Maximum memory in bytes accounted to the kept
+        applications.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(
+        self, app_factory, tenants, default_app=None, max_apps=None, max_memory=None
+    ):
+        """Initialize the middleware."""
+        self.app_factory = app_factory
+        self.tenants = {
+            normalize_host(host): dict(config) for host, config in tenants.items()
+        }
+        self.default_app = default_app or NotFound()
+        self.max_apps = max_apps
+        self.max_memory = max_memory
+        self._apps = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks = {host: threading.Lock() for host in self.tenants}
+
+    @property
+    def stats(self):
+        """Dictionary of statistics per host name of the existing applications.
+
+        Each entry contains the accounted ``memory`` in bytes and the number
+        of ``hits`` since the application was created, and the entries are
+        ordered from the least to the most recently used.
+        """
+        with self._lock:
+            return {
+                host: {"memory": tenant.memory, "hits": tenant.hits}
+                for host, tenant in self._apps.items()
+            }
+
+    def get_app(self, host):
+        """Get the application of a tenant, creating it if needed.
+
+        :param host: Normalized host name of the tenant.
+        :returns: The application.
+        """
+        with self._lock:
+            tenant = self._apps.get(host)
+            if tenant is not None:
+                self._apps.move_to_end(host)
+                tenant.hits += 1
+                return tenant.app
+
+        # Only one thread builds the application of a tenant, without blocking
+        # the requests of the other tenants.
+        with self._build_locks[host]:
+            with self._lock:
+                tenant = self._apps.get(host)
+                if tenant is not None:
+                    tenant.hits += 1
+                    return tenant.app
+
+            rss = get_rss()
+            app = self.app_factory(**self.tenants[host])
+            tenant = _Tenant(app, max(get_rss() - rss, 0))
+            tenant.hits += 1
+
+            with self._lock:
+                self._apps[host] = tenant
+                self._evict()
+        return app
+
+    def evict(self, host):
+        """Evict the application of a tenant.
+
+        :param host: Normalized host name of the tenant.
+        :returns: Whether an application was evicted.
+        """
+        with self._lock:
+            return self._apps.pop(host, None) is not None
+
+    def _evict(self):
+        """Evict least recently used applications over the limits.
+
+        The most recently used application is always kept. Must be called
+        with the lock held.
+        """
+        while len(self._apps) > 1:
+            over_apps = self.max_apps is not None and len(self._apps) > self.max_apps
+            over_memory = self.max_memory is not None and (
+                sum(t.memory for t in self._apps.values()) > self.max_memory
+            )
+            if not (over_apps or over_memory):
+                break
+            host, tenant = self._apps.popitem(last=False)
+            logger.info(
+                f"Evicted application of tenant {host} "
+                f"({tenant.memory} bytes, {tenant.hits} hits)"
+            )
+
+    def __call__(self, environ, start_response):
+        """Dispatch the request to the application of its host."""
+        host = normalize_host(
+            environ.get("HTTP_HOST") or environ.get("SERVER_NAME", "")
+        )
+        if host not in self.tenants:
+            return self.default_app(environ, start_response)
+        return self.get_app(host)(environ, start_response)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Watchdog logging the stack traces of slow requests."""
+
+import logging
+import os
+import sys
+import threading
+import traceback
+from time import monotonic
+
+from .metrics import _call_on_close
+
+logger = logging.getLogger(__name__)
+
+
+class _InFlight:
+    """Request being handled by a thread."""
+
+    __slots__ = ("description", "start", "next_report")
+
+    def __init__(self, description, start, next_report):
+        """Initialize the in-flight request."""
+        self.description = description
+        self.start = start
+        self.next_report = next_report
+
+
+class WatchdogMiddleware:
+    """Log the stack traces of requests running for too long.
+
+    The middleware keeps track of the request handled by each thread. A
+    single monitor thread per process checks them every ``interval`` seconds,
+    and logs the current stack trace of the threads whose request has been
+    running for more than ``threshold`` seconds, then again every ``repeat``
+    seconds while the request is still running. This shows where a hanging
+    worker is stuck (e.g. a slow query or external call) before it gets
+    killed by a timeout.
+
+    :param app: The WSGI application.
+    :param threshold: Duration in seconds after which a request is reported.
+    :param interval: Interval in seconds between two checks.
+    :param repeat: Interval in seconds between two reports of the same
+        request.
+
+    .. versionadded:: 2.5.0
+    """
+
+    def __init__(self, app, threshold=10, interval=1, repeat=10):
+        """Initialize the middleware."""
+        self.app = app
+        self.threshold = threshold
+        self.interval = interval
+        self.repeat = repeat
+        self.requests = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        """Forget the monitor thread and requests of the parent process."""
+        self._lock = threading.Lock()
+        self._thread = None
+        self.requests = {}
+
+    def _start_monitor(self):
+        """Start the monitor thread if not yet running."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._monitor, name="invenio-wsgi-watchdog", daemon=True
+                )
+                self._thread.start()
+
+    def _monitor(self):
+        """Check the requests forever."""
+        event = threading.Event()
+        while not event.wait(self.interval):
+            try:
+                self.check()
+            except Exception:  # pragma: no cover
+                logger.exception("Failed to check the running requests.")
+
+    def check(self):
+        """Report the requests running for too long.
+
+        :returns: The number of reported requests.
+        """
+        now = monotonic()
+        reported = 0
+        frames = None
+        for ident, in_flight in list(self.requests.items()):
+            if now < in_flight.next_report:
+                continue
+            if frames is None:
+                frames = sys._current_frames()
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            in_flight.next_report = now + self.repeat
+            stack = "".join(traceback.format_stack(frame))
+            logger.warning(
+                f"Request {in_flight.description} running for "
+                f"{now - in_flight.start:.1f}s:\n{stack}"
+            )
+            reported += 1
+        return reported
+
+    def __call__(self, environ, start_response):
+        """Track the request while it is running."""
+        if self._thread is None:
+            self._start_monitor()
+
+        ident = threading.get_ident()
+        start = monotonic()
+        self.requests[ident] = _InFlight(
+            f"{environ.get('REQUEST_METHOD')} "
+            f"{environ.get('SCRIPT_NAME', '')}{environ.get('PATH_INFO', '')}",
+            start,
+            start + self.threshold,
+        )
+
+        def done():
+            self.requests.pop(ident, None)
+
+        try:
+            app_iter = self.app(environ, start_response)
+        except BaseException:
+            done()
+            raise
+        return _call_on_close(app_iter, environ, done)
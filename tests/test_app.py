@@ -21,7 +21,7 @@ import pytest
 from click.testing import CliRunner
 from flask import Blueprint, Flask, current_app
 from importlib_metadata import EntryPoint
-from werkzeug.routing import BaseConverter
+from werkzeug.routing import BaseConverter, Map, Rule
 
 from invenio_base import __version__
 from invenio_base.app import (
@@ -29,6 +29,7 @@ from invenio_base.app import (
     app_loader,
     base_app,
     blueprint_loader,
+    compile_url_maps,
     configure_warnings,
     converter_loader,
     create_app_factory,
@@ -392,6 +393,42 @@ def test_create_app_factory_wsgi_factory():
     assert isinstance(app.wsgi_app, DispatcherMiddleware)
 
 
+def test_create_app_factory_compile_url_maps():
+    """Test the URL maps of the app and mounted apps are compiled."""
+    from invenio_base.wsgi import LazyMount, create_wsgi_factory, wsgi_proxyfix
+
+    api = Flask("api")
+    lazy = LazyMount(lambda **kwargs: Flask("lazy"))
+
+    def _config_loader(app, **kwargs):
+        app.config.update(APP_COMPILE_URL_MAPS=True, PROXYFIX_CONFIG={"x_for": 1})
+
+    class _UrlsBuilder:
+        url_map = Map([Rule("/other", endpoint="other")])
+
+    create_app = create_app_factory(
+        "test",
+        config_loader=_config_loader,
+        urls_builder_factory=lambda app, **kwargs: _UrlsBuilder(),
+        wsgi_factory=wsgi_proxyfix(
+            create_wsgi_factory(
+                {"/api": lambda **kwargs: api, "/lazy": lambda **kwargs: lazy}
+            )
+        ),
+    )
+    app = create_app()
+    assert app.url_map._remap is False
+    assert app._urls_builder.url_map._remap is False
+    assert api.url_map._remap is False
+    assert not lazy.built
+
+    # Without the option, maps are compiled on first use.
+    app = create_app_factory("test")()
+    assert app.url_map._remap is True
+    assert compile_url_maps(app) == 1
+    assert app.url_map._remap is False
+
+
 def test_create_cli_with_app():
     """Test create cli."""
     app_name = "mycmdtest"
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the fingerprinted static URLs."""
+
+import hashlib
+import json
+import os
+
+import pytest
+from flask import render_template_string
+
+from invenio_base.app import create_app_factory
+from invenio_base.assets import StaticManifest, static_url
+from invenio_base.wsgi import StaticFilesMiddleware, wsgi_static
+
+
+@pytest.fixture()
+def static(tmppath):
+    """Static folder."""
+    static = os.path.join(tmppath, "static")
+    os.makedirs(os.path.join(static, "js"))
+    with open(os.path.join(static, "js", "app.js"), "w") as f:
+        f.write("var a = 1;")
+    return static
+
+
+@pytest.fixture()
+def app(tmppath, static):
+    """Application with the static manifest."""
+
+    def config_loader(app, **kwargs):
+        app.config.update(APP_STATIC_MANIFEST=True, WSGI_STATIC=True)
+
+    create_app = create_app_factory(
+        "test",
+        config_loader=config_loader,
+        instance_path=tmppath,
+        static_folder=static,
+        wsgi_factory=wsgi_static(),
+    )
+    return create_app()
+
+
+def test_static_manifest(tmppath, static):
+    """Test only new and modified files are hashed."""
+    cache_file = os.path.join(tmppath, "cache", "manifest.json")
+    manifest = StaticManifest(static, cache_file=cache_file)
+    assert manifest.build() == 1
+    expected = hashlib.sha256(b"var a = 1;").hexdigest()[:16]
+    assert manifest.get("js/app.js") == expected
+    assert manifest.get("missing.js") is None
+    with open(cache_file) as f:
+        assert json.load(f)["js/app.js"][2] == expected
+
+    with open(os.path.join(static, "style.css"), "w") as f:
+        f.write("body {}")
+    manifest = StaticManifest(static, cache_file=cache_file)
+    assert manifest.build() == 1
+    assert manifest.build() == 0
+
+    path = os.path.join(static, "js", "app.js")
+    with open(path, "w") as f:
+        f.write("var a = 2;")
+    os.utime(path, ns=(0, 0))
+    assert manifest.build() == 1
+    assert manifest.get("js/app.js") != expected
+
+    os.remove(path)
+    assert manifest.build() == 0
+    assert set(manifest.hashes) == {"style.css"}
+    with open(cache_file) as f:
+        assert set(json.load(f)) == {"style.css"}
+
+
+def test_static_url(app):
+    """Test fingerprinted URLs and their cache headers."""
+    fingerprint = app._static_manifest.get("js/app.js")
+    with app.test_request_context():
+        assert static_url("js/app.js") == f"/static/js/app.js?v={fingerprint}"
+        assert static_url("missing.js") == "/static/missing.js"
+        assert render_template_string("{{ static_url('js/app.js') }}") == (
+            f"/static/js/app.js?v={fingerprint}"
+        )
+
+    # Served by the static files middleware and by Flask.
+    assert isinstance(app.wsgi_app, StaticFilesMiddleware)
+    for headers in ({}, {"Range": "bytes=0-"}):
+        client = app.test_client()
+        response = client.get(f"/static/js/app.js?v={fingerprint}", headers=headers)
+        assert response.headers["Cache-Control"] == (
+            "public, max-age=31536000, immutable"
+        )
+        response.close()
+        response = client.get("/static/js/app.js?v=outdated", headers=headers)
+        assert response.headers["Cache-Control"] == "no-cache"
+        response.close()
+
+
+def test_static_url_disabled(tmppath, static):
+    """Test plain URLs are built if the manifest is not enabled."""
+    app = create_app_factory("test", instance_path=tmppath, static_folder=static)()
+    assert not hasattr(app, "_static_manifest")
+    with app.test_request_context():
+        assert static_url("js/app.js") == "/static/js/app.js"
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the request hook timing."""
+
+import os
+import time
+
+from flask import Blueprint, render_template_string
+
+from invenio_base.app import create_app_factory
+from invenio_base.cli import instance
+from invenio_base.hooks import format_report, merge_reports
+
+
+def slow_hook():
+    """Slow ``before_request`` hook."""
+    time.sleep(0.01)
+
+
+def init_ext(app):
+    """Extension registering request hooks."""
+    bp = Blueprint("bp", __name__)
+    bp.before_app_request(slow_hook)
+    bp.add_url_rule("/", "index", lambda: render_template_string("{{ value }}"))
+    app.register_blueprint(bp)
+    app.after_request(lambda response: response)
+    app.context_processor(lambda: {"value": "ext"})
+    app.teardown_appcontext(lambda exc: None)
+
+
+def test_hook_timing(tmppath):
+    """Test the hooks are timed and reported per package and per hook."""
+
+    def config_loader(app, **kwargs):
+        app.config.update(APP_HOOK_TIMING=True)
+
+    app = create_app_factory(
+        "test",
+        config_loader=config_loader,
+        extensions=[init_ext],
+        instance_path=tmppath,
+    )()
+    timing = app._hook_timing
+    client = app.test_client()
+    assert client.get("/").data == b"ext"
+    assert client.get("/").data == b"ext"
+
+    calls, total, maximum = timing.report["before_request test_hooks:slow_hook"]
+    assert calls == 2
+    assert total >= 0.02
+    assert maximum >= 0.01
+    assert set(key.split(" ")[0] for key in timing.report) == {
+        "before_request",
+        "after_request",
+        "context_processor",
+        "teardown_appcontext",
+    }
+
+    # Written once the flush interval elapsed.
+    directory = os.path.join(tmppath, "hook-timing")
+    assert merge_reports(directory) == {}
+    result = app.test_cli_runner().invoke(instance, ["hooks"])
+    assert result.exit_code == 1
+    assert "No hook timings found." in result.output
+
+    timing.flush_interval = 0
+    client.get("/")
+    report = merge_reports(directory)
+    assert report["before_request test_hooks:slow_hook"][0] == 3
+
+    formatted = format_report(report, top=1)
+    lines = formatted.split("\n")
+    assert lines[0] == "Packages:"
+    assert lines[1].endswith("calls: test_hooks")
+    assert lines[2] == "Hooks:"
+    assert lines[3].endswith("calls: before_request test_hooks:slow_hook")
+    assert len(lines) == 4
+
+    result = app.test_cli_runner().invoke(instance, ["hooks"])
+    assert result.exit_code == 0
+    assert "before_request test_hooks:slow_hook" in result.output
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the sampling profiler."""
+
+import os
+import threading
+
+from invenio_base import sampling
+from invenio_base.app import create_app_factory
+from invenio_base.cli import instance
+from invenio_base.sampling import SamplingProfiler, merge_samples
+
+
+def busy_function(event):
+    """Function visible in the samples."""
+    event.wait(timeout=5)
+
+
+def test_sampling_profiler(tmppath):
+    """Test stacks of other threads are sampled and written."""
+    profiler = SamplingProfiler(interval=0.001, directory=tmppath)
+    event = threading.Event()
+    thread = threading.Thread(target=busy_function, args=(event,))
+    thread.start()
+
+    profiler.sample()
+    profiler.sample()
+    event.set()
+    thread.join()
+
+    stacks = [s for s in profiler.counts if ":busy_function;" in s]
+    assert len(stacks) == 1
+    assert profiler.counts[stacks[0]] == 2
+    assert ":Thread.run;" in stacks[0]
+
+    profiler.flush()
+    assert os.listdir(tmppath) == [f"{os.getpid()}.folded"]
+    assert merge_samples(tmppath) == profiler.counts
+
+
+def test_sampling_profiler_thread(tmppath):
+    """Test the sampling thread can be started and stopped."""
+    profiler = SamplingProfiler(interval=0.001, directory=tmppath, flush_interval=0)
+    profiler.start()
+    profiler.start()
+    assert profiler.running
+    event = threading.Event()
+    while not profiler.counts:
+        event.wait(0.01)
+    profiler.stop()
+    assert not profiler.running
+    assert sum(merge_samples(tmppath).values()) >= 1
+
+
+def test_sampling_profiler_app(tmppath):
+    """Test the profiler is started by the app factory and samples are printed."""
+
+    def config_loader(app, **kwargs):
+        app.config.update(
+            APP_SAMPLING_PROFILER=True, APP_SAMPLING_PROFILER_INTERVAL=0.001
+        )
+
+    create_app = create_app_factory(
+        "test", config_loader=config_loader, instance_path=tmppath
+    )
+    app = create_app()
+    runner = app.test_cli_runner()
+
+    try:
+        profiler = sampling._profiler
+        assert profiler.running
+        assert profiler.directory == os.path.join(tmppath, "sampling")
+        # Started only once per process.
+        create_app()
+        assert sampling._profiler is profiler
+
+        event = threading.Event()
+        while not profiler.counts:
+            event.wait(0.01)
+        profiler.stop()
+        result = runner.invoke(instance, ["flamegraph"])
+        assert result.exit_code == 0
+        assert result.output == profiler.collapsed()
+    finally:
+        sampling._profiler.stop()
+        sampling._profiler = None
+
+    os.remove(os.path.join(tmppath, "sampling", f"{os.getpid()}.folded"))
+    result = runner.invoke(instance, ["flamegraph"])
+    assert result.exit_code == 1
+    assert "No samples found." in result.output
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the template loader, cache and lazy context."""
+
+import os
+from unittest.mock import patch
+
+import jinja2
+import pytest
+from flask import Blueprint, Flask, render_template, render_template_string
+from importlib_metadata import EntryPoint
+from jinja2 import ChoiceLoader, DictLoader, FunctionLoader, TemplateNotFound
+
+from invenio_base.app import create_app_factory
+from invenio_base.cli import instance
+from invenio_base.templating import (
+    IndexedTemplateLoader,
+    LazyContext,
+    add_lazy_context,
+    init_template_index,
+)
+
+
+def _write(directory, name, content):
+    path = os.path.join(directory, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+@pytest.fixture()
+def blueprints(tmppath):
+    """Blueprints with overlapping templates."""
+    result = []
+    for name in ("bp1", "bp2"):
+        folder = os.path.join(tmppath, name)
+        _write(folder, "shared.html", name)
+        _write(folder, f"{name}/page.html", f"{name} page")
+        result.append(Blueprint(name, name, template_folder=folder))
+    return result
+
+
+@pytest.fixture()
+def app(tmppath, blueprints):
+    """Application with templates overriding the blueprint ones."""
+    app_folder = os.path.join(tmppath, "app")
+    _write(app_folder, "bp2/page.html", "app page")
+    app = Flask("testapp", template_folder=app_folder)
+    for bp in blueprints:
+        app.register_blueprint(bp)
+    return app
+
+
+def test_indexed_template_loader(app):
+    """Test the index follows the precedence of Flask."""
+    with app.app_context():
+        expected = [
+            render_template(name)
+            for name in ("shared.html", "bp1/page.html", "bp2/page.html")
+        ]
+    assert expected == ["bp1", "bp1 page", "app page"]
+
+    loader = init_template_index(app)
+    assert app.jinja_env.loader is loader
+    assert loader.list_templates() == ["bp1/page.html", "bp2/page.html", "shared.html"]
+    with app.app_context():
+        assert [
+            render_template(name)
+            for name in ("shared.html", "bp1/page.html", "bp2/page.html")
+        ] == expected
+        with pytest.raises(TemplateNotFound):
+            render_template("missing.html")
+
+
+def test_indexed_template_loader_miss(app, tmppath):
+    """Test templates missing from the index are looked up in the loaders."""
+    app_folder = os.path.join(tmppath, "app")
+    _write(os.path.join(tmppath, "outside"), "sub/t.html", "linked")
+    os.symlink(os.path.join(tmppath, "outside"), os.path.join(app_folder, "linked"))
+    _write(app_folder, "t2.html", "t2")
+
+    loader = init_template_index(app)
+    assert "linked/sub/t.html" not in loader.list_templates()
+    with app.app_context():
+        assert render_template("linked/sub/t.html") == "linked"
+        assert render_template("./t2.html") == "t2"
+        assert render_template("./bp2/page.html") == "app page"
+        with pytest.raises(TemplateNotFound):
+            render_template("../app/t2.html")
+
+
+def test_indexed_template_loader_unindexed():
+    """Test loaders which cannot list their templates keep their precedence."""
+    loader = IndexedTemplateLoader(
+        [
+            DictLoader({"a.html": "first"}),
+            FunctionLoader(lambda name: "function" if name != "c.html" else None),
+            DictLoader({"a.html": "last", "b.html": "last", "c.html": "last"}),
+        ]
+    )
+    assert loader.build() == 3
+    env = Flask("testapp").jinja_env.overlay(loader=loader)
+    assert env.get_template("a.html").render() == "first"
+    assert env.get_template("b.html").render() == "function"
+    assert env.get_template("c.html").render() == "last"
+    assert env.get_template("d.html").render() == "function"
+
+
+def test_create_app_factory_template_index(tmppath, blueprints):
+    """Test the index is built when the application is loaded."""
+
+    def config_loader(app, **kwargs):
+        app.config.update(APP_TEMPLATE_INDEX=True, **kwargs)
+
+    create_app = create_app_factory(
+        "test",
+        config_loader=config_loader,
+        blueprints=blueprints,
+        instance_path=tmppath,
+    )
+    app = create_app()
+    assert isinstance(app.jinja_env.loader, IndexedTemplateLoader)
+    with app.app_context():
+        assert render_template("shared.html") == "bp1"
+
+    # Templates are auto-reloaded in debug mode.
+    app = create_app(TEMPLATES_AUTO_RELOAD=True)
+    assert not isinstance(app.jinja_env.loader, IndexedTemplateLoader)
+
+
+def test_indexed_template_loader_wrapped(app):
+    """Test loaders wrapping Flask's loader are kept."""
+    theme = DictLoader({"theme.html": "theme", "shared.html": "theme"})
+    app.jinja_env.loader = ChoiceLoader([theme, app.jinja_env.loader])
+    loader = init_template_index(app)
+    assert isinstance(loader, IndexedTemplateLoader)
+    assert app.jinja_env.loader.loaders == [theme, loader]
+    with app.app_context():
+        assert render_template("theme.html") == "theme"
+        assert render_template("shared.html") == "theme"
+        assert render_template("bp1/page.html") == "bp1 page"
+
+    # Other loaders are not replaced.
+    app.jinja_env.loader = theme
+    assert init_template_index(app) is None
+    assert app.jinja_env.loader is theme
+
+
+def test_template_cache(tmppath, blueprints):
+    """Test the templates are compiled into the bytecode cache."""
+    _write(os.path.join(tmppath, "bp2"), "broken.html", "{% if %}")
+    create_app = create_app_factory(
+        "test", blueprints=blueprints, instance_path=tmppath, template_cache=True
+    )
+    app = create_app()
+    cache = os.path.join(tmppath, "templates-cache")
+    assert os.listdir(cache) == []
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(instance, ["compile-templates", "-e", "html"])
+    assert result.exit_code == 0
+    assert "Failed to compile: broken.html" in result.output
+    assert "Compiled 3 templates." in result.output
+    files = os.listdir(cache)
+    assert len(files) == 3
+    assert all(jinja2.__version__ in name for name in files)
+
+    # Other workers load the compiled templates.
+    app = create_app()
+    with patch.object(app.jinja_env, "compile", side_effect=AssertionError):
+        with app.app_context():
+            assert render_template("bp2/page.html") == "bp2 page"
+
+    # Modified templates are compiled again.
+    _write(os.path.join(tmppath, "bp2"), "bp2/page.html", "modified")
+    app = create_app()
+    with app.app_context():
+        assert render_template("bp2/page.html") == "modified"
+    assert len(os.listdir(cache)) == 3
+
+    result = (
+        create_app_factory("test")()
+        .test_cli_runner()
+        .invoke(instance, ["compile-templates"])
+    )
+    assert result.exit_code == 1
+    assert "The template cache is not enabled." in result.output
+
+
+def test_lazy_context(tmppath):
+    """Test lazy context values are computed once, only when referenced."""
+    calls = []
+
+    def menu():
+        calls.append("menu")
+        return ["home", "search"]
+
+    def expensive():
+        calls.append("expensive")
+        return "expensive"
+
+    def init_ext(app):
+        add_lazy_context(app, "expensive", expensive)
+
+    folder = os.path.join(tmppath, "templates")
+    _write(folder, "menu.html", "{% for item in menu %}{{ item }} {% endfor %}")
+    create_app = create_app_factory(
+        "test",
+        extensions=[init_ext],
+        lazy_context={"menu": menu},
+        instance_path=tmppath,
+        template_folder=folder,
+    )
+    app = create_app()
+    with app.test_request_context():
+        assert render_template_string("page") == "page"
+        assert calls == []
+
+        template = "{{ menu|length }} {% include 'menu.html' %}{{ menu[0] }}"
+        assert render_template_string(template) == "2 home search home"
+        assert calls == ["menu"]
+        assert render_template_string("{% include 'menu.html' %}") == "home search "
+        assert calls == ["menu", "menu"]
+
+        # Values of the context take precedence.
+        assert render_template_string("{{ expensive }}", expensive="cheap") == "cheap"
+        assert render_template_string("{{ expensive }}") == "expensive"
+        assert calls == ["menu", "menu", "expensive"]
+        assert render_template_string("{{ missing is defined }}") == "False"
+
+        # Values are computed when the rendered template or block references
+        # them, even in branches which are not rendered.
+        assert render_template_string("{% if false %}{{ menu }}{% endif %}") == ""
+        assert calls == ["menu", "menu", "expensive", "menu"]
+
+    # Not installed without lazy context values.
+    app = create_app_factory("test")()
+    assert not issubclass(app.jinja_env.context_class, LazyContext)
+
+
+@patch(
+    "invenio_base.app.iter_entry_points",
+    lambda group: [EntryPoint("menu", "test_templating:_menu", group)],
+)
+def test_lazy_context_entry_points():
+    """Test lazy context values are loaded from entry points."""
+    app = create_app_factory("test", lazy_context_entry_points=["menus"])()
+    with app.test_request_context():
+        assert render_template_string("{{ menu }}") == "entry point"
+
+
+def _menu():
+    """Lazy context value registered with an entry point."""
+    return "entry point"
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test server timing."""
+
+import time
+
+from flask import Blueprint, render_template_string
+
+from invenio_base.app import create_app_factory
+from invenio_base.timing import ServerTiming, add_timing, current_timing, span
+from invenio_base.urls import invenio_url_for
+
+
+def config_loader(app, **kwargs):
+    """Load configuration."""
+    app.config.update(**kwargs)
+
+
+def extension(app):
+    """Extension adding a request hook and a view."""
+
+    @app.before_request
+    def hook():
+        with span("hook", 'Extension "hook"'):
+            pass
+
+    @app.route("/")
+    def index():
+        add_timing("db", 0.002)
+        invenio_url_for("index")
+        return render_template_string("{{ 1 + 1 }}")
+
+
+def parse_header(value):
+    """Parse the Server-Timing header in a dictionary of durations."""
+    timings = {}
+    for metric in value.split(", "):
+        name, dur = metric.split(";")[:2]
+        timings[name] = float(dur[len("dur=") :])
+    return timings
+
+
+def test_server_timing():
+    """Test the Server-Timing header is added."""
+    create_app = create_app_factory(
+        "test", config_loader=config_loader, extensions=[extension]
+    )
+    app = create_app(APP_SERVER_TIMING=True)
+
+    res = app.test_client().get("/")
+    assert res.data == b"2"
+    header = res.headers["Server-Timing"]
+    assert "hook;dur=" in header and ';desc="Extension \\"hook\\""' in header
+    timings = parse_header(header)
+    assert set(timings) == {
+        "routing",
+        "hook",
+        "before",
+        "db",
+        "url",
+        "render",
+        "view",
+        "after",
+    }
+    assert timings["db"] == 2.0
+
+
+def test_server_timing_blueprint_hooks():
+    """Test the hooks of blueprints are part of the before and after phases."""
+
+    def blueprint_extension(app):
+        bp = Blueprint("bp", __name__)
+
+        @bp.before_request
+        def before():
+            time.sleep(0.05)
+
+        @bp.after_request
+        def after(response):
+            time.sleep(0.05)
+            return response
+
+        bp.add_url_rule("/", "index", lambda: "index")
+        app.register_blueprint(bp)
+
+    create_app = create_app_factory(
+        "test", config_loader=config_loader, extensions=[blueprint_extension]
+    )
+    app = create_app(APP_SERVER_TIMING=True)
+
+    res = app.test_client().get("/")
+    timings = parse_header(res.headers["Server-Timing"])
+    assert timings["before"] >= 50
+    assert timings["after"] >= 50
+    assert timings["view"] < 50
+
+
+def test_server_timing_disabled():
+    """Test nothing is recorded when server timing is disabled."""
+    create_app = create_app_factory(
+        "test", config_loader=config_loader, extensions=[extension]
+    )
+    app = create_app()
+
+    res = app.test_client().get("/")
+    assert res.data == b"2"
+    assert "Server-Timing" not in res.headers
+    assert current_timing() is None
+
+
+def test_server_timing_header():
+    """Test spans with the same name are added up."""
+    timing = ServerTiming()
+    timing.add("db", 0.001)
+    timing.add("db", 0.002, "Database")
+    timing.add("cache", 0.0005, "Cache")
+    assert timing.header() == 'db;dur=3.000, cache;dur=0.500;desc="Cache"'
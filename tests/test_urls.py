@@ -10,7 +10,7 @@
 
 from unittest.mock import patch
 
-from flask import Blueprint, url_for
+from flask import Blueprint, Flask, url_for
 from werkzeug.routing import BaseConverter, BuildError, Map, Rule
 
 from invenio_base import invenio_url_for
@@ -230,3 +230,32 @@ def test_invenio_apps_urls_builder_w_converters():
         assert "https://example.org/api/bar/yes" == invenio_url_for(
             "api_blueprint.endpoint_bar_of_api_app", bar=True
         )
+
+
+@patch("invenio_base.app.iter_entry_points", _mock_iter_entry_points)
+@patch("invenio_base.urls.builders.iter_entry_points", _mock_iter_entry_points)
+def test_invenio_apps_urls_builder_url_map():
+    """Test the map of the other app has the same rules as the other app."""
+    create_app = create_app_factory(
+        "test",
+        config_loader=_config_loader,
+        urls_builder_factory=create_invenio_apps_urls_builder_factory(
+            "SITE_UI_URL",
+            "SITE_API_URL",
+            groups_of_other_app_entrypoints={
+                "blueprints": ["invenio_base.api_blueprints"],
+                "converters": ["invenio_base.api_converters"],
+            },
+        ),
+    )
+    app = create_app()
+
+    other_app = Flask("other")
+    other_app.url_map.converters["yesno"] = YesNoConverter
+    for ep in _mock_iter_entry_points("invenio_base.api_blueprints"):
+        other_app.register_blueprint(ep.load())
+
+    def rules(url_map):
+        return [(r.rule, r.endpoint) for r in url_map.iter_rules()]
+
+    assert rules(app._urls_builder.url_map) == rules(other_app.url_map)
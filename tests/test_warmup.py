@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the warm-up of the application."""
+
+import gc
+import threading
+import weakref
+from unittest.mock import patch
+
+import pytest
+from flask import current_app
+from importlib_metadata import EntryPoint
+
+from invenio_base import warmup as warmup_module
+from invenio_base.app import create_app_factory
+from invenio_base.wsgi import wsgi_health
+
+release = threading.Event()
+
+
+def warm_cache(app):
+    """Warm-up function."""
+    assert current_app._get_current_object() is app
+    app.config["WARM"] = True
+
+
+def wait(app):
+    """Warm-up function waiting to be released."""
+    release.wait(5)
+
+
+def broken(app):
+    """Failing warm-up function."""
+    raise RuntimeError()
+
+
+def _entry_points(group):
+    return [
+        EntryPoint(name, f"test_warmup:{name}", group)
+        for name in ("broken", "wait", "warm_cache")
+    ]
+
+
+@pytest.fixture()
+def create_app(tmppath):
+    """Application factory with warm-up functions."""
+    release.set()
+
+    def config_loader(app, **kwargs):
+        app.config.update(WSGI_HEALTH=True, **kwargs)
+
+    def create_app(**kwargs):
+        return create_app_factory(
+            "test",
+            config_loader=config_loader,
+            warmup_entry_points=["invenio_base.warmup"],
+            wsgi_factory=wsgi_health(),
+            instance_path=tmppath,
+        )(**kwargs)
+
+    with patch("invenio_base.warmup.iter_entry_points", _entry_points):
+        yield create_app
+
+
+def test_warmup(create_app, caplog):
+    """Test the warm-up functions are called when the app is created."""
+    app = create_app()
+    assert app.config["WARM"]
+    assert app._warmup.ready
+    assert set(app._warmup.durations) == {"broken", "wait", "warm_cache"}
+    assert "Failed to warm up: broken" in caplog.text
+    assert app.test_client().get("/ready").status_code == 200
+
+
+def test_warmup_background(create_app):
+    """Test readiness probes fail until the background warm-up is done."""
+    release.clear()
+    app = create_app(APP_WARMUP_BACKGROUND=True)
+    client = app.test_client()
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json == {"status": "starting"}
+    assert client.get("/ping").status_code == 200
+
+    release.set()
+    app._warmup._thread.join()
+    assert app.config["WARM"]
+    assert client.get("/ready").status_code == 200
+
+
+def test_warmup_after_fork(create_app):
+    """Test an unfinished warm-up is restarted in a child process."""
+    release.clear()
+    app = create_app(APP_WARMUP_BACKGROUND=True)
+    warmup = app._warmup
+    thread = warmup._thread
+    warmup_module._after_fork()
+    assert warmup._thread is not thread
+    release.set()
+    warmup._thread.join()
+    thread.join()
+
+    # Nothing to restart once finished.
+    assert warmup not in warmup_module._background
+    warmup_module._after_fork()
+    assert not warmup._thread.is_alive()
+
+
+def test_warmup_collected(create_app):
+    """Test the warm-up does not keep the application alive."""
+    # The logged errors would keep a reference to the application.
+    entry_point = EntryPoint("warm_cache", "test_warmup:warm_cache", "warmup")
+    with patch("invenio_base.warmup.iter_entry_points", lambda group: [entry_point]):
+        app = create_app(APP_WARMUP_BACKGROUND=True)
+    app._warmup._thread.join()
+    ref = weakref.ref(app)
+    del app
+    gc.collect()
+    assert ref() is None
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 #
 # This file is part of Invenio.
-# Copyright (C) 2015-2018 CERN.
+# Copyright (C) 2015-2026 CERN.
 # Copyright (C) 2024 Graz University of Technology.
 #
 # Invenio is free software; you can redistribute it and/or modify it
@@ -10,11 +10,37 @@
 """Test wsgi application."""
 
 import json
+import threading
 
 import pytest
 from flask import Flask, jsonify, request
 
-from invenio_base.wsgi import create_wsgi_factory, wsgi_proxyfix
+from invenio_base.app import create_app_factory
+from invenio_base.wsgi import (
+    LazyMount,
+    PrefixDispatcherMiddleware,
+    ProxyFixDispatcherMiddleware,
+    create_wsgi_factory,
+    wsgi_proxyfix,
+)
+from invenio_base.wsgi.proxyfix import get_real_value
+
+try:
+    from werkzeug.middleware.dispatcher import DispatcherMiddleware
+    from werkzeug.middleware.proxy_fix import ProxyFix
+except ImportError:
+    from werkzeug.contrib.fixers import ProxyFix
+    from werkzeug.wsgi import DispatcherMiddleware
+
+
+def _echo_app(name):
+    """Create WSGI application returning its name and the dispatched paths."""
+
+    def app(environ, start_response):
+        start_response("200 OK", [])
+        return [name, environ["SCRIPT_NAME"], environ["PATH_INFO"]]
+
+    return app
 
 
 def test_create_wsgi_factory():
@@ -42,6 +68,209 @@ def test_create_wsgi_factory():
         assert b"api" in client.get("/api/").data
 
 
+def test_create_wsgi_factory_concurrent():
+    """Test mounted applications are built in a thread pool."""
+    threads = {}
+
+    def factory(name):
+        def create(**kwargs):
+            threads[name] = threading.current_thread()
+            return _echo_app(name.encode())
+
+        return create
+
+    factory = create_wsgi_factory(
+        {"/api": factory("api"), "/other": factory("other")}, concurrent=True
+    )
+    wsgi = factory(Flask("app"))
+
+    assert threading.current_thread() not in threads.values()
+    environ = {"PATH_INFO": "/other/x"}
+    assert wsgi(environ, lambda *args: None) == [b"other", "/other", "/x"]
+
+
+def test_create_wsgi_factory_concurrent_with_app():
+    """Test mounted applications are built while the main app is loaded."""
+    app_loading = threading.Event()
+
+    def create_api(**kwargs):
+        # Fails (deadlocks) if the API app is built after the main app.
+        assert app_loading.wait(timeout=5)
+        return _echo_app(b"api")
+
+    def extension(app):
+        app_loading.set()
+
+    create_app = create_app_factory(
+        "test",
+        extensions=[extension],
+        wsgi_factory=wsgi_proxyfix(
+            create_wsgi_factory({"/api": create_api}, concurrent=True)
+        ),
+    )
+    app = create_app()
+
+    environ = {"PATH_INFO": "/api/x"}
+    assert app.wsgi_app(environ, lambda *args: None) == [b"api", "/api", "/x"]
+
+
+def test_create_wsgi_factory_concurrent_errors():
+    """Test errors are raised in the order of the mount points."""
+    slow_failure = threading.Event()
+
+    def create_first(**kwargs):
+        slow_failure.wait(timeout=5)
+        raise KeyError("first")
+
+    def create_second(**kwargs):
+        slow_failure.set()
+        raise ValueError("second")
+
+    factory = create_wsgi_factory(
+        {"/first": create_first, "/second": create_second}, concurrent=True
+    )
+    with pytest.raises(KeyError):
+        factory(Flask("app"))
+
+
+def test_create_wsgi_factory_lazy_mounts():
+    """Test lazy mounts are built on the first request to their prefix."""
+    calls = []
+
+    def create_admin(**kwargs):
+        calls.append(kwargs)
+        return _echo_app(b"admin")
+
+    factory = create_wsgi_factory(
+        {"/api": lambda **kwargs: _echo_app(b"api"), "/admin": create_admin},
+        lazy_mounts=["/admin"],
+    )
+    wsgi = factory(Flask("app"), debug=True)
+    assert wsgi.built == {"/api": True, "/admin": False}
+
+    environ = {"PATH_INFO": "/api/x"}
+    assert wsgi(environ, lambda *args: None) == [b"api", "/api", "/x"]
+    assert not calls
+
+    for i in range(2):
+        environ = {"PATH_INFO": "/admin/x"}
+        assert wsgi(environ, lambda *args: None) == [b"admin", "/admin", "/x"]
+    assert calls == [{"debug": True}]
+    assert wsgi.built == {"/api": True, "/admin": True}
+
+
+def test_lazy_mount_thread_safety():
+    """Test the factory of a lazy mount is called once."""
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def create(**kwargs):
+        calls.append(1)
+        return _echo_app(b"lazy")
+
+    mount = LazyMount(create)
+
+    def request():
+        barrier.wait()
+        mount({"SCRIPT_NAME": "", "PATH_INFO": ""}, lambda *args: None)
+
+    threads = [threading.Thread(target=request) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == [1]
+
+
+def test_lazy_mount_failure():
+    """Test a failed build is retried on the next request."""
+    outcomes = [ValueError("boom"), _echo_app(b"lazy")]
+
+    def create(**kwargs):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    mount = LazyMount(create)
+    environ = {"SCRIPT_NAME": "", "PATH_INFO": ""}
+    with pytest.raises(ValueError):
+        mount(environ, lambda *args: None)
+    assert not mount.built
+    assert mount(environ, lambda *args: None)[0] == b"lazy"
+    assert mount.built
+
+
+def test_lazy_mounts_background_build():
+    """Test lazy mounts are built in the background after the first request."""
+    wsgi = PrefixDispatcherMiddleware(
+        _echo_app(b"default"),
+        {"/admin": LazyMount(lambda: _echo_app(b"admin"))},
+        background_build=True,
+    )
+    assert wsgi.built == {"/admin": False}
+
+    environ = {"PATH_INFO": "/other"}
+    wsgi(environ, lambda *args: None)
+    wsgi._background_thread.join(timeout=5)
+    assert wsgi.built == {"/admin": True}
+    assert wsgi.start_background_build() is None
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "",
+        "/",
+        "/api",
+        "/api/",
+        "/api/records/1",
+        "/apis",
+        "/api/v2",
+        "/api/v2/",
+        "/api/v2/x/y",
+        "/api//x",
+        "/api/v2x",
+        "/trailing/",
+        "/trailing",
+        "/trailing//x",
+        "/trailing/x",
+        "//api",
+        "noslash",
+        "noslash/x",
+        "/a/b/c/d/e/f",
+    ],
+)
+def test_prefix_dispatcher_werkzeug_parity(path):
+    """Test prefix dispatcher behaves exactly like DispatcherMiddleware."""
+    mounts = {
+        "/api": _echo_app("api"),
+        "/api/v2": _echo_app("v2"),
+        "/trailing/": _echo_app("trailing"),
+        "noslash": _echo_app("noslash"),
+    }
+    default = _echo_app("default")
+
+    def call(middleware):
+        environ = {"PATH_INFO": path, "SCRIPT_NAME": "/root"}
+        return middleware(environ, lambda *args: None)
+
+    assert call(PrefixDispatcherMiddleware(default, mounts)) == call(
+        DispatcherMiddleware(default, mounts)
+    )
+
+
+def test_prefix_dispatcher_empty_mount():
+    """Test the empty mount point replaces the default application."""
+    dispatcher = PrefixDispatcherMiddleware(
+        _echo_app("default"), {"": _echo_app("empty"), "/api": _echo_app("api")}
+    )
+    environ = {"PATH_INFO": "/x/y"}
+    assert dispatcher(environ, lambda *args: None) == ["empty", "", "/x/y"]
+    environ = {"PATH_INFO": "/api/y"}
+    assert dispatcher(environ, lambda *args: None) == ["api", "/api", "/y"]
+
+
 @pytest.mark.parametrize("proxies,data", [(2, b"4.3.2.1"), (None, b"1.2.3.4")])
 def test_proxyfix_wsgi_proxies(proxies, data):
     """Test wsgi factory creation."""
@@ -123,3 +352,92 @@ def test_proxyfix_wsgi_config(num_proxies, proxy_config):
         }
         res = client.get("/", headers=h, environ_base=e)
         assert json.loads(res.get_data(as_text=True)) == data[num_proxies]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "",
+        "1.2.3.4",
+        "1.2.3.4, 5.6.7.8",
+        "1.2.3.4,,5.6.7.8 ,\t9.9.9.9",
+        ' "quoted, value" , 5.6.7.8',
+        '1.2.3.4, "unclosed',
+    ],
+)
+@pytest.mark.parametrize("trusted", [1, 2, 3])
+def test_get_real_value(trusted, value):
+    """Test proxy header parsing is the same as Werkzeug's."""
+    expected = ProxyFix(None)._get_real_value(trusted, value)
+    assert get_real_value(trusted, value) == expected
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {},
+        {"HTTP_X_FORWARDED_FOR": "5.6.7.8, 4.3.2.1"},
+        {"HTTP_X_FORWARDED_PROTO": "https"},
+        {"HTTP_X_FORWARDED_HOST": "host.external:8443"},
+        {"HTTP_X_FORWARDED_HOST": "[::1]", "HTTP_X_FORWARDED_PORT": "8443"},
+        {"HTTP_X_FORWARDED_PORT": "443"},
+        {"HTTP_X_FORWARDED_PREFIX": "/prefix", "PATH_INFO": "/api/x"},
+        {
+            "HTTP_X_FORWARDED_FOR": "1.1.1.1, 5.6.7.8",
+            "HTTP_X_FORWARDED_PROTO": "http, https",
+            "HTTP_X_FORWARDED_HOST": "a.external, b.external",
+            "HTTP_X_FORWARDED_PORT": "80, 443",
+            "HTTP_X_FORWARDED_PREFIX": "/a, /b",
+        },
+    ],
+)
+@pytest.mark.parametrize(
+    "config",
+    [
+        {},
+        {"x_for": 1, "x_proto": 1, "x_host": 1, "x_port": 1, "x_prefix": 1},
+        {"x_for": 2, "x_proto": 0, "x_host": 2, "x_port": 2, "x_prefix": 2},
+    ],
+)
+def test_proxyfix_dispatcher_werkzeug_parity(config, headers):
+    """Test the combined middleware is the same as ProxyFix and dispatching."""
+    mounts = {"/api": _echo_app("api")}
+
+    def call(middleware):
+        environ = {
+            "REMOTE_ADDR": "1.2.3.4",
+            "wsgi.url_scheme": "http",
+            "HTTP_HOST": "localhost",
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+            "SCRIPT_NAME": "",
+            "PATH_INFO": "/api/records",
+        }
+        environ.update(headers)
+        result = middleware(environ, lambda *args: None)
+        return result, environ
+
+    default = _echo_app("default")
+    assert call(ProxyFixDispatcherMiddleware(default, mounts, **config)) == call(
+        ProxyFix(PrefixDispatcherMiddleware(default, mounts), **config)
+    )
+
+
+def test_proxyfix_wsgi_dispatcher():
+    """Test proxy fix and dispatching are combined in one middleware."""
+    app = Flask("app")
+    app.config["PROXYFIX_CONFIG"] = {"x_for": 1, "x_prefix": 1}
+    factory = wsgi_proxyfix(
+        create_wsgi_factory({"/api": lambda **kwargs: _echo_app(b"api")})
+    )
+    wsgi = factory(app)
+    assert isinstance(wsgi, ProxyFixDispatcherMiddleware)
+
+    environ = {
+        "REMOTE_ADDR": "1.2.3.4",
+        "PATH_INFO": "/api/x",
+        "HTTP_X_FORWARDED_FOR": "5.6.7.8",
+        "HTTP_X_FORWARDED_PREFIX": "/prefix",
+    }
+    assert wsgi(environ, lambda *args: None) == [b"api", "/prefix/api", "/x"]
+    assert environ["REMOTE_ADDR"] == "5.6.7.8"
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the sampled allocation tracking."""
+
+import os
+import tracemalloc
+
+import pytest
+from flask import Flask
+
+from invenio_base.cli import instance
+from invenio_base.wsgi import AllocationTrackerMiddleware, wsgi_allocations
+from invenio_base.wsgi.allocations import format_report, merge_reports
+
+_retained = []
+
+
+@pytest.fixture()
+def app(tmppath):
+    """Flask application."""
+    app = Flask("app", instance_path=tmppath)
+
+    @app.route("/allocate")
+    def allocate():
+        _retained.append([bytearray(1024) for _ in range(100)])
+        return "allocate"
+
+    @app.route("/noop")
+    def noop():
+        return "noop"
+
+    yield app
+    _retained.clear()
+
+
+def test_allocation_tracker(app, tmppath):
+    """Test allocations of sampled requests are accounted per endpoint."""
+    directory = os.path.join(tmppath, "allocations")
+    tracker = AllocationTrackerMiddleware(app.wsgi_app, directory, sample_rate=2)
+    app.wsgi_app = tracker
+    client = app.test_client()
+
+    for path in ["/allocate", "/allocate", "/noop", "/noop"]:
+        assert client.get(path, buffered=True).status_code == 200
+    assert not tracemalloc.is_tracing()
+    assert set(tracker.report) == {"allocate", "noop"}
+    entry = tracker.report["allocate"]
+    assert entry["requests"] == 1
+    assert entry["peak"] >= 100 * 1024
+    traceback, (size, count) = max(entry["tracebacks"].items(), key=lambda i: i[1][0])
+    assert "test_wsgi_allocations.py" in traceback
+    assert size >= 100 * 1024
+    assert count >= 100
+
+    # The report of the process is written to the directory.
+    report = merge_reports(directory)
+    assert report == tracker.report
+    formatted = format_report(report, top=1)
+    assert formatted.startswith("allocate: 1 requests")
+    assert "test_wsgi_allocations.py" in formatted
+
+
+def test_allocation_tracker_already_tracing(app, tmppath):
+    """Test requests are not sampled while tracemalloc is already tracing."""
+    tracker = AllocationTrackerMiddleware(app.wsgi_app, tmppath, sample_rate=1)
+    app.wsgi_app = tracker
+    tracemalloc.start()
+    try:
+        app.test_client().get("/allocate", buffered=True)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    assert tracker.report == {}
+
+
+def test_merge_reports(tmppath):
+    """Test the reports of several processes are merged."""
+    assert merge_reports(os.path.join(tmppath, "missing")) == {}
+    tracker = AllocationTrackerMiddleware(None, tmppath)
+    for name, size in [("1.json", 10), ("2.json", 20)]:
+        with open(os.path.join(tmppath, name), "w") as f:
+            f.write(
+                '{"e": {"requests": 1, "peak": 5, '
+                f'"tracebacks": {{"a": [{size}, 1], "b": [1, 1]}}}}}}'
+            )
+    assert merge_reports(tracker.directory) == {
+        "e": {"requests": 2, "peak": 10, "tracebacks": {"a": [30, 2], "b": [2, 2]}}
+    }
+    assert merge_reports(tracker.directory, keep=1) == {
+        "e": {"requests": 2, "peak": 10, "tracebacks": {"a": [30, 2]}}
+    }
+
+
+def test_wsgi_allocations(app, tmppath):
+    """Test the tracker is installed if enabled and reports are printed."""
+    wsgi_app = app.wsgi_app
+    assert wsgi_allocations()(app) == wsgi_app
+
+    app.config.update(WSGI_ALLOCATIONS=True, WSGI_ALLOCATIONS_SAMPLE_RATE=1)
+    app.wsgi_app = wsgi_allocations()(app)
+    assert isinstance(app.wsgi_app, AllocationTrackerMiddleware)
+    assert app.wsgi_app.app == wsgi_app
+    assert app.wsgi_app.directory == os.path.join(tmppath, "allocations")
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(instance, ["allocations"])
+    assert result.exit_code == 1
+    assert "No allocations found." in result.output
+
+    app.test_client().get("/allocate", buffered=True)
+    result = runner.invoke(instance, ["allocations", "--top", "1"])
+    assert result.exit_code == 0
+    assert result.output.startswith("allocate: 1 requests")
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the ASGI adapter."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from flask import Flask, Response, request
+
+from invenio_base.wsgi import ASGIAdapter, create_wsgi_factory
+from invenio_base.wsgi.asgi import build_environ
+
+
+def scope(path="/", method="GET", headers=(), query_string=b"", root_path=""):
+    """Create a HTTP scope."""
+    return {
+        "type": "http",
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "https",
+        "path": path,
+        "root_path": root_path,
+        "query_string": query_string,
+        "headers": list(headers),
+        "server": ("example.org", 443),
+        "client": ("10.0.0.1", 1234),
+    }
+
+
+async def call(asgi, scope, chunks=(b"",)):
+    """Call the adapter with a request body sent in chunks."""
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await asgi(scope, receive, send)
+    return sent
+
+
+def body(messages):
+    """Get the response body of the sent messages."""
+    return b"".join(m.get("body", b"") for m in messages[1:])
+
+
+@pytest.fixture()
+def app():
+    """Flask application."""
+    app = Flask("app")
+
+    @app.route("/", methods=["GET", "POST"])
+    def index():
+        return {
+            "method": request.method,
+            "url": request.url,
+            "remote_addr": request.remote_addr,
+            "args": request.args,
+        }
+
+    @app.route("/upload", methods=["POST"])
+    def upload():
+        sizes = []
+        while True:
+            data = request.stream.read(4)
+            if not data:
+                break
+            sizes.append(len(data))
+        return {"sizes": sizes}
+
+    @app.route("/stream")
+    def stream():
+        return Response(f"{i}\n" for i in range(3))
+
+    @app.route("/error")
+    def error():
+        raise RuntimeError()
+
+    return app
+
+
+def test_asgi(app):
+    """Test requests are handled by the WSGI stack."""
+    api = Flask("api")
+    api.add_url_rule("/", "api", lambda: request.script_root)
+    app.config["TESTING"] = True
+    app.wsgi_app = create_wsgi_factory({"/api": lambda **kwargs: api})(app)
+    asgi = ASGIAdapter(app, max_workers=2)
+
+    sent = asyncio.run(call(asgi, scope("/", query_string=b"q=a")))
+    assert sent[0]["status"] == 200
+    assert (b"content-type", b"application/json") in sent[0]["headers"]
+    assert sent[-1]["more_body"] is False
+    assert body(sent) == (
+        b'{"args":{"q":"a"},"method":"GET","remote_addr":"10.0.0.1",'
+        b'"url":"https://example.org/?q=a"}\n'
+    )
+
+    sent = asyncio.run(call(asgi, scope("/api/")))
+    assert body(sent) == b"/api"
+
+
+def test_asgi_streaming(app):
+    """Test request and response bodies are streamed."""
+    asgi = ASGIAdapter(app)
+    sent = asyncio.run(
+        call(
+            asgi,
+            scope("/upload", method="POST", headers=[(b"content-length", b"10")]),
+            [b"abcdef", b"", b"ghij"],
+        )
+    )
+    assert body(sent) == b'{"sizes":[4,4,2]}\n'
+
+    sent = asyncio.run(call(asgi, scope("/stream")))
+    assert [m.get("body") for m in sent[1:]] == [b"0\n", b"1\n", b"2\n", b""]
+    assert [m.get("more_body") for m in sent[1:]] == [True, True, True, False]
+
+
+def test_asgi_backpressure(app):
+    """Test requests over the queue limit are rejected."""
+    release = threading.Event()
+    started = threading.Event()
+
+    @app.route("/slow")
+    def slow():
+        started.set()
+        release.wait(5)
+        return "slow"
+
+    asgi = ASGIAdapter(app, max_workers=1, max_queue=1)
+
+    async def run():
+        first = asyncio.ensure_future(call(asgi, scope("/slow")))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(call(asgi, scope("/")))
+        await asyncio.sleep(0.01)
+        assert asgi.waiting == 1
+        rejected = await call(asgi, scope("/"))
+        release.set()
+        return await first, await second, rejected
+
+    first, second, rejected = asyncio.run(run())
+    assert body(first) == b"slow"
+    assert second[0]["status"] == 200
+    assert rejected[0]["status"] == 503
+    assert (b"retry-after", b"1") in rejected[0]["headers"]
+
+
+def test_asgi_error(app):
+    """Test errors before the response are answered with 500."""
+
+    def broken(environ, start_response):
+        raise RuntimeError()
+
+    sent = asyncio.run(call(ASGIAdapter(broken), scope()))
+    assert sent[0]["status"] == 500
+    assert body(sent) == b"500 Internal Server Error"
+
+    sent = asyncio.run(call(ASGIAdapter(app), scope("/error")))
+    assert sent[0]["status"] == 500
+
+
+def test_asgi_lifespan(app):
+    """Test the lifespan protocol and unsupported scopes."""
+    asgi = ASGIAdapter(app)
+    asyncio.run(call(asgi, scope()))
+    assert asgi._executor is not None
+
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi({"type": "lifespan"}, receive, send))
+    assert sent == [
+        {"type": "lifespan.startup.complete"},
+        {"type": "lifespan.shutdown.complete"},
+    ]
+    assert asgi._executor is None
+
+    with pytest.raises(ValueError):
+        asyncio.run(asgi({"type": "websocket"}, receive, send))
+
+
+def test_asgi_lifespan_shutdown_in_flight(app):
+    """Test the shutdown waits for requests in flight without blocking."""
+    started = threading.Event()
+
+    @app.route("/slow-stream")
+    def slow_stream():
+        def generate():
+            started.set()
+            for chunk in (b"a", b"b", b"c"):
+                time.sleep(0.05)
+                yield chunk
+
+        return Response(generate())
+
+    asgi = ASGIAdapter(app)
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        # The server cancels the request, e.g. after a graceful timeout.
+        request = asyncio.ensure_future(asgi(scope("/slow-stream"), call_receive, send))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        request.cancel()
+        messages = [{"type": "lifespan.shutdown"}]
+
+        async def receive():
+            return messages.pop(0)
+
+        await asgi({"type": "lifespan"}, receive, send)
+
+    async def call_receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    thread = threading.Thread(target=asyncio.run, args=(run(),), daemon=True)
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive()
+    assert body(sent[:-1]) == b"abc"
+    assert sent[-1] == {"type": "lifespan.shutdown.complete"}
+    assert asgi._executor is None
+
+
+def test_build_environ():
+    """Test the WSGI environ of an ASGI scope."""
+    environ = build_environ(
+        scope(
+            "/root/café",
+            root_path="/root",
+            headers=[
+                (b"content-type", b"text/plain"),
+                (b"cookie", b"a=1"),
+                (b"cookie", b"b=2"),
+                (b"accept", b"text/html"),
+                (b"accept", b"application/json"),
+            ],
+        ),
+        None,
+    )
+    assert environ["SCRIPT_NAME"] == "/root"
+    assert environ["PATH_INFO"] == "/cafÃ©"
+    assert environ["CONTENT_TYPE"] == "text/plain"
+    assert environ["HTTP_COOKIE"] == "a=1; b=2"
+    assert environ["HTTP_ACCEPT"] == "text/html,application/json"
+    assert environ["SERVER_PORT"] == "443"
+    assert environ["wsgi.url_scheme"] == "https"
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the gzip compression middleware."""
+
+import gzip
+import os
+
+import pytest
+from flask import Flask, Response, jsonify, send_from_directory, stream_with_context
+
+from invenio_base.wsgi import GzipMiddleware, wsgi_gzip
+from invenio_base.wsgi.compression import accepts_gzip
+
+BODY = {"hits": ["record"] * 200}
+
+
+@pytest.fixture()
+def app():
+    """Flask application."""
+    app = Flask("app")
+
+    @app.route("/json")
+    def json():
+        response = jsonify(BODY)
+        response.set_etag("abc")
+        return response
+
+    @app.route("/small")
+    def small():
+        return jsonify({})
+
+    @app.route("/image")
+    def image():
+        return Response(b"x" * 1000, mimetype="image/png")
+
+    @app.route("/encoded")
+    def encoded():
+        return Response(b"x" * 1000, headers={"Content-Encoding": "br"})
+
+    @app.route("/stream")
+    def stream():
+        def generate():
+            for i in range(100):
+                yield f"line {i}\n" * 10
+
+        return Response(stream_with_context(generate()), mimetype="text/csv")
+
+    app.wsgi_app = GzipMiddleware(app.wsgi_app, min_size=100)
+    return app
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (None, False),
+        ("", False),
+        ("br", False),
+        ("gzip", True),
+        ("deflate, gzip;q=0.5", True),
+        ("gzip;q=0", False),
+        ("*", True),
+    ],
+)
+def test_accepts_gzip(value, expected):
+    """Test parsing of the Accept-Encoding header."""
+    assert accepts_gzip(value) == expected
+
+
+def test_gzip(app):
+    """Test responses are compressed when accepted."""
+    client = app.test_client()
+    response = client.get("/json", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] == 'W/"abc"'
+    assert "Content-Length" not in response.headers
+    assert gzip.decompress(response.data) == app.test_client().get("/json").data
+
+    # Not accepted.
+    response = client.get("/json")
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] == '"abc"'
+    assert response.json == BODY
+
+    # HEAD requests are not changed.
+    response = client.head("/json", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert response.data == b""
+
+
+@pytest.mark.parametrize("path", ["/small", "/image", "/encoded"])
+def test_gzip_skipped(app, path):
+    """Test small, non allowed and encoded responses are not compressed."""
+    response = app.test_client().get(path, headers={"Accept-Encoding": "gzip"})
+    assert response.headers.get("Content-Encoding") != "gzip"
+    assert "Vary" not in response.headers
+
+
+def test_gzip_stream(app):
+    """Test streamed responses are compressed incrementally."""
+    response = app.test_client().get(
+        "/stream", headers={"Accept-Encoding": "gzip"}, buffered=True
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    expected = "".join(f"line {i}\n" * 10 for i in range(100))
+    assert gzip.decompress(response.data).decode() == expected
+
+
+def test_gzip_ranges(app, tmppath):
+    """Test compressed responses do not accept ranges."""
+    with open(os.path.join(tmppath, "app.js"), "w") as f:
+        f.write("var x = 1;\n" * 100)
+
+    @app.route("/files/<path:filename>")
+    def files(filename):
+        return send_from_directory(tmppath, filename)
+
+    client = app.test_client()
+    response = client.get("/files/app.js")
+    assert response.headers["Accept-Ranges"] == "bytes"
+
+    response = client.get("/files/app.js", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Ranges" not in response.headers
+    assert gzip.decompress(response.data) == b"var x = 1;\n" * 100
+
+    # Partial responses are not compressed.
+    response = client.get(
+        "/files/app.js", headers={"Accept-Encoding": "gzip", "Range": "bytes=0-3"}
+    )
+    assert response.status_code == 206
+    assert "Content-Encoding" not in response.headers
+    assert response.data == b"var "
+
+
+def test_gzip_wsgi_apps():
+    """Test applications returning lists or using ``write``."""
+
+    def list_app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [b"a" * 600, b"a" * 400]
+
+    def lazy_app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        yield b"a" * 1000
+
+    def write_app(environ, start_response):
+        write = start_response("200 OK", [("Content-Type", "text/plain")])
+        write(b"a" * 500)
+        return [b"a" * 500]
+
+    for wsgi_app in (list_app, lazy_app, write_app):
+        sent = []
+        body = []
+
+        def start_response(status, headers, exc_info=None):
+            sent.append(dict(headers))
+            return body.append
+
+        app_iter = GzipMiddleware(wsgi_app)(
+            {"REQUEST_METHOD": "GET", "HTTP_ACCEPT_ENCODING": "gzip"},
+            start_response,
+        )
+        body.extend(app_iter)
+        if hasattr(app_iter, "close"):
+            app_iter.close()
+        assert sent[0]["Content-Encoding"] == "gzip"
+        assert gzip.decompress(b"".join(body)) == b"a" * 1000
+        if wsgi_app is list_app:
+            # The whole body is compressed at once.
+            assert sent[0]["Content-Length"] == str(len(body[0]))
+
+
+def test_wsgi_gzip(app):
+    """Test the middleware is only installed if enabled."""
+    wsgi_app = app.wsgi_app
+    assert wsgi_gzip()(app) == wsgi_app
+
+    app.config.update(WSGI_GZIP=True, WSGI_GZIP_LEVEL=9, WSGI_GZIP_MIMETYPES=["a/b"])
+    middleware = wsgi_gzip()(app)
+    assert isinstance(middleware, GzipMiddleware)
+    assert middleware.app == wsgi_app
+    assert middleware.level == 9
+    assert middleware.min_size == 500
+    assert middleware.mimetypes == {"a/b"}
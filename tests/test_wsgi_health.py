@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the health check middleware."""
+
+from unittest.mock import patch
+
+import pytest
+from flask import Flask, current_app
+from importlib_metadata import EntryPoint
+
+from invenio_base.wsgi import HealthCheckMiddleware, wsgi_health
+
+
+def db_check(app):
+    """Readiness check registered with an entry point."""
+    assert current_app._get_current_object() is app
+    return app.config.get("DB_READY", True)
+
+
+@pytest.fixture()
+def app():
+    """Flask application."""
+    app = Flask("app")
+
+    @app.before_request
+    def entered():
+        app.config["ENTERED"] = True
+
+    return app
+
+
+def test_health_checks(app):
+    """Test the probes are answered without entering Flask."""
+    calls = []
+
+    def check():
+        calls.append(1)
+        return len(calls) < 2
+
+    middleware = HealthCheckMiddleware(app.wsgi_app, checks={"check": check}, ttl=60)
+    app.wsgi_app = middleware
+    client = app.test_client()
+
+    response = client.get("/ping")
+    assert response.status_code == 200
+    assert response.json == {"status": "ok"}
+    assert response.headers["Cache-Control"] == "no-store"
+
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json == {"status": "ok", "checks": {"check": "ok"}}
+    # Cached.
+    assert client.get("/ready").status_code == 200
+    assert client.head("/ready").data == b""
+    assert calls == [1]
+    assert "ENTERED" not in app.config
+
+    # Expired.
+    middleware._expires = 0
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json == {"status": "failed", "checks": {"check": "failed"}}
+    assert calls == [1, 1]
+
+    assert client.get("/other").status_code == 404
+    assert app.config["ENTERED"]
+
+
+def test_health_checks_errors(app, caplog):
+    """Test checks raising exceptions fail."""
+
+    def broken():
+        raise RuntimeError("broken")
+
+    middleware = HealthCheckMiddleware(
+        app.wsgi_app, checks={"broken": broken}, liveness_path=None, ttl=0
+    )
+    assert middleware.readiness() == {"broken": "failed"}
+    assert "Readiness check broken failed." in caplog.text
+
+    # Expired results are used while another thread refreshes them.
+    with middleware._lock:
+        assert middleware.readiness() == {"broken": "failed"}
+
+    app.wsgi_app = middleware
+    assert app.test_client().get("/ping").status_code == 404
+
+
+def test_wsgi_health(app):
+    """Test the middleware is installed with the registered checks."""
+    wsgi_app = app.wsgi_app
+    assert wsgi_health()(app) == wsgi_app
+
+    entry_points = [
+        EntryPoint("db", "test_wsgi_health:db_check", "invenio_base.readiness_checks")
+    ]
+    app.config.update(
+        WSGI_HEALTH=True,
+        WSGI_HEALTH_READINESS_PATH="/health/ready",
+        WSGI_HEALTH_TTL=0,
+        WSGI_HEALTH_CHECKS={"custom": lambda app: True},
+    )
+    with patch("invenio_base.wsgi.entry_points", return_value=entry_points):
+        middleware = wsgi_health()(app)
+    assert isinstance(middleware, HealthCheckMiddleware)
+    assert middleware.app == wsgi_app
+    assert middleware.readiness_path == "/health/ready"
+    assert middleware.readiness() == {"db": "ok", "custom": "ok"}
+
+    app.config["DB_READY"] = False
+    assert middleware.readiness() == {"db": "failed", "custom": "ok"}
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the worker memory watchdog."""
+
+import logging
+import signal
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+
+from invenio_base.wsgi import MemoryWatchdogMiddleware, wsgi_memory_watchdog
+
+
+@pytest.fixture()
+def app():
+    """Flask application."""
+    app = Flask("app")
+
+    @app.route("/grow")
+    def grow():
+        return "grow"
+
+    @app.route("/stable")
+    def stable():
+        return "stable"
+
+    return app
+
+
+def test_memory_watchdog(app, caplog):
+    """Test memory growth is accounted per endpoint and the worker recycled."""
+    recycled = []
+    watchdog = MemoryWatchdogMiddleware(
+        app.wsgi_app, limit=2500, every=2, recycle=lambda: recycled.append(1)
+    )
+    app.wsgi_app = watchdog
+    client = app.test_client()
+
+    # RSS before and after each sampled request.
+    rss = iter([1000, 1000, 1000, 2000, 2000, 3000, 3000, 4000])
+    with patch("invenio_base.wsgi.memory.get_rss", lambda: next(rss)):
+        for path in ["/stable", "/stable", "/stable", "/grow"]:
+            client.get(path, buffered=True)
+        assert watchdog.report() == [("grow", 1000, 1), ("stable", 0, 1)]
+        assert not recycled
+
+        with caplog.at_level(logging.WARNING, logger="invenio_base.wsgi.memory"):
+            for path in ["/grow"] * 4:
+                client.get(path, buffered=True)
+
+    assert watchdog.report() == [("grow", 3000, 3), ("stable", 0, 1)]
+    # Recycled only once.
+    assert recycled == [1]
+    assert len(caplog.records) == 1
+    assert "grow: +0.0 MiB (2 requests)" in caplog.records[0].getMessage()
+
+
+def test_memory_watchdog_unsupported(app):
+    """Test nothing is sampled if the RSS is not available."""
+    watchdog = MemoryWatchdogMiddleware(app.wsgi_app, limit=1, every=1)
+    app.wsgi_app = watchdog
+    with patch("invenio_base.wsgi.memory.get_rss", lambda: 0):
+        assert app.test_client().get("/grow", buffered=True).data == b"grow"
+    assert watchdog.report() == []
+
+
+def test_wsgi_memory_watchdog(app):
+    """Test the watchdog is only installed when a limit is set."""
+    wsgi_app = app.wsgi_app
+    assert wsgi_memory_watchdog()(app) == wsgi_app
+
+    app.config.update(WSGI_MEMORY_LIMIT=2**30, WSGI_MEMORY_RECYCLE_SIGNAL="SIGHUP")
+    middleware = wsgi_memory_watchdog()(app)
+    assert isinstance(middleware, MemoryWatchdogMiddleware)
+    with patch("os.kill") as kill:
+        middleware.recycle()
+    assert kill.call_args[0][1] == signal.SIGHUP
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test request latency metrics."""
+
+import itertools
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+from werkzeug.test import Client
+from werkzeug.wsgi import FileWrapper
+
+from invenio_base.wsgi import (
+    MetricsMiddleware,
+    MetricsRegistry,
+    create_wsgi_factory,
+    multiprocess,
+    wsgi_metrics,
+)
+from invenio_base.wsgi.metrics import render_histograms
+from invenio_base.wsgi.multiprocess import MmapMetricsRegistry
+
+
+@pytest.fixture()
+def app():
+    """Flask application with an API application mounted on ``/api``."""
+    api = Flask("api")
+
+    @api.route("/records")
+    def records():
+        return "records"
+
+    app = Flask("app")
+    app.config["WSGI_METRICS_BUCKETS"] = (0.1, 1)
+
+    @app.route("/")
+    def index():
+        return "index"
+
+    @app.route("/stream")
+    def stream():
+        return (c for c in "abc")
+
+    @app.route("/error")
+    def error():
+        raise ValueError()
+
+    app.wsgi_app = wsgi_metrics(create_wsgi_factory({"/api": lambda: api}))(app)
+    return app
+
+
+def test_registry_threads():
+    """Test histograms of all threads are merged."""
+    registry = MetricsRegistry(buckets=(1, 2))
+
+    def observe():
+        for value in (0.5, 1, 1.5, 3):
+            registry.observe(("a",), value)
+
+    threads = [threading.Thread(target=observe) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    registry.observe(("b",), 0.1)
+
+    assert registry.collect() == {("a",): [8, 4, 4, 24.0], ("b",): [1, 0, 0, 0.1]}
+
+
+def test_registry_finished_threads(tmppath):
+    """Test the storages of finished threads do not accumulate."""
+    registry = MetricsRegistry(buckets=(1,))
+    mmap_registry = MmapMetricsRegistry(os.path.join(tmppath, "metrics"), (1,))
+
+    def observe():
+        registry.observe(("a",), 0.5)
+        mmap_registry.observe(("a",), 0.5)
+
+    for i in range(50):
+        thread = threading.Thread(target=observe)
+        thread.start()
+        thread.join()
+
+    assert registry.collect() == {("a",): [50, 0, 25.0]}
+    assert len(registry._stores) <= 1
+    assert mmap_registry.collect() == {("a",): [50, 0, 25.0]}
+    assert len(mmap_registry._stores) == 1
+    assert len(mmap_registry._file.offsets()) == 1
+
+
+def test_render_histograms():
+    """Test the Prometheus text exposition format."""
+    text = render_histograms(
+        "duration", ("path",), (0.5,), {('a"\\\n',): [1, 2, 3.5]}, help_text="Help."
+    )
+    assert text == (
+        "# HELP duration Help.\n"
+        "# TYPE duration histogram\n"
+        'duration_bucket{path="a\\"\\\\\\n",le="0.5"} 1\n'
+        'duration_bucket{path="a\\"\\\\\\n",le="+Inf"} 3\n'
+        'duration_sum{path="a\\"\\\\\\n"} 3.5\n'
+        'duration_count{path="a\\"\\\\\\n"} 3\n'
+    )
+
+
+def test_metrics_middleware(app):
+    """Test requests are recorded per mount, endpoint and status class."""
+    client = app.test_client()
+    assert client.get("/", buffered=True).status_code == 200
+    assert client.get("/", buffered=True).status_code == 200
+    assert client.get("/api/records", buffered=True).status_code == 200
+    assert client.get("/missing", buffered=True).status_code == 404
+    assert client.get("/stream", buffered=True).data == b"abc"
+    assert client.get("/error", buffered=True).status_code == 500
+
+    histograms = app.wsgi_app.registry.collect()
+    assert {labels: sum(hist[:-1]) for labels, hist in histograms.items()} == {
+        ("", "index", "2xx"): 2,
+        ("/api", "records", "2xx"): 1,
+        ("", "", "4xx"): 1,
+        ("", "stream", "2xx"): 1,
+        ("", "error", "5xx"): 1,
+    }
+
+    res = client.get("/metrics")
+    assert res.content_type == MetricsMiddleware.content_type
+    text = res.get_data(as_text=True)
+    assert "# TYPE invenio_http_request_duration_seconds histogram" in text
+    assert (
+        'invenio_http_request_duration_seconds_count{mount="",endpoint="index",'
+        'status="2xx"} 2'
+    ) in text
+    assert 'le="0.1"' in text and 'le="1.0"' in text
+
+
+def test_metrics_middleware_exception():
+    """Test requests raising an exception are recorded as server errors."""
+
+    def failing(environ, start_response):
+        raise KeyError()
+
+    middleware = MetricsMiddleware(failing, path=None)
+    with pytest.raises(KeyError):
+        Client(middleware).get("/metrics")
+    assert list(middleware.registry.collect()) == [("", "", "5xx")]
+
+
+def test_metrics_middleware_file_wrapper(tmppath):
+    """Test file wrappers are passed to the server, e.g. to use sendfile."""
+    path = os.path.join(tmppath, "file.txt")
+    with open(path, "w") as f:
+        f.write("content")
+
+    def static(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return environ.get("wsgi.file_wrapper", FileWrapper)(open(path, "rb"))
+
+    middleware = MetricsMiddleware(static, path=None)
+    environ = {"PATH_INFO": "/", "wsgi.file_wrapper": FileWrapper}
+    app_iter = middleware(environ, lambda status, headers, exc_info=None: None)
+    assert isinstance(app_iter, FileWrapper)
+    assert b"".join(app_iter) == b"content"
+    app_iter.close()
+    assert list(middleware.registry.collect()) == [("", "", "2xx")]
+
+    # Other responses are recorded once closed.
+    assert Client(middleware).get("/", buffered=True).data == b"content"
+    assert sum(middleware.registry.collect()[("", "", "2xx")][:-1]) == 2
+
+
+def test_mmap_registry(tmppath):
+    """Test histograms are shared between processes through files."""
+    registry = MmapMetricsRegistry(os.path.join(tmppath, "metrics"), buckets=(1,))
+
+    def observe():
+        registry.observe(("a",), 0.5)
+
+    thread = threading.Thread(target=observe)
+    thread.start()
+    thread.join()
+    registry.observe(("a",), 2)
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        try:
+            registry.observe(("a",), 3)
+            registry.observe(("b",), 0.5)
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+
+    # Another registry, e.g. in another worker, sees the same metrics.
+    other = MmapMetricsRegistry(os.path.join(tmppath, "metrics"), buckets=(1,))
+    assert other.collect() == {("a",): [1, 2, 5.5], ("b",): [1, 0, 0.5]}
+
+    # The file of the dead process has been archived.
+    assert sorted(os.listdir(os.path.join(tmppath, "metrics"))) == [
+        "archive.db",
+        "archive.lock",
+        f"metrics_{os.getpid()}_{registry._id}.db",
+    ]
+    registry.observe(("b",), 5)
+    assert registry.collect() == {("a",): [1, 2, 5.5], ("b",): [1, 1, 5.5]}
+
+    # Metrics recorded with other buckets are ignored.
+    assert MmapMetricsRegistry(registry.directory, buckets=(1, 2)).collect() == {}
+
+
+def test_mmap_registry_reused_pid(tmppath):
+    """Test a process reusing the identifier of a previous one keeps counts."""
+    directory = os.path.join(tmppath, "metrics")
+    registry = MmapMetricsRegistry(directory, buckets=(1,))
+    for _ in range(5):
+        registry.observe(("a",), 0.5)
+
+    # A new process with the same identifier (e.g. a restarted container).
+    with patch.object(multiprocess, "_registry_ids", itertools.count(registry._id)):
+        registry = MmapMetricsRegistry(directory, buckets=(1,))
+    registry.observe(("a",), 0.5)
+    assert registry.collect() == {("a",): [6, 0, 3.0]}
+    assert sorted(os.listdir(directory)) == [
+        "archive.db",
+        "archive.lock",
+        f"metrics_{os.getpid()}_{registry._id}.db",
+    ]
+
+
+def test_mmap_registry_shared_directory(tmppath):
+    """Test registries sharing a directory in a process keep their counts."""
+    directory = os.path.join(tmppath, "metrics")
+    ui = MmapMetricsRegistry(directory, buckets=(1,))
+    api = MmapMetricsRegistry(directory, buckets=(1,))
+    for _ in range(10):
+        ui.observe(("ui",), 0.5)
+        api.observe(("api",), 0.5)
+        ui.observe(("ui",), 0.5)
+    expected = {("ui",): [20, 0, 10.0], ("api",): [10, 0, 5.0]}
+    assert ui.collect() == expected
+    assert api.collect() == expected
+
+
+def test_mmap_registry_growth(tmppath):
+    """Test the metrics file grows when needed."""
+    registry = MmapMetricsRegistry(tmppath)
+    for i in range(2000):
+        registry.observe((f"label-{i}",), 0.1)
+    histograms = registry.collect()
+    assert len(histograms) == 2000
+    assert sum(histograms[("label-1999",)][:-1]) == 1
+
+
+def test_wsgi_metrics_multiprocess(tmppath):
+    """Test the shared registry is configured in the instance folder."""
+    app = Flask("app", instance_path=tmppath)
+    app.config["WSGI_METRICS_MULTIPROCESS"] = True
+    wsgi = wsgi_metrics()(app)
+    assert isinstance(wsgi.registry, MmapMetricsRegistry)
+    assert wsgi.registry.directory == os.path.join(tmppath, "metrics")
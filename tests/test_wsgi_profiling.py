@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test sampled profiling of requests."""
+
+import json
+import os
+import pstats
+
+import pytest
+from flask import Flask
+
+from invenio_base.wsgi import ProfilerMiddleware, wsgi_profiler
+
+
+@pytest.fixture()
+def app(tmppath):
+    """Flask application."""
+    app = Flask("app", instance_path=tmppath)
+
+    @app.route("/")
+    def index():
+        return "index"
+
+    @app.route("/slow")
+    def slow():
+        return "slow"
+
+    return app
+
+
+def profiles(directory):
+    """List the profiles in a directory."""
+    return sorted(n for n in os.listdir(directory) if n.endswith(".pstats"))
+
+
+def test_profiler_sampling(app, tmppath):
+    """Test one of every N requests is profiled."""
+    directory = os.path.join(tmppath, "profiles")
+    app.wsgi_app = ProfilerMiddleware(app.wsgi_app, directory, sample_rate=3)
+    client = app.test_client()
+    for i in range(7):
+        assert client.get("/").data == b"index"
+
+    names = profiles(directory)
+    assert len(names) == 2
+    stats = pstats.Stats(os.path.join(directory, names[0]))
+    assert stats.total_calls > 0
+    with open(os.path.join(directory, names[0][: -len(".pstats")] + ".json")) as f:
+        metadata = json.load(f)
+    assert metadata["endpoint"] == "index"
+    assert metadata["path"] == "/"
+    assert metadata["method"] == "GET"
+    assert metadata["status"] == "200 OK"
+    assert metadata["pid"] == os.getpid()
+    assert metadata["duration"] > 0
+
+
+def test_profiler_triggers(app, tmppath):
+    """Test requests are profiled by path or header."""
+    directory = os.path.join(tmppath, "profiles")
+    app.wsgi_app = ProfilerMiddleware(
+        app.wsgi_app,
+        directory,
+        paths=["/slow"],
+        trigger_header="X-Profile",
+        trigger_token="secret",
+    )
+    client = app.test_client()
+    client.get("/")
+    client.get("/", headers={"X-Profile": "wrong"})
+    assert profiles(directory) == []
+    client.get("/slow")
+    client.get("/", headers={"X-Profile": "secret"})
+    assert len(profiles(directory)) == 2
+
+
+def test_profiler_rotation(app, tmppath):
+    """Test only the last profiles are kept."""
+    directory = os.path.join(tmppath, "profiles")
+    app.wsgi_app = ProfilerMiddleware(
+        app.wsgi_app, directory, sample_rate=1, max_files=2
+    )
+    client = app.test_client()
+    client.get("/")
+    first = profiles(directory)
+    for i in range(3):
+        client.get("/")
+    names = profiles(directory)
+    assert len(names) == 2
+    assert first[0] not in names
+    assert len(os.listdir(directory)) == 4
+
+
+def test_wsgi_profiler(app, tmppath):
+    """Test the profiler is only installed when enabled."""
+    wsgi_app = app.wsgi_app
+    assert wsgi_profiler()(app) == wsgi_app
+
+    app.config.update(WSGI_PROFILER=True, WSGI_PROFILER_SAMPLE_RATE=1)
+    middleware = wsgi_profiler()(app)
+    assert isinstance(middleware, ProfilerMiddleware)
+    assert middleware.directory == os.path.join(tmppath, "profiles")
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the static files middleware."""
+
+import gzip
+import os
+from datetime import timedelta
+
+import pytest
+from flask import Flask
+
+from invenio_base.wsgi import StaticFilesMiddleware, wsgi_static
+
+
+@pytest.fixture()
+def app(tmppath):
+    """Flask application with a static folder."""
+    static = os.path.join(tmppath, "static")
+    os.makedirs(os.path.join(static, "js"))
+    with open(os.path.join(static, "js", "app.js"), "w") as f:
+        f.write("var a = 1;")
+    with open(os.path.join(static, "js", "app.js.gz"), "wb") as f:
+        f.write(gzip.compress(b"var a = 1;"))
+    with open(os.path.join(static, "style.css"), "w") as f:
+        f.write("body {}")
+
+    app = Flask("app", static_folder=static)
+
+    @app.before_request
+    def entered():
+        app.config["ENTERED"] = True
+
+    return app
+
+
+def test_static_files(app):
+    """Test indexed files are served without entering Flask."""
+    app.wsgi_app = StaticFilesMiddleware(app.wsgi_app, app.static_folder)
+    client = app.test_client()
+
+    response = client.get("/static/style.css")
+    assert response.status_code == 200
+    assert response.data == b"body {}"
+    assert response.headers["Content-Type"] == "text/css; charset=utf-8"
+    assert response.headers["Content-Length"] == "7"
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert "Vary" not in response.headers
+    etag = response.headers["ETag"]
+    response.close()
+
+    response = client.get("/static/style.css", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+
+    response = client.head("/static/style.css")
+    assert response.status_code == 200
+    assert response.data == b""
+    assert "ENTERED" not in app.config
+
+    # Same headers as Flask.
+    flask_response = app.test_client().get(
+        "/static/style.css", headers={"Range": "bytes=0-"}
+    )
+    assert "ENTERED" in app.config
+    assert flask_response.headers["ETag"] == etag
+    assert flask_response.headers["Last-Modified"] == response.headers["Last-Modified"]
+    flask_response.close()
+
+
+def test_static_files_gzip(app):
+    """Test gzip variants are served to clients accepting them."""
+    app.wsgi_app = StaticFilesMiddleware(app.wsgi_app, app.static_folder, max_age=60)
+    client = app.test_client()
+
+    response = client.get("/static/js/app.js", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Content-Type"] == "text/javascript; charset=utf-8"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["Cache-Control"] == "public, max-age=60"
+    assert gzip.decompress(response.data) == b"var a = 1;"
+    gzip_etag = response.headers["ETag"]
+    response.close()
+
+    response = client.get("/static/js/app.js")
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] != gzip_etag
+    assert response.data == b"var a = 1;"
+    response.close()
+    assert "ENTERED" not in app.config
+
+
+def test_static_files_fallback(app):
+    """Test unknown and changed files are passed to Flask."""
+    middleware = StaticFilesMiddleware(app.wsgi_app, app.static_folder)
+    app.wsgi_app = middleware
+    client = app.test_client()
+
+    with open(os.path.join(app.static_folder, "new.txt"), "w") as f:
+        f.write("new")
+    response = client.get("/static/new.txt")
+    assert response.data == b"new"
+    assert app.config.pop("ENTERED")
+    response.close()
+
+    path = os.path.join(app.static_folder, "style.css")
+    with open(path, "w") as f:
+        f.write("body { color: red; }")
+    response = client.get("/static/style.css")
+    assert response.data == b"body { color: red; }"
+    assert app.config.pop("ENTERED")
+    response.close()
+
+    assert client.post("/static/new.txt").status_code == 405
+    assert client.get("/static/../app.py").status_code == 404
+    app.config.pop("ENTERED")
+
+    middleware.index()
+    response = client.get("/static/new.txt")
+    assert response.data == b"new"
+    response.close()
+    assert "ENTERED" not in app.config
+
+
+def test_wsgi_static(app):
+    """Test the middleware is only installed if enabled."""
+    wsgi_app = app.wsgi_app
+    assert wsgi_static()(app) == wsgi_app
+
+    app.config.update(WSGI_STATIC=True, SEND_FILE_MAX_AGE_DEFAULT=timedelta(hours=1))
+    middleware = wsgi_static()(app)
+    assert isinstance(middleware, StaticFilesMiddleware)
+    assert middleware.app == wsgi_app
+    assert middleware.prefix == "/static/"
+    assert middleware.cache_control == "public, max-age=3600"
+    assert set(middleware.files) == {"js/app.js", "js/app.js.gz", "style.css"}
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test host based dispatching."""
+
+import pytest
+from flask import Blueprint, current_app
+
+from invenio_base.app import create_app_factory
+from invenio_base.wsgi import HostDispatcherMiddleware
+from invenio_base.wsgi.tenants import normalize_host
+
+
+def config_loader(app, **kwargs):
+    """Load the tenant configuration."""
+    app.config.update(**kwargs)
+
+
+def create_site(name):
+    """Create blueprint returning the site name."""
+    blueprint = Blueprint(name, __name__)
+
+    @blueprint.route("/")
+    def index():
+        return current_app.config["SITE_NAME"]
+
+    return blueprint
+
+
+@pytest.fixture()
+def create_app():
+    """Application factory counting the created applications."""
+    factory = create_app_factory(
+        "tenant", config_loader=config_loader, blueprints=[create_site("site")]
+    )
+    created = []
+
+    def _create_app(**kwargs):
+        created.append(kwargs["SITE_NAME"])
+        return factory(**kwargs)
+
+    _create_app.created = created
+    return _create_app
+
+
+def get(wsgi, host, path="/"):
+    """Do a GET request on the WSGI application."""
+    status = []
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "HTTP_HOST": host,
+        "wsgi.url_scheme": "http",
+    }
+    body = b"".join(wsgi(environ, lambda s, h, exc_info=None: status.append(s)))
+    return status[0], body
+
+
+@pytest.mark.parametrize(
+    "host,expected",
+    [
+        ("Example.ORG", "example.org"),
+        ("example.org:5000", "example.org"),
+        ("[::1]", "[::1]"),
+        ("[::1]:5000", "[::1]"),
+    ],
+)
+def test_normalize_host(host, expected):
+    """Test host normalization."""
+    assert normalize_host(host) == expected
+
+
+def test_host_dispatcher(create_app):
+    """Test requests are dispatched per host."""
+    wsgi = HostDispatcherMiddleware(
+        create_app,
+        {
+            "one.example.org": {"SITE_NAME": "one"},
+            "Two.example.org": {"SITE_NAME": "two"},
+        },
+    )
+    assert create_app.created == []
+    assert get(wsgi, "one.example.org") == ("200 OK", b"one")
+    assert get(wsgi, "two.example.org:443") == ("200 OK", b"two")
+    assert get(wsgi, "one.example.org") == ("200 OK", b"one")
+    assert create_app.created == ["one", "two"]
+    assert get(wsgi, "other.example.org")[0] == "404 NOT FOUND"
+
+    stats = wsgi.stats
+    assert list(stats) == ["two.example.org", "one.example.org"]
+    assert stats["one.example.org"]["hits"] == 2
+    assert stats["one.example.org"]["memory"] >= 0
+
+
+def test_host_dispatcher_lru_eviction(create_app):
+    """Test the least recently used applications are evicted."""
+    wsgi = HostDispatcherMiddleware(
+        create_app,
+        {f"{n}.example.org": {"SITE_NAME": n} for n in ("a", "b", "c")},
+        max_apps=2,
+    )
+    for name in ("a", "b", "a", "c", "a", "b"):
+        assert get(wsgi, f"{name}.example.org")[1] == name.encode()
+    assert create_app.created == ["a", "b", "c", "b"]
+    assert list(wsgi.stats) == ["a.example.org", "b.example.org"]
+
+    assert wsgi.evict("a.example.org")
+    assert not wsgi.evict("a.example.org")
+    assert list(wsgi.stats) == ["b.example.org"]
+
+
+def test_host_dispatcher_memory_eviction(create_app):
+    """Test applications are evicted when over the memory limit."""
+    wsgi = HostDispatcherMiddleware(
+        create_app,
+        {f"{n}.example.org": {"SITE_NAME": n} for n in ("a", "b")},
+        max_memory=0,
+    )
+    for name in ("a", "b"):
+        get(wsgi, f"{name}.example.org")
+        # Force accounting since the RSS growth is not deterministic.
+        wsgi._apps[f"{name}.example.org"].memory = 1
+    get(wsgi, "a.example.org")
+    # The most recently used application is always kept.
+    assert list(wsgi.stats) == ["a.example.org"]
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the slow request watchdog."""
+
+import logging
+import threading
+
+from flask import Flask
+
+from invenio_base.wsgi import WatchdogMiddleware, wsgi_watchdog
+
+
+def test_watchdog(caplog):
+    """Test stack traces of slow requests are logged."""
+    app = Flask("app")
+    started = threading.Event()
+    release = threading.Event()
+
+    @app.route("/slow")
+    def slow_view():
+        started.set()
+        release.wait(timeout=5)
+        return "slow"
+
+    @app.route("/fast")
+    def fast_view():
+        return "fast"
+
+    # Long interval: the checks are triggered by the test.
+    watchdog = WatchdogMiddleware(app.wsgi_app, threshold=0, interval=60, repeat=60)
+    app.wsgi_app = watchdog
+    client = app.test_client()
+
+    assert client.get("/fast", buffered=True).data == b"fast"
+    assert watchdog.requests == {}
+
+    thread = threading.Thread(target=lambda: client.get("/slow", buffered=True))
+    thread.start()
+    started.wait(timeout=5)
+    with caplog.at_level(logging.WARNING, logger="invenio_base.wsgi.watchdog"):
+        assert watchdog.check() == 1
+        # Not reported again before ``repeat`` seconds.
+        assert watchdog.check() == 0
+    release.set()
+    thread.join()
+
+    assert len(caplog.records) == 1
+    message = caplog.records[0].getMessage()
+    assert message.startswith("Request GET /slow running for ")
+    assert "in slow_view" in message
+    assert watchdog.requests == {}
+
+
+def test_watchdog_exception():
+    """Test requests raising an exception are not tracked anymore."""
+
+    def failing(environ, start_response):
+        raise ValueError()
+
+    watchdog = WatchdogMiddleware(failing)
+    try:
+        watchdog({"REQUEST_METHOD": "GET", "PATH_INFO": "/"}, None)
+    except ValueError:
+        pass
+    assert watchdog.requests == {}
+
+
+def test_wsgi_watchdog():
+    """Test the watchdog is only installed when enabled."""
+    app = Flask("app")
+    wsgi_app = app.wsgi_app
+    assert wsgi_watchdog()(app) == wsgi_app
+
+    app.config.update(WSGI_WATCHDOG=True, WSGI_WATCHDOG_THRESHOLD=30)
+    middleware = wsgi_watchdog()(app)
+    assert isinstance(middleware, WatchdogMiddleware)
+    assert middleware.threshold == 30